@@ -1,27 +1,24 @@
 import os
-from collections import Counter
-from typing import List, Tuple
+import sys
+from typing import Tuple
 
 import cv2
 import mediapipe as mp
 import numpy as np
 
+# Make the repo-level ``signdao`` package importable when run as a script.
+_REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if _REPO_ROOT not in sys.path:
+    sys.path.insert(0, _REPO_ROOT)
 
-OUTPUT_PATH = os.path.join("WLASL", "wlasl_lite", "sign_classifier.npz")
-LABELS = ("YES", "NO")
+from signdao.features import FEATURE_DIM, landmark_feature  # noqa: E402
+
+from sample_store import SampleStore, import_legacy_npz  # noqa: E402
 
 
-def normalize_landmarks(coords: np.ndarray, handedness: str | None = None) -> np.ndarray:
-    wrist = coords[0]
-    middle_mcp = coords[9]
-    translated = coords - wrist
-    if handedness == "Left":
-        translated[:, 0] *= -1
-    scale = np.linalg.norm(middle_mcp - wrist)
-    if scale < 1e-6:
-        scale = 1.0
-    normalized = translated / scale
-    return normalized[:, :2].flatten().astype(np.float32)
+STORE_DIR = os.path.join("WLASL", "wlasl_lite", "sign_classifier_store")
+LEGACY_PATH = os.path.join("WLASL", "wlasl_lite", "sign_classifier.npz")
+LABELS = ("YES", "NO")
 
 
 def extract_feature(frame: np.ndarray, hands_context) -> Tuple[bool, np.ndarray]:
@@ -34,37 +31,23 @@ def extract_feature(frame: np.ndarray, hands_context) -> Tuple[bool, np.ndarray]
     handedness = None
     if results.multi_handedness:
         handedness = results.multi_handedness[0].classification[0].label
-    feature = normalize_landmarks(coords, handedness)
+    feature = landmark_feature(coords, handedness)
     return True, feature
 
 
-def load_existing_samples(path: str) -> Tuple[List[np.ndarray], List[str]]:
-    if not os.path.exists(path):
-        return [], []
-    data = np.load(path, allow_pickle=True)
-    X = [sample for sample in data["X"]]
-    y = [label for label in data["y"]]
-    print(f"[INFO] Loaded {len(y)} existing live samples from {path}")
-    return X, y
-
-
-def save_samples(path: str, features: List[np.ndarray], labels: List[str]) -> None:
-    if not features:
-        print("[WARN] No samples to save.")
-        return
-    X = np.stack(features, axis=0)
-    y = np.array(labels, dtype=object)
-    os.makedirs(os.path.dirname(path), exist_ok=True)
-    np.savez(path, X=X, y=y)
-    counts = Counter(labels)
-    summary = ", ".join(f"{label}:{counts[label]}" for label in LABELS)
-    print(f"[INFO] Saved {len(labels)} samples ({summary}) -> {path}")
+def open_store() -> SampleStore:
+    store = SampleStore(STORE_DIR, dim=FEATURE_DIM, labels=LABELS)
+    imported = import_legacy_npz(store, LEGACY_PATH)
+    if imported:
+        print(f"[INFO] Imported {imported} samples from {LEGACY_PATH} into {STORE_DIR}")
+    print(f"[INFO] Loaded {len(store)} existing live samples from {STORE_DIR}")
+    return store
 
 
 def main() -> None:
-    os.makedirs(os.path.dirname(OUTPUT_PATH), exist_ok=True)
-    features, labels = load_existing_samples(OUTPUT_PATH)
-    total_captures = len(labels)
+    store = open_store()
+    counts = store.label_counts()
+    total_captures = len(store)
 
     current_label_index = 0
     current_label = LABELS[current_label_index]
@@ -91,7 +74,7 @@ def main() -> None:
                 cv2.putText(overlay, f"Current label: {current_label}", (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
                 cv2.putText(
                     overlay,
-                    "Keys: SPACE toggle label | C capture | S save+exit | Q quit",
+                    "Keys: SPACE toggle label | C capture (saved instantly) | S/Q exit",
                     (10, 65),
                     cv2.FONT_HERSHEY_SIMPLEX,
                     0.6,
@@ -100,7 +83,7 @@ def main() -> None:
                 )
                 cv2.putText(
                     overlay,
-                    f"Total captures: {total_captures} (YES {labels.count('YES')} | NO {labels.count('NO')})",
+                    f"Total captures: {total_captures} (YES {counts.get('YES', 0)} | NO {counts.get('NO', 0)})",
                     (10, 95),
                     cv2.FONT_HERSHEY_SIMPLEX,
                     0.6,
@@ -128,21 +111,20 @@ def main() -> None:
                 elif key == ord("c"):
                     ok, feature = extract_feature(frame, hands)
                     if ok:
-                        features.append(feature)
-                        labels.append(current_label)
+                        store.append(feature, current_label)
+                        counts[current_label] = counts.get(current_label, 0) + 1
                         total_captures += 1
                         capture_notification = f"[{current_label}] capture saved ({total_captures} total)"
                         print(f"[INFO] Captured {current_label} sample #{total_captures}")
                     else:
                         capture_notification = "No hand detected."
                         print("[WARN] No hand detected, sample ignored.")
-                elif key == ord("s"):
-                    save_samples(OUTPUT_PATH, features, labels)
-                    break
-                elif key == ord("q"):
-                    print("[INFO] Quit without saving.")
+                elif key in (ord("s"), ord("q")):
+                    summary = ", ".join(f"{label}:{counts.get(label, 0)}" for label in LABELS)
+                    print(f"[INFO] {total_captures} samples ({summary}) stored in {STORE_DIR}")
                     break
         finally:
+            store.close()
             cap.release()
             cv2.destroyAllWindows()
 
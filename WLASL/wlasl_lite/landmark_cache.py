@@ -0,0 +1,83 @@
+"""
+Per-instance landmark cache for the WLASL extractor.
+
+Each processed clip is stored as ``<root>/<params-hash>/<key>.npz``; the
+extractor uses ``<GLOSS>_<video_id>`` as the key. The params hash covers
+everything that changes the extracted feature (sampling stride, sample cap,
+feature spec), so changing any of them starts a fresh, separate cache instead
+of mixing incompatible features. Entries are written atomically, so a crash
+never leaves a torn file behind.
+"""
+
+import hashlib
+import json
+import os
+import re
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+
+def params_hash(params: Dict) -> str:
+    encoded = json.dumps(params, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()[:12]
+
+
+def _safe_name(video_id: str) -> str:
+    return re.sub(r"[^A-Za-z0-9._-]", "_", video_id)
+
+
+class LandmarkCache:
+    def __init__(self, root: str, params: Dict) -> None:
+        self.params = dict(params)
+        self.directory = os.path.join(root, params_hash(self.params))
+        os.makedirs(self.directory, exist_ok=True)
+        params_path = os.path.join(self.directory, "params.json")
+        if not os.path.exists(params_path):
+            with open(params_path, "w", encoding="utf-8") as f:
+                json.dump(self.params, f, indent=2, sort_keys=True)
+
+    def _path(self, video_id: str) -> str:
+        return os.path.join(self.directory, f"{_safe_name(video_id)}.npz")
+
+    def __contains__(self, video_id: str) -> bool:
+        return os.path.exists(self._path(video_id))
+
+    def get(self, video_id: str) -> Optional[Tuple[str, Optional[np.ndarray]]]:
+        """Return ``(label, feature)`` for a cached clip; feature is None if no hand was found."""
+        path = self._path(video_id)
+        if not os.path.exists(path):
+            return None
+        with np.load(path, allow_pickle=False) as data:
+            feature = data["feature"]
+            return str(data["label"]), (feature if feature.size else None)
+
+    def put(self, video_id: str, label: str, feature: Optional[np.ndarray]) -> None:
+        """Checkpoint one clip's result; pass ``feature=None`` to remember a clip without a hand."""
+        stored = np.empty(0, dtype=np.float32) if feature is None else np.asarray(feature, dtype=np.float32)
+        path = self._path(video_id)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez(f, video_id=np.array(video_id), label=np.array(label), feature=stored)
+        os.replace(tmp_path, path)
+
+    def entries(self) -> Iterator[Tuple[str, str, Optional[np.ndarray]]]:
+        for name in sorted(os.listdir(self.directory)):
+            if not name.endswith(".npz"):
+                continue
+            with np.load(os.path.join(self.directory, name), allow_pickle=False) as data:
+                feature = data["feature"]
+                yield str(data["video_id"]), str(data["label"]), (feature if feature.size else None)
+
+    def assemble(self) -> Tuple[np.ndarray, np.ndarray, List[str]]:
+        """Build ``(X, y, video_ids)`` from every cached clip that produced a feature."""
+        features, labels, video_ids = [], [], []
+        for video_id, label, feature in self.entries():
+            if feature is None:
+                continue
+            features.append(feature)
+            labels.append(label)
+            video_ids.append(video_id)
+        if not features:
+            return np.empty((0, 0), dtype=np.float32), np.array([], dtype=object), []
+        return np.stack(features, axis=0), np.array(labels, dtype=object), video_ids
@@ -0,0 +1,226 @@
+"""
+Append-only, sharded store for live-collected landmark samples.
+
+Layout of a store directory::
+
+    meta.json           version, feature dim, record dtype, label vocabulary
+    shard-00000.bin     fixed-size records: float32[dim] feature + uint8 label code
+    shard-00001.bin     ...
+
+Every ``append`` writes one record and fsyncs it, so a crash loses at most
+the capture in flight; a torn trailing record is ignored on read. Shards are
+raw record arrays and open as zero-copy ``np.memmap`` views. ``compact``
+rewrites all records into full-size shards offline.
+
+Compaction never leaves the store without a complete copy of its records.
+New shards are written to ``compact.tmp/`` and the directory is renamed to
+``compact.done/`` once they are all on disk; that rename is the commit point.
+The old shards are then deleted, the directory is renamed to
+``compact.move/`` and its shards are moved into place. Opening a store
+finishes an interrupted compaction from whichever directory it finds, or
+discards a ``compact.tmp/`` that never committed.
+
+Run ``python WLASL/wlasl_lite/sample_store.py compact <store_dir>`` to compact.
+"""
+
+import glob
+import json
+import os
+import shutil
+import sys
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+STORE_VERSION = 1
+DEFAULT_SHARD_RECORDS = 4096
+_SHARD_GLOB = "shard-*.bin"
+_COMPACT_STAGING = "compact.tmp"
+_COMPACT_DONE = "compact.done"
+_COMPACT_MOVE = "compact.move"
+
+
+def record_dtype(dim: int) -> np.dtype:
+    return np.dtype([("feature", "<f4", (dim,)), ("label", "u1")])
+
+
+def _write_json_atomic(path: str, payload: dict) -> None:
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class SampleStore:
+    def __init__(
+        self,
+        directory: str,
+        dim: int = 42,
+        labels: Sequence[str] = ("YES", "NO"),
+        shard_records: int = DEFAULT_SHARD_RECORDS,
+    ) -> None:
+        self.directory = directory
+        self.shard_records = shard_records
+        meta_path = os.path.join(directory, "meta.json")
+        if os.path.exists(meta_path):
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            if meta.get("version") != STORE_VERSION:
+                raise ValueError(f"Unsupported sample store version {meta.get('version')} at {directory}")
+            self.dim = int(meta["dim"])
+            self.labels: List[str] = list(meta["labels"])
+        else:
+            os.makedirs(directory, exist_ok=True)
+            self.dim = dim
+            self.labels = list(labels)
+            self._write_meta()
+        self.dtype = record_dtype(self.dim)
+        self._active = None
+        self._active_count = 0
+        self._recover_compaction()
+
+    @staticmethod
+    def exists(directory: str) -> bool:
+        return os.path.exists(os.path.join(directory, "meta.json"))
+
+    def _write_meta(self) -> None:
+        _write_json_atomic(
+            os.path.join(self.directory, "meta.json"),
+            {"version": STORE_VERSION, "dim": self.dim, "labels": self.labels, "record": "float32[dim] + uint8"},
+        )
+
+    def _shard_paths(self) -> List[str]:
+        return sorted(glob.glob(os.path.join(self.directory, _SHARD_GLOB)))
+
+    def _records_in(self, path: str) -> int:
+        return os.path.getsize(path) // self.dtype.itemsize
+
+    def label_code(self, label: str) -> int:
+        if label not in self.labels:
+            if len(self.labels) >= 255:
+                raise ValueError("Sample store label vocabulary is full")
+            self.labels.append(label)
+            self._write_meta()
+        return self.labels.index(label)
+
+    def _open_active(self) -> None:
+        paths = self._shard_paths()
+        if paths and self._records_in(paths[-1]) < self.shard_records:
+            path = paths[-1]
+            # Drop a torn trailing record left by a crash before appending.
+            valid_bytes = self._records_in(path) * self.dtype.itemsize
+            if os.path.getsize(path) != valid_bytes:
+                with open(path, "r+b") as f:
+                    f.truncate(valid_bytes)
+        else:
+            path = os.path.join(self.directory, f"shard-{len(paths):05d}.bin")
+        self._active = open(path, "ab")
+        self._active_count = self._records_in(path) if os.path.exists(path) else 0
+
+    def append(self, feature: np.ndarray, label: str) -> None:
+        """Durably append one sample."""
+        if self._active is None or self._active_count >= self.shard_records:
+            self.close()
+            self._open_active()
+        record = np.zeros(1, dtype=self.dtype)
+        record["feature"][0] = np.asarray(feature, dtype=np.float32).reshape(self.dim)
+        record["label"][0] = self.label_code(label)
+        self._active.write(record.tobytes())
+        self._active.flush()
+        os.fsync(self._active.fileno())
+        self._active_count += 1
+
+    def close(self) -> None:
+        if self._active is not None:
+            self._active.close()
+            self._active = None
+
+    def iter_shards(self) -> Iterator[np.memmap]:
+        """Yield each shard as a read-only memory-mapped record array."""
+        for path in self._shard_paths():
+            count = self._records_in(path)
+            if count:
+                yield np.memmap(path, dtype=self.dtype, mode="r", shape=(count,))
+
+    def __len__(self) -> int:
+        return sum(self._records_in(path) for path in self._shard_paths())
+
+    def label_counts(self) -> dict:
+        counts = np.zeros(len(self.labels), dtype=np.int64)
+        for shard in self.iter_shards():
+            counts += np.bincount(shard["label"], minlength=len(self.labels))[: len(self.labels)]
+        return {label: int(count) for label, count in zip(self.labels, counts)}
+
+    def to_arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Return ``(X, y)`` with float32 features and string labels."""
+        shards = list(self.iter_shards())
+        if not shards:
+            return np.empty((0, self.dim), dtype=np.float32), np.array([], dtype=str)
+        X = np.concatenate([shard["feature"] for shard in shards], axis=0)
+        codes = np.concatenate([shard["label"] for shard in shards], axis=0)
+        return X, np.asarray(self.labels)[codes]
+
+    def compact(self) -> int:
+        """Rewrite every record into full shards; returns the resulting shard count."""
+        self.close()
+        self._recover_compaction()
+        records = [np.array(shard) for shard in self.iter_shards()]
+        merged = np.concatenate(records) if records else np.zeros(0, dtype=self.dtype)
+
+        staging = os.path.join(self.directory, _COMPACT_STAGING)
+        os.makedirs(staging)
+        shards = 0
+        for index, start in enumerate(range(0, len(merged), self.shard_records)):
+            with open(os.path.join(staging, f"shard-{index:05d}.bin"), "wb") as f:
+                f.write(merged[start : start + self.shard_records].tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+            shards += 1
+        os.replace(staging, os.path.join(self.directory, _COMPACT_DONE))
+        self._recover_compaction()
+        return shards
+
+    def _recover_compaction(self) -> None:
+        """Finish a committed compaction, or drop one that never committed."""
+        staging = os.path.join(self.directory, _COMPACT_STAGING)
+        done = os.path.join(self.directory, _COMPACT_DONE)
+        move = os.path.join(self.directory, _COMPACT_MOVE)
+        if os.path.isdir(staging):
+            print(f"[WARN] Discarding an unfinished compaction in {self.directory}")
+            shutil.rmtree(staging)
+        if os.path.isdir(done):
+            # Every shard-*.bin here is an old one until the rename below.
+            for path in self._shard_paths():
+                os.remove(path)
+            os.replace(done, move)
+        if os.path.isdir(move):
+            for path in sorted(glob.glob(os.path.join(move, _SHARD_GLOB))):
+                os.replace(path, os.path.join(self.directory, os.path.basename(path)))
+            os.rmdir(move)
+
+
+def import_legacy_npz(store: SampleStore, path: str) -> int:
+    """Copy samples from an old ``np.savez`` file into an empty store."""
+    if len(store) or not os.path.exists(path):
+        return 0
+    data = np.load(path, allow_pickle=True)
+    for feature, label in zip(data["X"], data["y"]):
+        store.append(feature, str(label))
+    store.close()
+    return len(data["y"])
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 2 or argv[0] != "compact":
+        print("Usage: python WLASL/wlasl_lite/sample_store.py compact <store_dir>")
+        return
+    store = SampleStore(argv[1])
+    shards = store.compact()
+    print(f"[INFO] Compacted {len(store)} samples into {shards} shard(s) at {argv[1]}")
+
+
+if __name__ == "__main__":
+    main()
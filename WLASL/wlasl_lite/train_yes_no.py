@@ -1,26 +1,62 @@
+import argparse
 import os
+import sys
 
 import numpy as np
-from sklearn.neighbors import KNeighborsClassifier
+
+# Make the repo-level ``signdao`` package importable when run as a script.
+_REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if _REPO_ROOT not in sys.path:
+    sys.path.insert(0, _REPO_ROOT)
+
+from signdao.dataset import DTYPES, load_dataset, load_legacy_npz, save_dataset  # noqa: E402
+from signdao.model import save_model  # noqa: E402
+
+from sample_store import SampleStore  # noqa: E402
 
 
 BASE_DIR = os.path.join("WLASL", "wlasl_lite")
-WLASL_DATA = os.path.join(BASE_DIR, "yes_no_landmarks.npz")
+WLASL_DATA = os.path.join(BASE_DIR, "yes_no_landmarks.sdds")
+LIVE_STORE = os.path.join(BASE_DIR, "sign_classifier_store")
 LIVE_DATA = os.path.join(BASE_DIR, "sign_classifier.npz")
-OUTPUT_DATA = os.path.join(BASE_DIR, "sign_classifier_augmented.npz")
+OUTPUT_DATA = os.path.join(BASE_DIR, "sign_classifier_augmented.sdds")
+OUTPUT_MODEL = os.path.join(BASE_DIR, "sign_classifier_model.sdds")
+
+
+def load_dataset_file(path: str, required: bool = False):
+    if os.path.exists(path):
+        dataset = load_dataset(path)
+        return dataset.float_features(), dataset.y
+    # Files from before the binary format; convert them with `python -m signdao.dataset convert`.
+    legacy_path = os.path.splitext(path)[0] + ".npz"
+    if os.path.exists(legacy_path):
+        print(f"[INFO] Reading legacy dataset {legacy_path}")
+        return load_legacy_npz(legacy_path)
+    if required:
+        print(f"[WARN] Missing dataset at {path}")
+    return None, None
 
 
-def load_dataset(path: str, required: bool = False):
-    if not os.path.exists(path):
-        if required:
-            print(f"[WARN] Missing dataset at {path}")
+def load_live_samples():
+    """Read live captures from the sample store, falling back to the old npz file."""
+    if not SampleStore.exists(LIVE_STORE):
+        return load_dataset_file(LIVE_DATA)
+    store = SampleStore(LIVE_STORE)
+    if len(store) == 0:
         return None, None
-    data = np.load(path, allow_pickle=True)
-    return data["X"], data["y"]
+    return store.to_arrays()
 
 
-def main() -> None:
-    X_wlasl, y_wlasl = load_dataset(WLASL_DATA, required=True)
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Merge WLASL-Lite and live samples into the YES/NO model.")
+    parser.add_argument("--dtype", choices=DTYPES, default="float16", help="Feature dtype of the merged dataset.")
+    parser.add_argument("--model-dtype", choices=DTYPES, default="float32", help="Feature dtype of the model.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> None:
+    args = parse_args(argv)
+    X_wlasl, y_wlasl = load_dataset_file(WLASL_DATA, required=True)
     if X_wlasl is None or y_wlasl is None:
         print(
             "[ACTION] Run: python WLASL/wlasl_lite/wlasl_lite_extract.py "
@@ -28,7 +64,7 @@ def main() -> None:
         )
         return
 
-    X_live, y_live = load_dataset(LIVE_DATA)
+    X_live, y_live = load_live_samples()
 
     if X_live is not None and y_live is not None:
         X = np.concatenate([X_wlasl, X_live], axis=0)
@@ -36,13 +72,12 @@ def main() -> None:
     else:
         X, y = X_wlasl, y_wlasl
 
-    clf = KNeighborsClassifier(n_neighbors=3)
-    clf.fit(X, y)
-
     os.makedirs(BASE_DIR, exist_ok=True)
-    np.savez(OUTPUT_DATA, X=X, y=y)
-    print(f"[INFO] Model trained with {len(y)} samples")
-    print(f"[INFO] Saved sign_classifier_augmented.npz with {len(y)} samples")
+    save_dataset(OUTPUT_DATA, X, y, dtype=args.dtype)
+    print(f"[INFO] Saved {OUTPUT_DATA} with {len(y)} samples ({args.dtype}, {os.path.getsize(OUTPUT_DATA)} bytes)")
+
+    model = save_model(OUTPUT_MODEL, X, y, dtype=args.model_dtype)
+    print(f"[INFO] Model built with {len(model)} samples (k={model.n_neighbors}) -> {OUTPUT_MODEL}")
 
 
 if __name__ == "__main__":
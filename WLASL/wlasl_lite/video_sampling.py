@@ -0,0 +1,173 @@
+"""
+Frame sampling for offline landmark extraction.
+
+``cap.read()`` is ``grab()`` plus ``retrieve()``. ``grab()`` demuxes and
+decodes the frame; ``retrieve()`` then converts it to a new BGR array. The
+policies below only ``retrieve()`` the frames they keep, which saves the
+conversion and copy, but every frame they skip by grabbing is still decoded:
+
+* ``uniform``  - every ``stride``-th frame; skipped frames are only grabbed.
+* ``keyframe`` - only frames the demuxer flags as key frames. Many backends
+  do not implement ``CAP_PROP_LRF_HAS_KEY_FRAME`` and always return 0. The
+  first frame of every stream is a key frame, so a clip whose frame 0 is
+  not reported as one is sampled with ``uniform`` instead; this is logged
+  once per process and counted in ``SamplingStats.keyframe_fallbacks``.
+* ``time``     - one frame every ``interval_sec`` seconds. Gaps longer than
+  ``seek_frames`` are crossed with a timestamp seek instead of grabbing
+  through them. A seek flushes the decoder and decodes forward from the
+  previous key frame, so it only pays off for long gaps. On 640x480 30 fps
+  clips (mp4v and MJPEG, ``benchmarks/bench_sampling.py``) seeking across
+  the 6-frame gaps of the default 0.2 s interval took 3-4x as long as
+  grabbing through them and 15-frame gaps were still a loss, while 30-frame
+  gaps were 20-45% faster with seeks; hence ``seek_frames=15``.
+
+``SamplingStats`` records how many frames were grabbed (each one decoded),
+retrieved into arrays, sought past and finally used, so extraction cost can
+be compared against the number of samples it produced. Frames a seek decodes
+internally are not visible to OpenCV and are not counted.
+"""
+
+from dataclasses import dataclass
+from typing import Iterator, Tuple
+
+import cv2
+import numpy as np
+
+POLICIES = ("uniform", "keyframe", "time")
+
+_keyframe_fallback_logged = False
+
+
+@dataclass(frozen=True)
+class SamplingPolicy:
+    kind: str = "uniform"
+    stride: int = 5
+    interval_sec: float = 0.2
+    seek_frames: int = 15
+
+    def __post_init__(self) -> None:
+        if self.kind not in POLICIES:
+            raise ValueError(f"Unknown sampling policy {self.kind!r}; expected one of {POLICIES}")
+
+    def cache_params(self) -> dict:
+        """Parameters that change which frames are sampled, for cache keys."""
+        if self.kind == "uniform":
+            # Same frames as the original read-every-frame loop, so keep the same key.
+            return {"stride": self.stride}
+        if self.kind == "keyframe":
+            return {"policy": "keyframe", "stride": self.stride}
+        return {"policy": "time", "interval_sec": self.interval_sec}
+
+
+@dataclass
+class SamplingStats:
+    frames_grabbed: int = 0
+    frames_retrieved: int = 0
+    frames_used: int = 0
+    seeks: int = 0
+    keyframe_fallbacks: int = 0  # clips sampled with ``uniform`` because key frames were not reported
+
+    def merge(self, other: "SamplingStats") -> None:
+        self.frames_grabbed += other.frames_grabbed
+        self.frames_retrieved += other.frames_retrieved
+        self.frames_used += other.frames_used
+        self.seeks += other.seeks
+        self.keyframe_fallbacks += other.keyframe_fallbacks
+
+    def summary(self) -> str:
+        ratio = self.frames_used / self.frames_retrieved if self.frames_retrieved else 0.0
+        summary = (
+            f"grabbed {self.frames_grabbed}, retrieved {self.frames_retrieved}, used {self.frames_used} "
+            f"({ratio:.0%} of retrieved), seeks {self.seeks}"
+        )
+        if self.keyframe_fallbacks:
+            summary += f", keyframe fallbacks {self.keyframe_fallbacks}"
+        return summary
+
+
+def _grab(cap: cv2.VideoCapture, stats: SamplingStats) -> bool:
+    ok = cap.grab()
+    if ok:
+        stats.frames_grabbed += 1
+    return ok
+
+
+def _retrieve(cap: cv2.VideoCapture, stats: SamplingStats):
+    ok, frame = cap.retrieve()
+    if ok:
+        stats.frames_retrieved += 1
+    return ok, frame
+
+
+def _iter_uniform(
+    cap, policy: SamplingPolicy, stats: SamplingStats, frame_idx: int = 0
+) -> Iterator[Tuple[int, np.ndarray]]:
+    while _grab(cap, stats):
+        if frame_idx % policy.stride == 0:
+            ok, frame = _retrieve(cap, stats)
+            if ok:
+                yield frame_idx, frame
+        frame_idx += 1
+
+
+def _iter_keyframes(cap, policy: SamplingPolicy, stats: SamplingStats) -> Iterator[Tuple[int, np.ndarray]]:
+    global _keyframe_fallback_logged
+    if not _grab(cap, stats):
+        return
+    ok, frame = _retrieve(cap, stats)
+    if ok:
+        yield 0, frame
+    if cap.get(cv2.CAP_PROP_LRF_HAS_KEY_FRAME) <= 0:
+        stats.keyframe_fallbacks += 1
+        if not _keyframe_fallback_logged:
+            _keyframe_fallback_logged = True
+            print(
+                f"[WARN] Video backend {cap.getBackendName()} does not report key frames; "
+                f"falling back to uniform sampling (stride {policy.stride})"
+            )
+        yield from _iter_uniform(cap, policy, stats, frame_idx=1)
+        return
+    frame_idx = 1
+    while _grab(cap, stats):
+        if cap.get(cv2.CAP_PROP_LRF_HAS_KEY_FRAME) > 0:
+            ok, frame = _retrieve(cap, stats)
+            if ok:
+                yield frame_idx, frame
+        frame_idx += 1
+
+
+def _iter_time(cap, policy: SamplingPolicy, stats: SamplingStats) -> Iterator[Tuple[int, np.ndarray]]:
+    fps = cap.get(cv2.CAP_PROP_FPS)
+    if not fps or fps <= 0 or np.isnan(fps):
+        fps = 30.0
+    step = max(1, int(round(policy.interval_sec * fps)))
+    next_idx = 0
+    frame_idx = 0  # index of the frame the next grab() returns
+    while True:
+        gap = next_idx - frame_idx
+        if gap > policy.seek_frames:
+            if cap.set(cv2.CAP_PROP_POS_MSEC, next_idx * 1000.0 / fps):
+                stats.seeks += 1
+                frame_idx = next_idx
+        while frame_idx < next_idx:
+            if not _grab(cap, stats):
+                return
+            frame_idx += 1
+        if not _grab(cap, stats):
+            return
+        ok, frame = _retrieve(cap, stats)
+        if ok:
+            yield frame_idx, frame
+        frame_idx += 1
+        next_idx += step
+
+
+def iter_sampled_frames(
+    cap: cv2.VideoCapture, policy: SamplingPolicy, stats: SamplingStats
+) -> Iterator[Tuple[int, np.ndarray]]:
+    """Yield ``(frame_index, bgr_frame)`` for the frames selected by ``policy``."""
+    if policy.kind == "keyframe":
+        return _iter_keyframes(cap, policy, stats)
+    if policy.kind == "time":
+        return _iter_time(cap, policy, stats)
+    return _iter_uniform(cap, policy, stats)
@@ -1,94 +1,360 @@
 import argparse
+import csv
+import hashlib
 import json
 import os
 import random
 import shutil
+import sys
 import tempfile
-from typing import List, Tuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import List, Optional, Tuple
 
 import cv2
 import mediapipe as mp
 import numpy as np
-from yt_dlp import YoutubeDL
+
+# Make the repo-level ``signdao`` package importable when run as a script.
+_REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if _REPO_ROOT not in sys.path:
+    sys.path.insert(0, _REPO_ROOT)
+
+from signdao.dataset import DTYPES, save_dataset as write_dataset  # noqa: E402
+from signdao.features import landmark_feature  # noqa: E402
+from signdao.model import feature_spec_hash  # noqa: E402
+from signdao.sequence import SEQUENCE_LENGTH, resample, save_trajectories  # noqa: E402
+
+from landmark_cache import LandmarkCache  # noqa: E402
+from video_sampling import POLICIES, SamplingPolicy, SamplingStats, iter_sampled_frames  # noqa: E402
 
 
 random.seed(42)
 
 CLASSES = ("YES", "NO")
+VIDEO_EXTENSIONS = (".mp4", ".mov", ".avi", ".mkv", ".webm", ".m4v")
+EXTRACT_STRIDE = 5
+EXTRACT_MAX_SAMPLES = 60
+DEFAULT_CACHE_DIR = os.path.join("WLASL", "wlasl_lite", "landmark_cache")
+DATASET_FILE = "yes_no_landmarks.sdds"
+SEQUENCE_FILE = "yes_no_sequences.sdds"
 
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Download YES/NO samples and extract MediaPipe landmarks.")
-    parser.add_argument("--json", required=True, help="Path to WLASL_v0.3.json metadata file.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--json", help="Path to WLASL_v0.3.json metadata file.")
+    source.add_argument(
+        "--video_dir",
+        help="Offline mode: directory of downloaded videos, labelled by a YES/NO parent folder or a YES_/NO_ filename prefix.",
+    )
+    source.add_argument("--manifest", help="Offline mode: CSV of 'path,label' rows for downloaded videos.")
     parser.add_argument("--per_class", type=int, default=25, help="Maximum videos to download per class.")
     parser.add_argument("--keep_videos", action="store_true", help="Keep downloaded raw videos instead of deleting them.")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Offline mode: number of extraction processes (default: CPU count).",
+    )
+    parser.add_argument(
+        "--cache_dir",
+        default=DEFAULT_CACHE_DIR,
+        help="Per-video landmark cache; already-extracted videos are skipped on reruns.",
+    )
+    parser.add_argument(
+        "--sampling",
+        choices=POLICIES,
+        default="uniform",
+        help="Frame sampling policy: every --stride frames, key frames only, or every --interval seconds.",
+    )
+    parser.add_argument("--stride", type=int, default=EXTRACT_STRIDE, help="Frame stride for uniform sampling.")
+    parser.add_argument("--interval", type=float, default=0.2, help="Seconds between samples for time sampling.")
+    parser.add_argument("--dtype", choices=DTYPES, default="float16", help="Feature dtype of the saved dataset.")
+    parser.add_argument(
+        "--sequence",
+        action="store_true",
+        help=f"Keep each clip's trajectory, resampled to --sequence_length steps, for DTW templates ({SEQUENCE_FILE}).",
+    )
+    parser.add_argument("--sequence_length", type=int, default=SEQUENCE_LENGTH, help="Time steps per trajectory.")
     return parser.parse_args()
 
 
+def extraction_params(policy: SamplingPolicy, sequence_length: int = 0) -> dict:
+    """Everything that changes an extracted feature; part of every cache key."""
+    params = {
+        **policy.cache_params(),
+        "max_samples": EXTRACT_MAX_SAMPLES,
+        "feature_spec": feature_spec_hash(),
+    }
+    if sequence_length:
+        params["sequence_length"] = sequence_length
+    return params
+
+
 def load_wlasl_metadata(path: str) -> List[dict]:
     with open(path, "r", encoding="utf-8") as f:
         return json.load(f)
 
 
-def normalize_landmarks(coords: np.ndarray, handedness: str | None = None) -> np.ndarray:
-    wrist = coords[0]
-    middle_mcp = coords[9]
-    translated = coords - wrist
-    if handedness == "Left":
-        translated[:, 0] *= -1
-    scale = np.linalg.norm(middle_mcp - wrist)
-    if scale < 1e-6:
-        scale = 1.0
-    normalized = translated / scale
-    flattened = normalized[:, :2].flatten()
-    return flattened.astype(np.float32)
-
-
-def extract_landmarks_from_video(video_path: str) -> Tuple[bool, np.ndarray]:
-    mp_hands = mp.solutions.hands
-    samples: List[np.ndarray] = []
-    stride = 5
-    max_samples = 60
-    with mp_hands.Hands(
+def create_hands():
+    return mp.solutions.hands.Hands(
         static_image_mode=False,
         max_num_hands=1,
         model_complexity=1,
         min_detection_confidence=0.5,
         min_tracking_confidence=0.5,
-    ) as hands:
-        cap = cv2.VideoCapture(video_path)
-        frame_idx = 0
-        try:
-            while cap.isOpened():
-                success, frame = cap.read()
-                if not success:
-                    break
-                if frame_idx % stride == 0 and len(samples) < max_samples:
-                    rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                    results = hands.process(rgb)
-                    if results.multi_hand_landmarks:
-                        lm = results.multi_hand_landmarks[0].landmark
-                        coords = np.array([(p.x, p.y, p.z) for p in lm], dtype=np.float32)
-                        handedness = None
-                        if results.multi_handedness:
-                            handedness = results.multi_handedness[0].classification[0].label
-                        samples.append(normalize_landmarks(coords, handedness))
-                frame_idx += 1
+    )
+
+
+def sample_hand_features(
+    video_path: str,
+    hands,
+    policy: SamplingPolicy = SamplingPolicy(),
+    max_samples: int = EXTRACT_MAX_SAMPLES,
+    stats: Optional[SamplingStats] = None,
+) -> Tuple[np.ndarray, List[np.ndarray]]:
+    """Per-frame hand features of one clip and their timestamps in seconds.
+
+    ``hands``' tracking state is reset so clips do not influence each other.
+    Frames not selected by ``policy`` are grabbed but never retrieved into
+    arrays; pass ``stats`` to collect the frame counters.
+    """
+    stats = stats if stats is not None else SamplingStats()
+    hands.reset()
+    times: List[float] = []
+    samples: List[np.ndarray] = []
+    cap = cv2.VideoCapture(video_path)
+    try:
+        if cap.isOpened():
+            fps = cap.get(cv2.CAP_PROP_FPS)
+            if not fps or fps <= 0 or np.isnan(fps):
+                fps = 30.0
+            for frame_idx, frame in iter_sampled_frames(cap, policy, stats):
+                rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+                results = hands.process(rgb)
+                if results.multi_hand_landmarks:
+                    lm = results.multi_hand_landmarks[0].landmark
+                    coords = np.array([(p.x, p.y, p.z) for p in lm], dtype=np.float32)
+                    handedness = None
+                    if results.multi_handedness:
+                        handedness = results.multi_handedness[0].classification[0].label
+                    times.append(frame_idx / fps)
+                    samples.append(landmark_feature(coords, handedness))
+                    stats.frames_used += 1
                 if len(samples) >= max_samples:
                     break
-        finally:
-            cap.release()
+    finally:
+        cap.release()
+    return np.asarray(times, dtype=np.float64), samples
+
+
+def extract_landmarks_from_video(
+    video_path: str,
+    hands=None,
+    policy: SamplingPolicy = SamplingPolicy(),
+    max_samples: int = EXTRACT_MAX_SAMPLES,
+    stats: Optional[SamplingStats] = None,
+) -> Tuple[bool, np.ndarray]:
+    """Average the hand features sampled from one clip.
+
+    Pass a long-lived ``hands`` instance to avoid rebuilding the MediaPipe graph
+    per clip.
+    """
+    if hands is None:
+        with create_hands() as own_hands:
+            return extract_landmarks_from_video(video_path, own_hands, policy, max_samples, stats)
+
+    _, samples = sample_hand_features(video_path, hands, policy, max_samples, stats)
     if not samples:
         return False, np.array([], dtype=np.float32)
     feature = np.mean(samples, axis=0)
     return True, feature.astype(np.float32)
 
 
+def extract_trajectory_from_video(
+    video_path: str,
+    hands=None,
+    policy: SamplingPolicy = SamplingPolicy(),
+    length: int = SEQUENCE_LENGTH,
+    max_samples: int = EXTRACT_MAX_SAMPLES,
+    stats: Optional[SamplingStats] = None,
+) -> Tuple[bool, np.ndarray]:
+    """The clip's hand features over time, resampled to a fixed-rate ``(length, FEATURE_DIM)`` trajectory.
+
+    Frames without a hand are left out; the trajectory spans the first to the
+    last frame with one.
+    """
+    if hands is None:
+        with create_hands() as own_hands:
+            return extract_trajectory_from_video(video_path, own_hands, policy, length, max_samples, stats)
+
+    times, samples = sample_hand_features(video_path, hands, policy, max_samples, stats)
+    if len(samples) < 2:
+        return False, np.array([], dtype=np.float32)
+    return True, resample(times, np.stack(samples), length)
+
+
+def extract_clip(
+    video_path: str, hands, policy: SamplingPolicy, sequence_length: int = 0, stats: Optional[SamplingStats] = None
+) -> Tuple[bool, np.ndarray]:
+    """Trajectory when ``sequence_length`` is set, otherwise the averaged feature."""
+    if sequence_length:
+        return extract_trajectory_from_video(video_path, hands, policy, sequence_length, stats=stats)
+    return extract_landmarks_from_video(video_path, hands, policy, stats=stats)
+
+
+# One MediaPipe graph per pool process, built once by the pool initializer.
+_worker_hands = None
+
+
+def _init_worker() -> None:
+    global _worker_hands
+    _worker_hands = create_hands()
+
+
+def _extract_job(
+    key: str, video_path: str, label: str, policy: SamplingPolicy, sequence_length: int = 0
+) -> Tuple[str, str, str, bool, np.ndarray, SamplingStats]:
+    stats = SamplingStats()
+    ok, feature = extract_clip(video_path, _worker_hands, policy, sequence_length, stats)
+    return key, video_path, label, ok, feature, stats
+
+
+def label_from_path(path: str) -> Optional[str]:
+    parent = os.path.basename(os.path.dirname(path)).upper()
+    if parent in CLASSES:
+        return parent
+    prefix = os.path.basename(path).split("_", 1)[0].upper()
+    if prefix in CLASSES:
+        return prefix
+    return None
+
+
+def instance_key(label: str, video_id: str) -> str:
+    """Cache key for one clip; matches the ``<GLOSS>_<video_id>`` names used for downloads."""
+    return f"{label}_{video_id}"
+
+
+def key_from_path(path: str, label: str) -> str:
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return stem if stem.upper().startswith(f"{label}_") else instance_key(label, stem)
+
+
+def list_local_videos(video_dir: str) -> List[Tuple[str, str, str]]:
+    jobs = []
+    for root, _, files in os.walk(video_dir):
+        for name in sorted(files):
+            if not name.lower().endswith(VIDEO_EXTENSIONS):
+                continue
+            path = os.path.join(root, name)
+            label = label_from_path(path)
+            if label is None:
+                print(f"[WARN] Cannot infer YES/NO label for {path}, skipping.")
+                continue
+            jobs.append((key_from_path(path, label), path, label))
+    return jobs
+
+
+def load_manifest(path: str) -> List[Tuple[str, str, str]]:
+    base = os.path.dirname(os.path.abspath(path))
+    jobs = []
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        for row in csv.reader(f):
+            if len(row) < 2 or row[0].strip().lower() == "path":
+                continue
+            video_path, label = row[0].strip(), row[1].strip().upper()
+            if label not in CLASSES:
+                print(f"[WARN] Unknown label {label!r} for {video_path}, skipping.")
+                continue
+            if not os.path.isabs(video_path):
+                video_path = os.path.join(base, video_path)
+            jobs.append((key_from_path(video_path, label), video_path, label))
+    return jobs
+
+
+def extract_parallel(
+    jobs: List[Tuple[str, str, str]],
+    workers: int,
+    cache: LandmarkCache,
+    policy: SamplingPolicy,
+    sequence_length: int = 0,
+) -> int:
+    """Fan extraction out over a process pool, checkpointing results as they finish.
+
+    Videos already in ``cache`` are skipped. Each finished video is written to
+    the cache immediately, so an interrupted run keeps its work. Returns the
+    number of newly extracted videos.
+    """
+    pending = [job for job in jobs if job[0] not in cache]
+    skipped = len(jobs) - len(pending)
+    if skipped:
+        print(f"[INFO] Skipping {skipped} videos already in the cache")
+    if not pending:
+        return 0
+
+    print(f"[INFO] Extracting {len(pending)} videos with {workers} workers")
+    extracted = 0
+    totals = SamplingStats()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        futures = [pool.submit(_extract_job, *job, policy, sequence_length) for job in pending]
+        for finished, future in enumerate(as_completed(futures), start=1):
+            try:
+                key, video_path, label, ok, feature, stats = future.result()
+            except Exception as exc:
+                print(f"[WARN] Extraction failed: {exc}")
+                continue
+            cache.put(key, label, feature if ok else None)
+            totals.merge(stats)
+            extracted += 1
+            status = "ok" if ok else "no hand"
+            print(f"[INFO] [{finished}/{len(pending)}] {label} {os.path.basename(video_path)}: {status}")
+    print(f"[INFO] Frames: {totals.summary()}")
+    return extracted
+
+
+def save_dataset(dataset_path: str, cache: LandmarkCache, dtype: str = "float16") -> None:
+    """Rebuild the dataset from every cached video, so reruns never duplicate rows."""
+    X, y, video_ids = cache.assemble()
+    if len(y) == 0:
+        print("[WARN] No samples in the cache. Existing dataset remains unchanged.")
+        return
+
+    # A pre-cache yes_no_landmarks.npz cannot be rebuilt from the cache; it is left in place.
+    legacy_path = os.path.splitext(dataset_path)[0] + ".npz"
+    if os.path.exists(legacy_path):
+        print(f"[INFO] Leaving legacy dataset {legacy_path} untouched")
+
+    extra = {"video_ids": [str(v) for v in video_ids]}
+    if X.ndim == 3:
+        save_trajectories(dataset_path, X, y, dtype=dtype, extra=extra)
+    else:
+        write_dataset(dataset_path, X, y, dtype=dtype, labels=CLASSES, extra=extra)
+    feature_size = "x".join(str(n) for n in X.shape[1:])
+    counts = ", ".join(f"{gloss}:{int(np.sum(y == gloss))}" for gloss in CLASSES)
+    print(f"[INFO] Saved {len(y)} samples ({counts}) with feature size {feature_size} ({dtype}) -> {dataset_path}")
+    if len(y) < 10:
+        print("[WARN] Low sample count. Re-run with --per_class 40")
+
+
+def run_offline(
+    args: argparse.Namespace, dataset_path: str, cache: LandmarkCache, policy: SamplingPolicy, sequence_length: int = 0
+) -> None:
+    jobs = list_local_videos(args.video_dir) if args.video_dir else load_manifest(args.manifest)
+    if not jobs:
+        print("[WARN] No labelled videos found. Existing dataset remains unchanged.")
+        return
+    extract_parallel(jobs, max(1, args.workers), cache, policy, sequence_length)
+    save_dataset(dataset_path, cache, args.dtype)
+
+
 def ensure_directory(path: str) -> None:
     os.makedirs(path, exist_ok=True)
 
 
 def download_video(url: str, video_id: str, directory: str) -> str | None:
+    # Imported here so the offline modes work without yt-dlp installed.
+    from yt_dlp import YoutubeDL
+
     ydl_opts = {
         "outtmpl": os.path.join(directory, f"{video_id}.%(ext)s"),
         "quiet": True,
@@ -116,14 +382,22 @@ def main() -> None:
     args = parse_args()
     output_dir = os.path.join("WLASL", "wlasl_lite")
     ensure_directory(output_dir)
-    dataset_path = os.path.join(output_dir, "yes_no_landmarks.npz")
+    sequence_length = max(2, args.sequence_length) if args.sequence else 0
+    dataset_path = os.path.join(output_dir, SEQUENCE_FILE if sequence_length else DATASET_FILE)
+    policy = SamplingPolicy(kind=args.sampling, stride=max(1, args.stride), interval_sec=args.interval)
+    cache = LandmarkCache(args.cache_dir, extraction_params(policy, sequence_length))
+    print(f"[INFO] Using landmark cache: {cache.directory}")
+
+    if not args.json:
+        run_offline(args, dataset_path, cache, policy, sequence_length)
+        return
 
     metadata = load_wlasl_metadata(args.json)
 
     temp_dir = tempfile.mkdtemp(prefix="wlasl_dl_")
     print(f"[INFO] Using temporary download folder: {temp_dir}")
-    downloaded_features: List[np.ndarray] = []
-    downloaded_labels: List[str] = []
+    hands = create_hands()
+    totals = SamplingStats()
 
     try:
         for gloss in CLASSES:
@@ -139,16 +413,22 @@ def main() -> None:
                     if collected >= args.per_class:
                         break
                     url = inst.get("url")
-                    video_id = inst.get("video_id") or f"{gloss}_{collected}"
                     if not url:
                         continue
-                    video_path = download_video(url, f"{gloss}_{video_id}", temp_dir)
+                    video_id = inst.get("video_id") or hashlib.sha1(url.encode("utf-8")).hexdigest()[:12]
+                    key = instance_key(gloss, video_id)
+                    cached = cache.get(key)
+                    if cached is not None:
+                        if cached[1] is not None:
+                            collected += 1
+                            print(f"[INFO] Cached sample {collected}/{args.per_class} for {gloss}")
+                        continue
+                    video_path = download_video(url, key, temp_dir)
                     if not video_path or not os.path.exists(video_path):
                         continue
-                    ok, feature = extract_landmarks_from_video(video_path)
+                    ok, feature = extract_clip(video_path, hands, policy, sequence_length, totals)
+                    cache.put(key, gloss, feature if ok else None)
                     if ok:
-                        downloaded_features.append(feature)
-                        downloaded_labels.append(gloss)
                         collected += 1
                         print(f"[INFO] Collected sample {collected}/{args.per_class} for {gloss}")
                     if not args.keep_videos:
@@ -157,32 +437,14 @@ def main() -> None:
                         except OSError:
                             pass
     finally:
+        hands.close()
         if not args.keep_videos:
             shutil.rmtree(temp_dir, ignore_errors=True)
         else:
             print(f"[INFO] Videos retained at {temp_dir}")
 
-    if not downloaded_features:
-        print("[WARN] No new samples collected. Existing dataset remains unchanged.")
-        return
-
-    X_new = np.stack(downloaded_features, axis=0)
-    y_new = np.array(downloaded_labels, dtype=object)
-
-    if os.path.exists(dataset_path):
-        existing = np.load(dataset_path, allow_pickle=True)
-        X_existing = existing["X"]
-        y_existing = existing["y"]
-        X = np.concatenate([X_existing, X_new], axis=0)
-        y = np.concatenate([y_existing, y_new], axis=0)
-    else:
-        X, y = X_new, y_new
-
-    feature_size = X.shape[1]
-    np.savez(dataset_path, X=X, y=y)
-    print(f"[INFO] Saved {len(y)} samples with feature size {feature_size} -> {dataset_path}")
-    if len(y) < 10:
-        print("[WARN] Low sample count. Re-run with --per_class 40")
+    print(f"[INFO] Frames: {totals.summary()}")
+    save_dataset(dataset_path, cache, args.dtype)
 
 
 if __name__ == "__main__":
@@ -6,10 +6,20 @@
 #   pip install -r requirements.txt   # installs Flask + Flask-CORS etc.
 #
 # Run:
-#   python api.py
+#   python api.py                      # or: flask --app api run (uses create_app)
 #
 # Test:
 #   curl http://localhost:5000/gesture
+#   curl -N http://localhost:5000/gesture/stream   # push updates (SSE)
+#   curl http://localhost:5000/metrics             # Prometheus stage latencies + counters
+#   curl http://localhost:5000/ready               # readiness probe + startup timings
+#   curl -X POST http://localhost:5000/gesture/classify \
+#        -H "Content-Type: application/json" -d '{"landmarks": [[0.5, 0.5, 0.0], ...], "handedness": "Right"}'
+#
+# Several cameras (one worker process each):
+#   GESTURE_SOURCES="booth1=0,booth2=1" python api.py
+#   curl http://localhost:5000/gesture/booth2
+#   curl -N http://localhost:5000/gesture/booth2/stream
 #   # or open http://localhost:5000/gesture in a browser
 #
 # Notes:
@@ -20,23 +30,132 @@
 
 """Minimal Flask API that bridges gesture recognition output to the frontend."""
 
-from flask import Flask, jsonify
+import atexit
+import os
+from typing import Optional
+
+from flask import Flask, Response, jsonify, request
 from flask_cors import CORS
 
-from gesture_recognition import detect_gesture
+from gesture_sources import SourceManager, check_spawn
+from gesture_stream import DEFAULT_CONFIDENCE_DELTA, parse_cursor
+from landmark_ingest import DEFAULT_MODEL_PATH, IngestError, LandmarkBatcher, LandmarkClassifier, parse_request
+from signdao.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, REGISTRY  # importable via gesture_recognition
+from signdao.startup import STARTUP, WarmUp
 
-app = Flask(__name__)
+# Minimum confidence change that produces a stream event when the label is unchanged.
+_STREAM_DELTA = float(os.environ.get("GESTURE_STREAM_DELTA", DEFAULT_CONFIDENCE_DELTA))
 
-# Allow only the local Next.js app to access the gesture endpoint during development.
-CORS(app, resources={r"/gesture": {"origins": "http://localhost:3000"}})
+STARTUP.mark("import")
 
 
-@app.get("/gesture")
-def gesture():
-    """Return the latest gesture classification as JSON."""
-    return jsonify(detect_gesture()), 200
+def create_app() -> Flask:
+    """Build the app with its capture sources, ingest batcher and warm-up thread.
 
+    Nothing here runs at import time: capture workers are spawned processes
+    that re-import this module as ``__mp_main__``, and must not build a
+    second ``SourceManager`` or load the ingest model.
+    """
+    app = Flask(__name__)
 
-if __name__ == "__main__":
-    app.run(host="0.0.0.0", port=5000, debug=True)
+    # Allow only the local Next.js app to access the gesture endpoints during development.
+    CORS(app, resources={r"/gesture.*": {"origins": "http://localhost:3000"}})
+
+    # Capture sources come from GESTURE_SOURCES / GESTURE_IDLE_SEC; workers start on first request.
+    source_manager = SourceManager.from_env(confidence_delta=_STREAM_DELTA)
+    atexit.register(source_manager.close)
+    # Landmarks POSTed by remote clients; concurrent requests share one classification batch.
+    classifier = LandmarkClassifier(os.environ.get("GESTURE_MODEL_PATH", DEFAULT_MODEL_PATH))
+    ingest = LandmarkBatcher(classifier)
+    atexit.register(ingest.close)
+
+    # Load the KNN model off the request path and check that capture workers can start;
+    # the workers warm themselves up when started.
+    warm_up = WarmUp({"ingest_model": classifier.warm_up, "worker_spawn": check_spawn}, name="api-warm-up").start()
+
+    def unknown_source(name: Optional[str]):
+        return jsonify({"error": f"unknown source {name!r}", "sources": source_manager.names()}), 404
+
+    @app.get("/gesture")
+    @app.get("/gesture/<source>")
+    def gesture(source: Optional[str] = None):
+        """Return the latest gesture classification for a source (the first one by default).
+
+        Each source's worker process publishes results in the background, so this
+        only reads the most recent snapshot and never blocks on a camera.
+        """
+        gesture_source = source_manager.get(source)
+        if gesture_source is None:
+            return unknown_source(source)
+        return jsonify(gesture_source.snapshot().to_payload()), 200
+
+    @app.get("/gesture/stream")
+    @app.get("/gesture/<source>/stream")
+    def gesture_stream(source: Optional[str] = None):
+        """Stream gesture changes for a source as Server-Sent Events.
 
+        Reconnecting clients resume from the ``Last-Event-ID`` header (sent
+        automatically by ``EventSource``) or an explicit ``?cursor=`` parameter.
+        """
+        gesture_source = source_manager.get(source)
+        if gesture_source is None:
+            return unknown_source(source)
+        gesture_source.touch()  # make sure the capture worker is running
+        cursor = parse_cursor(request.headers.get("Last-Event-ID") or request.args.get("cursor"))
+        return Response(
+            gesture_source.stream(cursor),
+            mimetype="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    @app.post("/gesture/classify")
+    def classify_landmarks():
+        """Classify client-side landmarks (JSON or float32 binary) with the recognizer's fused rules + KNN."""
+        try:
+            landmarks, handedness = parse_request(
+                request.get_data(cache=False), request.content_type, request.args.get("handedness")
+            )
+            results = ingest.submit(landmarks, handedness)
+        except IngestError as exc:
+            return jsonify({"error": str(exc)}), exc.status
+        except TimeoutError as exc:
+            return jsonify({"error": str(exc)}), 503
+        return jsonify({"results": [{"gesture": label, "confidence": round(conf, 3)} for label, conf in results]}), 200
+
+    @app.get("/ready")
+    def ready():
+        """Readiness probe: 200 once warm-up finished and every running capture source has warmed up.
+
+        Idle sources do not block readiness; they start on first request. A source
+        whose worker keeps exiting does, as does a failed worker spawn check.
+        """
+        sources = source_manager.status()
+        is_ready = (
+            warm_up.ready
+            and "worker_spawn" not in warm_up.failed
+            and all(s["ready"] for s in sources.values() if s["running"])
+            and not any(s["failing"] for s in sources.values())
+        )
+        body = {
+            "ready": is_ready,
+            "startup_ms": STARTUP.to_dict(),
+            "warm_up": {"done": warm_up.done, "failed": warm_up.failed},
+            "sources": sources,
+        }
+        return jsonify(body), 200 if is_ready else 503
+
+    @app.get("/metrics")
+    def metrics():
+        """Per-stage latency histograms and frame counters in Prometheus text format, per source.
+
+        Capture metrics the API process never records itself are left out;
+        its workers report them under their ``source`` label.
+        """
+        body = REGISTRY.render(source_manager.metrics_states(), local_idle=False)
+        return Response(body, content_type=METRICS_CONTENT_TYPE)
+
+    return app
+
+
+if __name__ == "__main__":
+    create_app().run(host="0.0.0.0", port=5000, debug=True)
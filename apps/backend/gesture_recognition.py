@@ -9,139 +9,432 @@ Detects simple ASL 'YES'/'NO' from webcam and returns JSON.
 #   python api.py
 # Then open http://localhost:3000/proofs to see live YES/NO gestures.
 # Tip: Good lighting improves detection.
+# Set GESTURE_ROI=1 to run MediaPipe on a crop around the tracked hand (cheaper at 1080p),
+# and GESTURE_MOTION_GATE=1 to skip inference while the scene is static.
+# Set GESTURE_MAX_HANDS=4 to follow up to four voters sharing one camera; snapshots then
+# list every hand under "hands" with a stable id, and the top-level gesture is the
+# longest-tracked hand's.
 
 from __future__ import annotations
 
 import atexit
+import os
+import sys
 import threading
 import time
-from typing import Final, Optional, TypedDict
+from dataclasses import dataclass
+from typing import Callable, Final, Optional, TypedDict
 
 import cv2
-import mediapipe as mp
 import numpy as np
 
+# Make the repo-level ``signdao`` package importable when run from apps/backend.
+# Appended, not prepended: the repo root also has a gesture_recognition.py (the
+# CLI), and spawned capture workers inherit this sys.path, so apps/backend must
+# stay ahead of it or the workers import the wrong module.
+_REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if _REPO_ROOT not in sys.path:
+    sys.path.append(_REPO_ROOT)
+
+from signdao import metrics  # noqa: E402
+from signdao.decision import DecisionEngine  # noqa: E402
+from signdao.features import left_hand_mask  # noqa: E402
+from signdao.fusion import classify_batch  # noqa: E402
+from signdao.motion import MotionGate  # noqa: E402
+from signdao.roi import HandROITracker  # noqa: E402
+from signdao.startup import STARTUP  # noqa: E402
+from signdao.tracks import HandTracks, hand_centers  # noqa: E402
+
+# (N, 21, 3) landmarks and an (N,) left-hand mask -> (labels, confidences).
+BatchClassifier = Callable[[np.ndarray, np.ndarray], tuple[np.ndarray, np.ndarray]]
+
 
 class GesturePayload(TypedDict):
     gesture: str
     confidence: float
 
 
-_DEFAULT_RESPONSE: Final[GesturePayload] = {"gesture": "N/A", "confidence": 0.0}
-_POSITIVE_RESPONSE: Final[GesturePayload] = {"gesture": "YES", "confidence": 0.9}
-_NEGATIVE_RESPONSE: Final[GesturePayload] = {"gesture": "NO", "confidence": 0.9}
-_CAPTURE_INDEX: Final[int] = 0
-_READ_TIMEOUT_SEC: Final[float] = 1.0
+class HandPayload(GesturePayload, total=False):
+    id: int
+    decision: str
+
+
+class SnapshotPayload(GesturePayload):
+    ts: float
+    seq: int
+    hands: list[HandPayload]
 
-_mp_hands = mp.solutions.hands
-_hands = _mp_hands.Hands(
-    static_image_mode=False,
-    max_num_hands=1,
-    min_detection_confidence=0.4,
-    min_tracking_confidence=0.4,
-)
 
-_capture_lock: Final[threading.Lock] = threading.Lock()
-_capture: Optional[cv2.VideoCapture] = None
+@dataclass(frozen=True)
+class HandReading:
+    """One hand's per-frame label and where it is, before smoothing."""
 
+    center: tuple[float, float]  # mean landmark x, y in normalized frame coordinates
+    gesture: str
+    confidence: float
 
-def _release_capture() -> None:
-    """Release the camera if it is currently open."""
-    global _capture
-    if _capture is None:
-        return
 
-    try:
-        if _capture.isOpened():
-            _capture.release()
-    finally:
-        _capture = None
+_DEFAULT_RESPONSE: Final[GesturePayload] = {"gesture": "N/A", "confidence": 0.0}
+_CAPTURE_INDEX: Final[int] = 0
+_READ_TIMEOUT_SEC: Final[float] = 1.0
+# Target cadence of the background worker; the camera usually caps it lower.
+_WORKER_INTERVAL_SEC: Final[float] = 0.05
+# Pause before retrying when the camera cannot be opened at all.
+_WORKER_RETRY_SEC: Final[float] = 1.0
+# Run MediaPipe on a downsized crop around the tracked hand (GESTURE_ROI=1).
+_ROI_MODE: Final[bool] = os.environ.get("GESTURE_ROI", "0") == "1"
+# Reuse the last result while the scene is static (GESTURE_MOTION_GATE=1).
+_MOTION_GATE: Final[bool] = os.environ.get("GESTURE_MOTION_GATE", "0") == "1"
+# Hands (voters) MediaPipe looks for per frame (GESTURE_MAX_HANDS).
+_MAX_HANDS: Final[int] = max(1, int(os.environ.get("GESTURE_MAX_HANDS", "1")))
+
+_STAGE_READ = metrics.stage("capture_read")
+_STAGE_COLOR = metrics.stage("color_convert")
+_STAGE_HANDS = metrics.stage("hands_process")
+_STAGE_RULE = metrics.stage("classify_rule")
+_STAGE_SMOOTH = metrics.stage("smoothing")
+_STAGE_OUTPUT = metrics.stage("output")
+
+
+def _create_hands(max_hands: int = _MAX_HANDS):
+    """Build a Hands graph and push one blank frame through it; timings go to ``STARTUP``."""
+    with STARTUP.phase("graph_init"):
+        import mediapipe as mp
+
+        hands = mp.solutions.hands.Hands(
+            static_image_mode=False,
+            max_num_hands=max_hands,
+            min_detection_confidence=0.4,
+            min_tracking_confidence=0.4,
+        )
+    with STARTUP.phase("first_inference"):
+        hands.process(np.zeros((240, 320, 3), dtype=np.uint8))
+    return hands
+
+
+class CameraClassifier:
+    """One capture device with its own MediaPipe graph and per-stream tracking state.
+
+    The camera is opened on first read and MediaPipe is created on first
+    classification, so constructing one is cheap; ``warm_up`` does both up
+    front. ``close`` releases them. All hands in a frame are labelled with one
+    ``classify`` call, which defaults to the rule-based scores alone; pass a
+    ``landmark_ingest.LandmarkClassifier`` to add the KNN model.
+    """
+
+    def __init__(
+        self,
+        device: int | str = _CAPTURE_INDEX,
+        classify: Optional[BatchClassifier] = None,
+        max_hands: int = _MAX_HANDS,
+    ) -> None:
+        self.device = device
+        self.max_hands = max_hands
+        self._classify: BatchClassifier = classify or classify_batch
+        self._capture_lock = threading.Lock()
+        self._capture: Optional[cv2.VideoCapture] = None
+        self._capture_opened = False  # the first successful open is not a reopen
+        self._hands = None
+        self._roi: Optional[HandROITracker] = HandROITracker(max_hands=max_hands) if _ROI_MODE else None
+        self._gate: Optional[MotionGate[tuple[HandReading, ...]]] = MotionGate() if _MOTION_GATE else None
+
+    def warm_up(self) -> None:
+        """Create the MediaPipe graph and open the camera before the first frame is needed."""
+        if self._hands is None:
+            self._hands = _create_hands(self.max_hands)
+        with STARTUP.phase("capture_open"), self._capture_lock:
+            self._open_capture()
+
+    def _release_capture(self) -> None:
+        """Release the camera if it is currently open."""
+        if self._capture is None:
+            return
+
+        try:
+            if self._capture.isOpened():
+                self._capture.release()
+        finally:
+            self._capture = None
+
+    def close(self) -> None:
+        """Release the camera and the MediaPipe graph."""
+        with self._capture_lock:
+            self._release_capture()
+        if self._hands is not None:
+            self._hands.close()
+            self._hands = None
+
+    def _open_capture(self) -> Optional[cv2.VideoCapture]:
+        """Open the camera if it is not already available."""
+        if self._capture is not None and self._capture.isOpened():
+            return self._capture
+
+        # Release any stale handle before attempting to reacquire the camera.
+        self._release_capture()
+
+        try:
+            capture = cv2.VideoCapture(self.device)
+            if capture.isOpened():
+                if self._capture_opened:
+                    metrics.CAPTURE_REOPENS.inc()
+                self._capture_opened = True
+                # Reduce internal buffering so each read returns a fresh frame.
+                capture.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+                self._capture = capture
+                return self._capture
+        except Exception:
+            pass
+
+        return None
+
+    def _read_frame(self) -> Optional[np.ndarray]:
+        """Attempt to read one frame from the camera within a short timeout."""
+        deadline = time.perf_counter() + _READ_TIMEOUT_SEC
+
+        with self._capture_lock:
+            capture = self._open_capture()
+            if capture is None:
+                return None
+
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                ok, frame = capture.read()
+                _STAGE_READ.observe(time.perf_counter() - started)
+                if ok:
+                    metrics.FRAMES.inc()
+                    return frame
+                metrics.READ_FAILURES.inc()
+                time.sleep(0.05)
+
+            # Timed out; drop the capture so the next request can retry cleanly.
+            self._release_capture()
+
+        return None
+
+    def _classify_frame(self, frame: np.ndarray) -> tuple[HandReading, ...]:
+        """Run MediaPipe on a BGR frame and label every hand in one batch; empty without hands."""
+        started = time.perf_counter()
+        try:
+            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        except Exception:
+            return ()
+        _STAGE_COLOR.observe(time.perf_counter() - started)
+
+        if self._hands is None:
+            self._hands = _create_hands(self.max_hands)
+        rgb_frame.flags.writeable = False
+        height, width = rgb_frame.shape[:2]
+        started = time.perf_counter()
+        if self._roi is not None:
+            results, transform = self._roi.process(self._hands, rgb_frame)
+        else:
+            results, transform = self._hands.process(rgb_frame), None
+        _STAGE_HANDS.observe(time.perf_counter() - started)
+
+        if not results.multi_hand_landmarks:
+            if self._roi is not None:
+                self._roi.update(None, width, height)
+            return ()
+
+        metrics.HANDS_DETECTED.inc()
+        started = time.perf_counter()
+        landmarks = np.array(
+            [[(lm.x, lm.y, lm.z) for lm in hand.landmark] for hand in results.multi_hand_landmarks],
+            dtype=np.float32,
+        )
+        if transform is not None:
+            landmarks = transform.to_frame(landmarks)
+            self._roi.update(landmarks.reshape(-1, 3), width, height)
+
+        handedness = [hand.classification[0].label for hand in results.multi_handedness or []]
+        handedness += [None] * (len(landmarks) - len(handedness))
+        labels, confidence = self._classify(landmarks, left_hand_mask(handedness))
+        _STAGE_RULE.observe(time.perf_counter() - started)
+
+        centers = hand_centers(landmarks)
+        return tuple(
+            HandReading((float(x), float(y)), str(label), round(float(conf), 3))
+            for (x, y), label, conf in zip(centers, labels, confidence)
+        )
+
+    def capture_and_classify(self) -> tuple[tuple[HandReading, ...], float, bool]:
+        """Read one frame and classify its hands; returns (readings, frame timestamp, got_frame)."""
+        try:
+            frame = self._read_frame()
+        except Exception:
+            with self._capture_lock:
+                self._release_capture()
+            return (), time.time(), False
+
+        frame_ts = time.time()
+        if frame is None:
+            return (), frame_ts, False
+
+        if self._gate is not None:
+            if not self._gate.should_process(frame):
+                return self._gate.cached, frame_ts, True
+            readings = self._classify_frame(frame)
+            self._gate.remember(readings)
+            return readings, frame_ts, True
+
+        return self._classify_frame(frame), frame_ts, True
+
+
+_default_classifier: Optional[CameraClassifier] = None
 
 
 def _release_resources() -> None:
     """Callback used at interpreter shutdown to release hardware resources."""
-    _release_capture()
-    _hands.close()
+    if _default_classifier is not None:
+        _default_classifier.close()
 
 
 atexit.register(_release_resources)
 
 
-def _open_capture() -> Optional[cv2.VideoCapture]:
-    """Open the webcam if it is not already available."""
-    global _capture
-    if _capture is not None and _capture.isOpened():
-        return _capture
-
-    # Release any stale handle before attempting to reacquire the camera.
-    _release_capture()
-
-    try:
-        capture = cv2.VideoCapture(_CAPTURE_INDEX)
-        if capture.isOpened():
-            # Reduce internal buffering so each read returns a fresh frame.
-            capture.set(cv2.CAP_PROP_BUFFERSIZE, 1)
-            _capture = capture
-            return _capture
-    except Exception:
-        pass
-
-    return None
-
-
-def _read_frame() -> Optional[np.ndarray]:
-    """Attempt to read one frame from the webcam within a short timeout."""
-    deadline = time.perf_counter() + _READ_TIMEOUT_SEC
-
-    with _capture_lock:
-        capture = _open_capture()
-        if capture is None:
-            return None
-
-        while time.perf_counter() < deadline:
-            ok, frame = capture.read()
-            if ok:
-                return frame
-            time.sleep(0.05)
-
-        # Timed out; drop the capture so the next request can retry cleanly.
-        _release_capture()
-
-    return None
-
-
 def detect_gesture() -> GesturePayload:
-    """Detect whether the current hand pose is a YES (thumbs up) or NO (thumbs down)."""
-    try:
-        frame = _read_frame()
-    except Exception:
-        _release_capture()
+    """Detect whether the current hand pose is a YES (thumbs up) or NO (open palm); first hand only."""
+    global _default_classifier
+    if _default_classifier is None:
+        _default_classifier = CameraClassifier()
+    readings, _, _ = _default_classifier.capture_and_classify()
+    if not readings:
         return _DEFAULT_RESPONSE
+    return {"gesture": readings[0].gesture, "confidence": readings[0].confidence}
 
-    if frame is None:
-        return _DEFAULT_RESPONSE
 
-    try:
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-    except Exception:
-        return _DEFAULT_RESPONSE
+@dataclass(frozen=True)
+class HandSnapshot:
+    """One tracked hand's smoothed label; ``decision`` is set on the frame its vote commits."""
 
-    rgb_frame.flags.writeable = False
-    results = _hands.process(rgb_frame)
+    track_id: int
+    gesture: str
+    confidence: float
+    decision: Optional[str] = None
 
-    if not results.multi_hand_landmarks:
-        return _DEFAULT_RESPONSE
+    def to_payload(self) -> HandPayload:
+        payload: HandPayload = {"id": self.track_id, "gesture": self.gesture, "confidence": self.confidence}
+        if self.decision is not None:
+            payload["decision"] = self.decision
+        return payload
 
-    landmarks = np.array(
-        [(lm.x, lm.y, lm.z) for lm in results.multi_hand_landmarks[0].landmark],
-        dtype=np.float32,
-    )
 
-    if landmarks.shape[0] <= 4:
-        return _DEFAULT_RESPONSE
+@dataclass(frozen=True)
+class GestureSnapshot:
+    """Immutable result of one worker iteration, safe to share across threads.
+
+    ``gesture`` and ``confidence`` are those of the longest-tracked hand;
+    ``hands`` lists every tracked hand in the frame.
+    """
+
+    gesture: str
+    confidence: float
+    frame_ts: float
+    seq: int
+    hands: tuple[HandSnapshot, ...] = ()
+
+    def to_payload(self) -> SnapshotPayload:
+        return {
+            "gesture": self.gesture,
+            "confidence": self.confidence,
+            "ts": self.frame_ts,
+            "seq": self.seq,
+            "hands": [hand.to_payload() for hand in self.hands],
+        }
+
+
+EMPTY_SNAPSHOT: Final[GestureSnapshot] = GestureSnapshot(
+    gesture=_DEFAULT_RESPONSE["gesture"],
+    confidence=_DEFAULT_RESPONSE["confidence"],
+    frame_ts=0.0,
+    seq=0,
+)
 
-    thumb_tip_y = landmarks[4, 1]
-    thumb_ip_y = landmarks[3, 1]
-    thumb_up = thumb_tip_y < thumb_ip_y
 
-    return _POSITIVE_RESPONSE if thumb_up else _NEGATIVE_RESPONSE
+class GestureWorker:
+    """Long-lived thread that captures and classifies frames at a steady rate.
+
+    Each iteration replaces ``self._snapshot`` with a new frozen object. Readers
+    only dereference that attribute, which is atomic under the GIL, so serving
+    the latest result never waits on the camera or on MediaPipe. Each hand
+    is matched to a stable track, and its per-frame labels are smoothed by
+    that track's own ``DecisionEngine`` before they are published.
+    """
+
+    def __init__(self, classifier: CameraClassifier, interval_sec: float = _WORKER_INTERVAL_SEC) -> None:
+        self._classifier = classifier
+        self._interval_sec = interval_sec
+        self._tracks: HandTracks[DecisionEngine] = HandTracks(DecisionEngine)
+        self._snapshot: GestureSnapshot = EMPTY_SNAPSHOT
+        self._stop_event = threading.Event()
+        self._start_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._listeners: list[Callable[[GestureSnapshot], None]] = []
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def snapshot(self) -> GestureSnapshot:
+        return self._snapshot
+
+    def add_listener(self, listener: Callable[[GestureSnapshot], None]) -> None:
+        """Call ``listener`` from the worker thread with every new snapshot."""
+        self._listeners.append(listener)
+
+    def start(self) -> None:
+        with self._start_lock:
+            if self.running:
+                return
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._run, name="gesture-worker", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 2.0) -> None:
+        self._stop_event.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        self._thread = None
+
+    def _publish(self, hands: tuple[HandSnapshot, ...], frame_ts: float) -> None:
+        primary = hands[0] if hands else None
+        snapshot = GestureSnapshot(
+            gesture=primary.gesture if primary else _DEFAULT_RESPONSE["gesture"],
+            confidence=primary.confidence if primary else _DEFAULT_RESPONSE["confidence"],
+            frame_ts=frame_ts,
+            seq=self._snapshot.seq + 1,
+            hands=hands,
+        )
+        self._snapshot = snapshot
+        for listener in self._listeners:
+            try:
+                listener(snapshot)
+            except Exception as exc:
+                print(f"[WARN] Gesture listener failed: {exc}")
+
+    def _smooth(self, readings: tuple[HandReading, ...], frame_ts: float) -> tuple[HandSnapshot, ...]:
+        """Smoothed per-track labels, oldest track first; tracks not in view are reset."""
+        started = time.perf_counter()
+        assigned = self._tracks.assign(np.array([reading.center for reading in readings], dtype=np.float32))
+        hands = []
+        for (track_id, engine), reading in zip(assigned, readings):
+            update = engine.update(reading.gesture, reading.confidence, now=frame_ts)
+            decision = update.decision.label if update.decision is not None else None
+            hands.append(HandSnapshot(track_id, update.label, round(update.confidence, 3), decision))
+        _STAGE_SMOOTH.observe(time.perf_counter() - started)
+        return tuple(sorted(hands, key=lambda hand: hand.track_id))
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            started = time.perf_counter()
+            readings, frame_ts, got_frame = self._classifier.capture_and_classify()
+            smoothed = self._smooth(readings, frame_ts)
+            published = time.perf_counter()
+            self._publish(smoothed, frame_ts)
+            _STAGE_OUTPUT.observe(time.perf_counter() - published)
+
+            delay = self._interval_sec if got_frame else _WORKER_RETRY_SEC
+            remaining = delay - (time.perf_counter() - started)
+            if remaining > 0:
+                self._stop_event.wait(remaining)
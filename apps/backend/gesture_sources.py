@@ -0,0 +1,326 @@
+"""
+Capture sources for the backend: one worker process per camera.
+
+``GESTURE_SOURCES`` names the cameras, e.g. ``booth1=0,booth2=1,door=rtsp://...``.
+The default is ``default=0``. Each source runs a ``GestureWorker`` with its own
+``CameraClassifier`` in a separate process, so MediaPipe inference on one
+booth never competes with another for the GIL. Workers label hands with the
+same rule-based + KNN fusion as the ingest endpoint (``GESTURE_MODEL_PATH``).
+The child sends snapshots through a pipe, plus its metrics state every few
+seconds. In the parent, a reader thread renumbers the snapshots so sequence
+numbers stay monotonic across restarts, and feeds them to the source's
+broadcaster.
+
+A new worker builds its MediaPipe graph and opens the camera before it starts
+polling, then reports those startup timings; the source counts as ready once
+they arrive. A source is started on first use. ``SourceManager`` stops any
+source that has not been read or streamed for ``GESTURE_IDLE_SEC`` seconds
+(default 60, 0 disables), which releases its camera and CPU. The next request
+starts it again.
+
+A worker that exits on its own marks its source ``failing`` until a new
+worker reports startup, so the readiness probe does not mistake a crash loop
+for an idle source. ``check_spawn`` starts one empty worker to prove that a
+spawned interpreter can import the worker modules; the API runs it during
+warm-up, and ``python gesture_sources.py`` runs it as a smoke check.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import multiprocessing
+import os
+import threading
+import time
+from typing import Final, Iterator, Mapping, Optional
+
+from gesture_recognition import EMPTY_SNAPSHOT, CameraClassifier, GestureSnapshot, GestureWorker
+from gesture_stream import DEFAULT_CONFIDENCE_DELTA, GestureBroadcaster
+from landmark_ingest import DEFAULT_MODEL_PATH, LandmarkClassifier
+from signdao import metrics  # importable via gesture_recognition
+from signdao.startup import STARTUP
+
+DEFAULT_SOURCES: Final[str] = "default=0"
+DEFAULT_IDLE_SEC: Final[float] = 60.0
+# How often a worker process ships its metrics to the parent.
+_METRICS_PUSH_SEC: Final[float] = 5.0
+_STOP_TIMEOUT_SEC: Final[float] = 3.0
+# Minimum gap between worker starts, so a crashing worker is not respawned per request.
+_RESTART_BACKOFF_SEC: Final[float] = 2.0
+# Spawn, not fork: MediaPipe and camera handles must not be inherited.
+_MP: Final = multiprocessing.get_context("spawn")
+_SPAWN_CHECK_TIMEOUT_SEC: Final[float] = 30.0
+
+
+def parse_sources(spec: str) -> dict[str, int | str]:
+    """Parse ``name=device,...``; numeric devices are camera indexes, others paths or URLs."""
+    sources: dict[str, int | str] = {}
+    for item in spec.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        name, sep, device = item.partition("=")
+        if not sep or not name.strip() or not device.strip():
+            raise ValueError(f"Invalid capture source {item!r}; expected name=device")
+        device = device.strip()
+        sources[name.strip()] = int(device) if device.isdigit() else device
+    if not sources:
+        raise ValueError("No capture sources configured")
+    return sources
+
+
+def _spawn_probe() -> None:
+    """Does nothing; unpickling it makes a fresh interpreter import this module the way workers do."""
+
+
+def check_spawn(timeout: float = _SPAWN_CHECK_TIMEOUT_SEC) -> None:
+    """Spawn one throwaway worker process and raise if it cannot import the worker modules."""
+    process = _MP.Process(target=_spawn_probe, name="gesture-source-spawn-check", daemon=True)
+    process.start()
+    process.join(timeout)
+    if process.is_alive():
+        process.terminate()
+        raise RuntimeError(f"Spawned worker did not finish importing within {timeout:.0f} s")
+    if process.exitcode != 0:
+        raise RuntimeError(f"Spawned worker exited with code {process.exitcode}; see its traceback above")
+
+
+def _run_source(device: int | str, conn) -> None:
+    """Worker process entry point: classify ``device`` until the parent says stop or goes away."""
+    fused = LandmarkClassifier(os.environ.get("GESTURE_MODEL_PATH", DEFAULT_MODEL_PATH))
+    classifier = CameraClassifier(device, classify=fused)
+    worker = GestureWorker(classifier)
+    send_lock = threading.Lock()
+
+    def send(message) -> None:
+        with send_lock:
+            conn.send(message)
+
+    classifier.warm_up()
+    fused.warm_up()
+    send(("startup", STARTUP.to_dict()))
+    worker.add_listener(lambda snapshot: send(("snapshot", snapshot)))
+    worker.start()
+    try:
+        while not (conn.poll(_METRICS_PUSH_SEC) and conn.recv() == "stop"):
+            send(("metrics", metrics.REGISTRY.state()))
+    except (EOFError, OSError):
+        pass  # parent exited
+    finally:
+        worker.stop()
+        classifier.close()
+        conn.close()
+
+
+class GestureSource:
+    def __init__(self, name: str, device: int | str, confidence_delta: float = DEFAULT_CONFIDENCE_DELTA) -> None:
+        self.name = name
+        self.device = device
+        self.broadcaster = GestureBroadcaster(confidence_delta=confidence_delta)
+        self.metrics_state: Optional[dict] = None
+        # Startup phase timings (ms) reported by the current worker; None until it has warmed up.
+        self.startup: Optional[dict] = None
+        self.starts = 0
+        # Workers that exited on their own since the last one reported startup.
+        self.failures = 0
+        self.last_exit_code: Optional[int] = None
+        self._snapshot: GestureSnapshot = EMPTY_SNAPSHOT
+        self._seq = 0
+        self._lock = threading.Lock()
+        self._process = None
+        self._conn = None
+        self._reader: Optional[threading.Thread] = None
+        self._last_access = time.monotonic()
+        self._started_at = float("-inf")
+
+    @property
+    def running(self) -> bool:
+        return self._process is not None and self._process.is_alive()
+
+    @property
+    def ready(self) -> bool:
+        return self.running and self.startup is not None
+
+    @property
+    def failing(self) -> bool:
+        """A worker exited unexpectedly and no replacement has warmed up since."""
+        return self.failures > 0 and not self.ready
+
+    def idle_for(self) -> float:
+        return time.monotonic() - self._last_access
+
+    def touch(self) -> None:
+        """Mark the source as in use and make sure its worker is running."""
+        self._last_access = time.monotonic()
+        if not self.running:
+            self.start()
+
+    def snapshot(self) -> GestureSnapshot:
+        self.touch()
+        return self._snapshot
+
+    def stream(self, cursor: Optional[int]) -> Iterator[str]:
+        """SSE messages for this source; an open stream keeps the source alive."""
+        for message in self.broadcaster.subscribe(cursor):
+            self.touch()
+            yield message
+
+    def start(self) -> None:
+        with self._lock:
+            if self.running or time.monotonic() - self._started_at < _RESTART_BACKOFF_SEC:
+                return
+            self._shutdown()
+            self._started_at = time.monotonic()
+            self.startup = None
+            parent_conn, child_conn = _MP.Pipe()
+            process = _MP.Process(
+                target=_run_source,
+                args=(self.device, child_conn),
+                name=f"gesture-source-{self.name}",
+                daemon=True,
+            )
+            process.start()
+            child_conn.close()
+            self._process, self._conn = process, parent_conn
+            self._reader = threading.Thread(
+                target=self._read_loop, args=(parent_conn,), name=f"gesture-source-{self.name}-reader", daemon=True
+            )
+            self._reader.start()
+            self.starts += 1
+            print(f"[INFO] Started capture source {self.name!r} (device {self.device!r}, pid {process.pid})")
+
+    def _read_loop(self, conn) -> None:
+        while True:
+            try:
+                kind, payload = conn.recv()
+            except (EOFError, OSError):
+                process = self._process
+                if self._conn is conn and process is not None:
+                    process.join(_STOP_TIMEOUT_SEC)
+                    self.failures += 1
+                    self.last_exit_code = process.exitcode
+                    print(
+                        f"[WARN] Capture source {self.name!r} worker exited unexpectedly "
+                        f"(exit code {process.exitcode}, {self.failures} in a row)"
+                    )
+                break
+            if kind == "snapshot":
+                self._publish(payload)
+            elif kind == "metrics":
+                self.metrics_state = payload
+            elif kind == "startup":
+                self.startup = payload
+                self.failures = 0
+                timings = ", ".join(f"{phase} {ms:.0f} ms" for phase, ms in payload.items())
+                print(f"[INFO] Capture source {self.name!r} ready: {timings}")
+
+    def _publish(self, snapshot: GestureSnapshot) -> None:
+        self._seq += 1
+        snapshot = dataclasses.replace(snapshot, seq=self._seq)
+        self._snapshot = snapshot
+        self.broadcaster.offer(snapshot)
+
+    def stop(self) -> None:
+        with self._lock:
+            if self._process is None:
+                return
+            self._shutdown()
+            # Tell pollers and stream clients the source is no longer reporting.
+            self._publish(dataclasses.replace(EMPTY_SNAPSHOT, frame_ts=time.time()))
+            print(f"[INFO] Stopped capture source {self.name!r}")
+
+    def _shutdown(self) -> None:
+        """Stop the worker process and reader; caller holds the lock."""
+        process, conn = self._process, self._conn
+        self._process = self._conn = None
+        if conn is not None:
+            try:
+                conn.send("stop")
+            except (EOFError, OSError):
+                pass
+        if process is not None:
+            process.join(_STOP_TIMEOUT_SEC)
+            if process.is_alive():
+                process.terminate()
+                process.join(_STOP_TIMEOUT_SEC)
+        # The reader sees EOF once the child is gone.
+        if self._reader is not None:
+            self._reader.join(_STOP_TIMEOUT_SEC)
+            self._reader = None
+        if conn is not None:
+            conn.close()
+
+
+class SourceManager:
+    """The configured capture sources plus an idle reaper thread."""
+
+    def __init__(
+        self,
+        sources: Mapping[str, int | str],
+        idle_sec: float = DEFAULT_IDLE_SEC,
+        confidence_delta: float = DEFAULT_CONFIDENCE_DELTA,
+    ) -> None:
+        self._sources = {name: GestureSource(name, device, confidence_delta) for name, device in sources.items()}
+        self.default_name = next(iter(self._sources))
+        self.idle_sec = idle_sec
+        self._stop_event = threading.Event()
+        self._reaper: Optional[threading.Thread] = None
+        self._reaper_lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, confidence_delta: float = DEFAULT_CONFIDENCE_DELTA) -> "SourceManager":
+        return cls(
+            parse_sources(os.environ.get("GESTURE_SOURCES", DEFAULT_SOURCES)),
+            idle_sec=float(os.environ.get("GESTURE_IDLE_SEC", DEFAULT_IDLE_SEC)),
+            confidence_delta=confidence_delta,
+        )
+
+    def names(self) -> list[str]:
+        return list(self._sources)
+
+    def get(self, name: Optional[str] = None) -> Optional[GestureSource]:
+        """Look up a source (the first configured one by default) and start the idle reaper."""
+        self._ensure_reaper()
+        return self._sources.get(name or self.default_name)
+
+    def status(self) -> dict[str, dict]:
+        """Per-source running/ready/failing state and startup timings, for the readiness probe."""
+        return {
+            name: {
+                "running": source.running,
+                "ready": source.ready,
+                "failing": source.failing,
+                "failures": source.failures,
+                "last_exit_code": source.last_exit_code,
+                "startup_ms": source.startup,
+            }
+            for name, source in self._sources.items()
+        }
+
+    def metrics_states(self) -> dict[str, dict]:
+        return {name: source.metrics_state for name, source in self._sources.items() if source.metrics_state}
+
+    def _ensure_reaper(self) -> None:
+        if self.idle_sec <= 0 or self._reaper is not None:
+            return
+        with self._reaper_lock:
+            if self._reaper is None:
+                self._reaper = threading.Thread(target=self._reap, name="gesture-source-reaper", daemon=True)
+                self._reaper.start()
+
+    def _reap(self) -> None:
+        interval = min(5.0, self.idle_sec / 4)
+        while not self._stop_event.wait(interval):
+            for source in self._sources.values():
+                if source.running and source.idle_for() > self.idle_sec:
+                    source.stop()
+
+    def close(self) -> None:
+        self._stop_event.set()
+        for source in self._sources.values():
+            source.stop()
+
+
+if __name__ == "__main__":
+    check_spawn()
+    print("[INFO] Spawned capture workers import cleanly")
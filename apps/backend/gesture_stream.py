@@ -0,0 +1,110 @@
+"""
+Server-Sent Events fan-out for gesture snapshots.
+
+The capture worker hands every snapshot to ``GestureBroadcaster.offer``. Only
+snapshots whose label changed, or whose confidence moved by at least the
+configured delta, become events. With several hands in view, a change in any
+hand's label, a hand arriving or leaving, and every committed vote count too.
+Subscribers share one condition variable and one bounded backlog, so adding a
+client costs a generator, not a worker thread or an extra camera read.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from collections import deque
+from typing import Final, Iterator, Optional
+
+from gesture_recognition import GestureSnapshot
+
+DEFAULT_CONFIDENCE_DELTA: Final[float] = 0.05
+_BACKLOG_SIZE: Final[int] = 256
+_HEARTBEAT_SEC: Final[float] = 15.0
+# Browsers wait this long (ms) before reconnecting a dropped EventSource.
+_RETRY_MS: Final[int] = 2000
+
+
+def _format_event(snapshot: GestureSnapshot) -> str:
+    data = json.dumps(snapshot.to_payload(), separators=(",", ":"))
+    return f"id: {snapshot.seq}\nevent: gesture\ndata: {data}\n\n"
+
+
+def _hand_labels(snapshot: GestureSnapshot) -> tuple[tuple[int, str], ...]:
+    return tuple((hand.track_id, hand.gesture) for hand in snapshot.hands)
+
+
+def parse_cursor(raw: Optional[str]) -> Optional[int]:
+    """Parse a ``Last-Event-ID`` header or ``cursor`` query value."""
+    if raw is None:
+        return None
+    try:
+        return int(raw.strip())
+    except ValueError:
+        return None
+
+
+class GestureBroadcaster:
+    """Deduplicates worker snapshots into events and streams them to subscribers.
+
+    Event ids are the snapshot sequence numbers, so a reconnecting client that
+    sends its last id as the resume cursor receives exactly the events it
+    missed, as long as they are still in the backlog.
+    """
+
+    def __init__(self, confidence_delta: float = DEFAULT_CONFIDENCE_DELTA, backlog: int = _BACKLOG_SIZE) -> None:
+        self._confidence_delta = confidence_delta
+        self._events: deque[tuple[int, str]] = deque(maxlen=backlog)
+        self._cond = threading.Condition()
+        self._last: Optional[GestureSnapshot] = None
+
+    def offer(self, snapshot: GestureSnapshot) -> bool:
+        """Record ``snapshot`` as an event if it differs enough from the last one."""
+        last = self._last
+        if (
+            last is not None
+            and snapshot.gesture == last.gesture
+            and abs(snapshot.confidence - last.confidence) < self._confidence_delta
+            and _hand_labels(snapshot) == _hand_labels(last)
+            and not any(hand.decision for hand in snapshot.hands)
+        ):
+            return False
+
+        message = _format_event(snapshot)
+        with self._cond:
+            self._last = snapshot
+            self._events.append((snapshot.seq, message))
+            self._cond.notify_all()
+        return True
+
+    def _pending(self, cursor: Optional[int]) -> list[tuple[int, str]]:
+        """Return buffered events after ``cursor``; caller must hold the lock."""
+        if not self._events:
+            return []
+        latest_seq = self._events[-1][0]
+        if cursor is None or cursor > latest_seq:
+            # New client, or a cursor from a previous process: send current state.
+            return [self._events[-1]]
+        return [event for event in self._events if event[0] > cursor]
+
+    def subscribe(self, cursor: Optional[int] = None, heartbeat_sec: float = _HEARTBEAT_SEC) -> Iterator[str]:
+        """Yield SSE-formatted messages, resuming after ``cursor`` when given."""
+        yield f"retry: {_RETRY_MS}\n\n"
+        with self._cond:
+            pending = self._pending(cursor)
+
+        while True:
+            for seq, message in pending:
+                cursor = seq
+                yield message
+
+            with self._cond:
+                has_new = self._cond.wait_for(
+                    lambda: bool(self._events) and (cursor is None or self._events[-1][0] > cursor),
+                    timeout=heartbeat_sec,
+                )
+                pending = self._pending(cursor) if has_new else []
+
+            if not pending:
+                # Comment line keeps proxies from closing an idle connection.
+                yield ": keep-alive\n\n"
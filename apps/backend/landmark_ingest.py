@@ -0,0 +1,230 @@
+"""
+Classification of landmarks captured by remote clients.
+
+Clients that run MediaPipe on their own device POST one or more 21x3 landmark
+arrays. They get back the same fused YES/NO labels the CLI recognizer would
+produce, from the same normalization, rule scores and KNN model
+(``signdao.fusion.classify_batch``).
+
+Bodies may be JSON, either ``{"landmarks": [[x, y, z], ...] | [[[x, y, z], ...], ...],
+"handedness": "Left" | [...]}``, or ``application/octet-stream`` holding
+little-endian float32 values, 252 bytes per hand, with the handedness in a
+``?handedness=Left,Right`` query parameter.
+
+Requests that arrive concurrently are handled by ``LandmarkBatcher``. It
+waits up to ``max_wait_sec`` (2 ms by default) after the first pending
+request and then classifies every pending hand together with one vectorized
+call. Most of the cost of a single hand is per-call overhead, so a burst of
+clients costs little more than one of them.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import queue
+import threading
+import time
+from typing import Callable, Final, Optional, Sequence
+
+import numpy as np
+
+import gesture_recognition  # noqa: F401 - puts the repo-level signdao package on sys.path
+from signdao import metrics  # importable via gesture_recognition
+from signdao.features import NUM_LANDMARKS, left_hand_mask
+from signdao.fusion import classify_batch
+from signdao.model import load_model
+from signdao.startup import STARTUP
+
+DEFAULT_MODEL_PATH: Final[str] = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "..", "WLASL", "wlasl_lite", "sign_classifier_model.sdds"
+)
+DEFAULT_MAX_BATCH: Final[int] = 512
+DEFAULT_MAX_WAIT_SEC: Final[float] = 0.002
+MAX_HANDS_PER_REQUEST: Final[int] = 256
+BINARY_CONTENT_TYPE: Final[str] = "application/octet-stream"
+_HAND_BYTES: Final[int] = NUM_LANDMARKS * 3 * 4
+_RESULT_TIMEOUT_SEC: Final[float] = 5.0
+
+_STAGE_INGEST = metrics.stage("ingest_classify")
+_INGEST_HANDS = metrics.REGISTRY.counter("signdao_ingest_hands_total", "Landmark sets classified via the ingest API.")
+_INGEST_BATCHES = metrics.REGISTRY.counter("signdao_ingest_batches_total", "Micro-batches run by the ingest API.")
+
+
+class IngestError(ValueError):
+    """A malformed or oversized ingest request; ``status`` is the HTTP status to return."""
+
+    def __init__(self, message: str, status: int = 400) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+def _handedness_list(value, count: int) -> list[Optional[str]]:
+    if value is None or isinstance(value, str):
+        return [value or None] * count
+    if not isinstance(value, list) or len(value) != count:
+        raise IngestError(f"handedness must be a string or a list of {count} entries")
+    return [str(h) if h else None for h in value]
+
+
+def parse_request(
+    body: bytes,
+    content_type: Optional[str],
+    handedness: Optional[str] = None,
+    max_hands: int = MAX_HANDS_PER_REQUEST,
+) -> tuple[np.ndarray, list[Optional[str]]]:
+    """Decode a JSON or binary ingest body into ``(landmarks (N, 21, 3), handedness)``."""
+    if (content_type or "").split(";")[0].strip() == BINARY_CONTENT_TYPE:
+        if not body or len(body) % _HAND_BYTES:
+            raise IngestError(f"binary body must be a non-empty multiple of {_HAND_BYTES} bytes")
+        landmarks = np.frombuffer(body, dtype="<f4").reshape(-1, NUM_LANDMARKS, 3)
+        hands = handedness.split(",") if handedness and "," in handedness else handedness
+    else:
+        try:
+            data = json.loads(body)
+            landmarks = np.asarray(data["landmarks"], dtype=np.float32)
+        except (ValueError, TypeError, KeyError) as exc:
+            raise IngestError(f"expected JSON with a 'landmarks' array: {exc}") from exc
+        hands = data.get("handedness", handedness)
+        if landmarks.ndim == 2:
+            landmarks = landmarks[np.newaxis]
+        if landmarks.ndim != 3 or landmarks.shape[1:] != (NUM_LANDMARKS, 3) or not len(landmarks):
+            raise IngestError(f"landmarks must be ({NUM_LANDMARKS}, 3) or (N, {NUM_LANDMARKS}, 3), got {landmarks.shape}")
+    if len(landmarks) > max_hands:
+        raise IngestError(f"at most {max_hands} hands per request, got {len(landmarks)}", status=413)
+    if not np.isfinite(landmarks).all():
+        raise IngestError("landmarks must be finite numbers")
+    return landmarks, _handedness_list(hands, len(landmarks))
+
+
+class LandmarkClassifier:
+    """Fused rule-based + KNN classification; the model is loaded on first use."""
+
+    def __init__(self, model_path: str = DEFAULT_MODEL_PATH) -> None:
+        self.model_path = model_path
+        self._model = None
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def get_model(self):
+        if not self._loaded:
+            with self._lock:
+                if not self._loaded:
+                    with STARTUP.phase("model_load"):
+                        self._model = load_model(self.model_path)
+                    if self._model is None:
+                        print(f"[WARN] No model at {self.model_path}; ingest uses rule-based scores only")
+                    self._loaded = True
+        return self._model
+
+    def warm_up(self) -> None:
+        """Load the model and classify one blank hand, so the first request pays for neither."""
+        blank = np.zeros((1, NUM_LANDMARKS, 3), dtype=np.float32)
+        model = self.get_model()
+        with STARTUP.phase("first_inference"):
+            classify_batch(blank, np.zeros(1, dtype=bool), model)
+
+    def __call__(self, landmarks: np.ndarray, left_mask: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        return classify_batch(landmarks, left_mask, self.get_model())
+
+
+class _Pending:
+    __slots__ = ("landmarks", "left_mask", "done", "labels", "confidence", "error")
+
+    def __init__(self, landmarks: np.ndarray, left_mask: np.ndarray) -> None:
+        self.landmarks = landmarks
+        self.left_mask = left_mask
+        self.done = threading.Event()
+        self.labels: Optional[np.ndarray] = None
+        self.confidence: Optional[np.ndarray] = None
+        self.error: Optional[BaseException] = None
+
+
+class LandmarkBatcher:
+    """Coalesces concurrent classification requests into micro-batches on one thread."""
+
+    def __init__(
+        self,
+        classify: Callable[[np.ndarray, np.ndarray], tuple[np.ndarray, np.ndarray]],
+        max_batch: int = DEFAULT_MAX_BATCH,
+        max_wait_sec: float = DEFAULT_MAX_WAIT_SEC,
+    ) -> None:
+        self.classify = classify
+        self.max_batch = max_batch
+        self.max_wait_sec = max_wait_sec
+        self.batches = 0
+        self.hands = 0
+        self._queue: queue.Queue[Optional[_Pending]] = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def submit(
+        self, landmarks: np.ndarray, handedness: Sequence[Optional[str]]
+    ) -> list[tuple[str, float]]:
+        """Classify ``landmarks`` with whatever else is pending; blocks until the batch has run."""
+        self._ensure_thread()
+        pending = _Pending(landmarks, left_hand_mask(handedness))
+        self._queue.put(pending)
+        if not pending.done.wait(_RESULT_TIMEOUT_SEC):
+            raise TimeoutError("landmark classification timed out")
+        if pending.error is not None:
+            raise pending.error
+        return [(str(label), float(conf)) for label, conf in zip(pending.labels, pending.confidence)]
+
+    def _ensure_thread(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="landmark-batcher", daemon=True)
+                self._thread.start()
+
+    def _collect(self, first: _Pending) -> list[_Pending]:
+        batch, hands = [first], len(first.landmarks)
+        deadline = time.monotonic() + self.max_wait_sec
+        while hands < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                pending = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if pending is None:
+                self._queue.put(None)  # let _run see the stop request after this batch
+                break
+            batch.append(pending)
+            hands += len(pending.landmarks)
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = self._collect(first)
+            sizes = [len(p.landmarks) for p in batch]
+            started = time.perf_counter()
+            try:
+                labels, confidence = self.classify(
+                    np.concatenate([p.landmarks for p in batch]), np.concatenate([p.left_mask for p in batch])
+                )
+            except Exception as exc:  # report to every waiting request instead of killing the thread
+                for pending in batch:
+                    pending.error = exc
+                    pending.done.set()
+                continue
+            _STAGE_INGEST.observe(time.perf_counter() - started)
+            _INGEST_BATCHES.inc()
+            _INGEST_HANDS.inc(sum(sizes))
+            self.batches += 1
+            self.hands += sum(sizes)
+            offset = 0
+            for pending, size in zip(batch, sizes):
+                pending.labels = labels[offset : offset + size]
+                pending.confidence = confidence[offset : offset + size]
+                offset += size
+                pending.done.set()
+
+    def close(self) -> None:
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join(_RESULT_TIMEOUT_SEC)
@@ -0,0 +1,75 @@
+"""
+Per-frame cost of the low-light stage: old enhance_low_light + BGR->RGB versus
+LowLightEnhancer, on bright, dim, and dim-with-hand-ROI frames.
+
+Run from the repo root:
+    python benchmarks/bench_enhance.py --width 1920 --height 1080
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+_REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if _REPO_ROOT not in sys.path:
+    sys.path.insert(0, _REPO_ROOT)
+
+from signdao.enhance import LowLightEnhancer  # noqa: E402
+
+
+def _legacy(frame: np.ndarray) -> np.ndarray:
+    """The pre-LowLightEnhancer path from gesture_recognition.py."""
+    lab_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2LAB)
+    l_channel, a_channel, b_channel = cv2.split(lab_frame)
+    clahe = cv2.createCLAHE(clipLimit=3.0, tileGridSize=(8, 8))
+    enhanced = cv2.merge((clahe.apply(l_channel), a_channel, b_channel))
+    return cv2.cvtColor(cv2.cvtColor(enhanced, cv2.COLOR_LAB2BGR), cv2.COLOR_BGR2RGB)
+
+
+def _ms_per_frame(fn, frame: np.ndarray, repeats: int) -> float:
+    fn(frame)  # warm up buffers
+    started = time.perf_counter()
+    for _ in range(repeats):
+        fn(frame)
+    return (time.perf_counter() - started) / repeats * 1e3
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the low-light enhancement stage.")
+    parser.add_argument("--width", type=int, default=1920)
+    parser.add_argument("--height", type=int, default=1080)
+    parser.add_argument("--repeats", type=int, default=50)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    shape = (args.height, args.width, 3)
+    bright = rng.integers(120, 255, shape, dtype=np.uint8)
+    dim = rng.integers(0, 60, shape, dtype=np.uint8)
+
+    # A hand covering roughly a fifth of the frame width.
+    hand = np.zeros((21, 3), dtype=np.float32)
+    hand[:, 0] = np.linspace(0.40, 0.60, 21)
+    hand[:, 1] = np.linspace(0.35, 0.65, 21)
+
+    full = LowLightEnhancer()
+    roi = LowLightEnhancer()
+    roi.set_hand(hand, args.width, args.height)
+
+    legacy_ms = _ms_per_frame(_legacy, bright, args.repeats)
+    rows = [
+        ("bright", _ms_per_frame(full.process, bright, args.repeats)),
+        ("dim full-frame", _ms_per_frame(full.process, dim, args.repeats)),
+        ("dim hand ROI", _ms_per_frame(roi.process, dim, args.repeats)),
+    ]
+
+    print(f"{args.width}x{args.height}, legacy enhance+RGB: {legacy_ms:.2f} ms/frame")
+    for name, ms in rows:
+        print(f"{name:<16} {ms:>7.2f} ms/frame   saves {legacy_ms - ms:>6.2f} ms ({1 - ms / legacy_ms:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Micro-benchmark for the batched landmark feature kernel.
+
+Compares the original per-finger scalar scoring (kept here as a reference)
+against ``signdao.features`` at N=1 and N=10k hands, and checks that both
+produce the same labels.
+
+Run from the repo root:
+    python benchmarks/bench_features.py
+"""
+
+import argparse
+import math
+import os
+import sys
+import time
+
+import numpy as np
+
+_REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if _REPO_ROOT not in sys.path:
+    sys.path.insert(0, _REPO_ROOT)
+
+from signdao.features import UNKNOWN_FLOOR, normalize_landmarks_batch, score_yes_no_batch  # noqa: E402
+
+
+# ---- Reference scalar implementation (pre-batching gesture_recognition.py) ----
+def _vector_angle(v1, v2):
+    denom = np.linalg.norm(v1) * np.linalg.norm(v2)
+    if denom < 1e-6:
+        return 0.0
+    return math.acos(np.clip(np.dot(v1, v2) / denom, -1.0, 1.0))
+
+
+def _finger_curl(lm, indices):
+    mcp, pip, dip, tip = (lm[i] for i in indices)
+    curl = (_vector_angle(pip - mcp, dip - pip) + _vector_angle(dip - pip, tip - dip)) / math.pi
+    return float(np.clip(curl, 0.0, 1.0))
+
+
+def _thumb_curl(lm):
+    curl = (_vector_angle(lm[3] - lm[2], lm[4] - lm[3]) + _vector_angle(lm[2] - lm[0], lm[4] - lm[2])) / math.pi
+    return float(np.clip(curl, 0.0, 1.0))
+
+
+def _normalize_scalar(lm, handedness=None):
+    translated = lm - lm[0]
+    if handedness == "Left":
+        translated[:, 0] *= -1
+    scale = np.linalg.norm(lm[9] - lm[0])
+    return translated / (scale if scale >= 1e-6 else 1.0)
+
+
+def _classify_scalar(lm):
+    n = _normalize_scalar(lm)
+    curls = [_thumb_curl(n)] + [_finger_curl(n, [b, b + 1, b + 2, b + 3]) for b in (5, 9, 13, 17)]
+    palm = np.linalg.norm(n[5] - n[17])
+    palm = palm if palm > 1e-6 else 1.0
+    d1 = np.linalg.norm(n[4] - n[8]) / palm
+    d2 = np.linalg.norm(n[4] - n[12]) / palm
+    yes = float(np.clip(np.mean(curls[1:]), 0.0, 1.0))
+    no = float(np.clip(np.mean([1.0 - c for c in curls[1:]] + [np.clip(d1, 0, 1), np.clip(d2, 0, 1)]), 0.0, 1.0))
+    label, conf = ("YES", yes) if yes >= no else ("NO", no)
+    return ("UNKNOWN" if conf < UNKNOWN_FLOOR else label), conf
+
+
+def _synthetic_hands(n: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return rng.random((n, 21, 3), dtype=np.float32)
+
+
+def _time_per_hand(fn, n_hands: int, repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best / n_hands
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark scalar vs batched YES/NO scoring.")
+    parser.add_argument("--large", type=int, default=10_000, help="Batch size for the large run.")
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    single = _synthetic_hands(1)
+    large = _synthetic_hands(args.large, seed=1)
+
+    def batched(hands):
+        return score_yes_no_batch(normalize_landmarks_batch(hands))
+
+    scalar_1 = _time_per_hand(lambda: _classify_scalar(single[0]), 1, args.repeats * 200)
+    batch_1 = _time_per_hand(lambda: batched(single), 1, args.repeats * 200)
+    scalar_n = _time_per_hand(lambda: [_classify_scalar(h) for h in large], args.large, args.repeats)
+    batch_n = _time_per_hand(lambda: batched(large), args.large, args.repeats)
+
+    result = batched(large)
+    mismatches = sum(
+        1 for hand, label in zip(large, result.labels) if _classify_scalar(hand)[0] != label
+    )
+
+    print(f"{'path':<10} {'N':>8} {'us/hand':>10}")
+    print(f"{'scalar':<10} {1:>8} {scalar_1 * 1e6:>10.2f}")
+    print(f"{'batched':<10} {1:>8} {batch_1 * 1e6:>10.2f}")
+    print(f"{'scalar':<10} {args.large:>8} {scalar_n * 1e6:>10.2f}")
+    print(f"{'batched':<10} {args.large:>8} {batch_n * 1e6:>10.2f}")
+    print(f"[INFO] Label mismatches vs scalar reference: {mismatches}/{args.large}")
+
+
+if __name__ == "__main__":
+    main()
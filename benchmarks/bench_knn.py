@@ -0,0 +1,72 @@
+"""
+Benchmark LandmarkKNNIndex against scikit-learn's KNeighborsClassifier.
+
+Reports single-query and batched predict_proba latency for 1k, 100k and 1M
+stored samples, and the fraction of queries whose probabilities differ.
+
+Run from the repo root:
+    python benchmarks/bench_knn.py
+    python benchmarks/bench_knn.py --sizes 1000 100000   # skip the 1M run
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+_REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if _REPO_ROOT not in sys.path:
+    sys.path.insert(0, _REPO_ROOT)
+
+from signdao.features import FEATURE_DIM  # noqa: E402
+from signdao.knn_index import LandmarkKNNIndex  # noqa: E402
+
+
+def _median_seconds(fn, repeats: int) -> float:
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return float(np.median(samples))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark KNN predict_proba paths.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000, 1_000_000])
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--batch", type=int, default=256, help="Queries per batched call.")
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    from sklearn.neighbors import KNeighborsClassifier
+
+    rng = np.random.default_rng(0)
+    queries = rng.standard_normal((args.batch, FEATURE_DIM)).astype(np.float32)
+
+    print(f"{'samples':>9} {'sk 1q ms':>9} {'idx 1q ms':>10} {'sk batch us/q':>14} {'idx batch us/q':>15} {'mismatch':>9}")
+    for size in args.sizes:
+        X = rng.standard_normal((size, FEATURE_DIM)).astype(np.float32)
+        codes = rng.integers(0, 2, size)
+        y = np.array(["NO", "YES"])[codes]
+
+        clf = KNeighborsClassifier(n_neighbors=args.k).fit(X, y)
+        index = LandmarkKNNIndex(X, codes, 2, args.k)
+        repeats = max(3, args.repeats if size < 1_000_000 else args.repeats // 4)
+
+        sk_single = _median_seconds(lambda: clf.predict_proba([queries[0]]), repeats)
+        idx_single = _median_seconds(lambda: index.predict_proba(queries[0]), repeats)
+        sk_batch = _median_seconds(lambda: clf.predict_proba(queries), max(3, repeats // 4))
+        idx_batch = _median_seconds(lambda: index.predict_proba(queries), max(3, repeats // 4))
+
+        mismatch = np.mean(np.any(np.abs(clf.predict_proba(queries) - index.predict_proba(queries)) > 1e-9, axis=1))
+        print(
+            f"{size:>9} {sk_single * 1e3:>9.3f} {idx_single * 1e3:>10.3f} "
+            f"{sk_batch / args.batch * 1e6:>14.1f} {idx_batch / args.batch * 1e6:>15.1f} {mismatch:>9.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+"""
+Offline replay benchmark for the live recognition pipeline.
+
+Replays recorded inputs through the same functions gesture_recognition.py
+runs per frame, as fast as possible and without a webcam:
+
+* video files go through LowLightEnhancer and MediaPipe Hands, and the
+  landmarks they yield are then replayed like a trace;
+* landmark traces, i.e. ``.npy`` (T, 21, 3) arrays or ``.npz`` files with
+  ``landmarks`` and optional ``handedness``, go through normalize_landmarks,
+  classify_yes_no, KNN predict_proba, fuse_hand and DecisionEngine smoothing.
+  ``fuse_hands`` is also timed on ``--hands`` consecutive frames at once, as
+  if that many voters shared the camera; compare its p50 against ``fuse``.
+
+With no inputs, a synthetic jittered trace is used, so the script also runs
+on a bare CI box. Each stage reports calls, throughput and p50/p99/mean
+latency as JSON. Against a ``--baseline`` result, a stage whose p50 grew by
+more than ``--tolerance`` fails the run with exit status 1.
+
+Run from the repo root:
+    python benchmarks/bench_pipeline.py --output bench.json
+    python benchmarks/bench_pipeline.py --video clip.mp4 --save-traces traces/
+    python benchmarks/bench_pipeline.py --trace traces/clip.npy --baseline bench.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+import cv2
+import numpy as np
+
+_REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if _REPO_ROOT not in sys.path:
+    sys.path.insert(0, _REPO_ROOT)
+
+from signdao.decision import DecisionEngine  # noqa: E402
+from signdao.enhance import LowLightEnhancer  # noqa: E402
+from signdao.features import NUM_LANDMARKS, feature_vectors, normalize_landmarks  # noqa: E402
+
+RESULT_VERSION = 1
+_FRAME_DT = 1.0 / 30.0
+
+
+class StageTimer:
+    """Collects per-call durations (ns) for named stages."""
+
+    def __init__(self) -> None:
+        self.samples: dict[str, list[int]] = {}
+        self.wall_ns: dict[str, int] = {}
+
+    def time(self, stage: str, fn, *args):
+        started = time.perf_counter_ns()
+        result = fn(*args)
+        elapsed = time.perf_counter_ns() - started
+        self.samples.setdefault(stage, []).append(elapsed)
+        self.wall_ns[stage] = self.wall_ns.get(stage, 0) + elapsed
+        return result
+
+    def report(self) -> dict:
+        stages = {}
+        for stage, samples in self.samples.items():
+            ns = np.asarray(samples, dtype=np.float64)
+            stages[stage] = {
+                "calls": len(samples),
+                "per_sec": round(len(samples) / (self.wall_ns[stage] / 1e9), 1) if self.wall_ns[stage] else None,
+                "p50_us": round(float(np.percentile(ns, 50)) / 1e3, 2),
+                "p99_us": round(float(np.percentile(ns, 99)) / 1e3, 2),
+                "mean_us": round(float(ns.mean()) / 1e3, 2),
+            }
+        return stages
+
+
+def load_trace(path: str) -> tuple[np.ndarray, list]:
+    if path.endswith(".npz"):
+        data = np.load(path, allow_pickle=False)
+        landmarks = data["landmarks"]
+        handedness = [str(h) or None for h in data["handedness"]] if "handedness" in data else None
+    else:
+        landmarks = np.load(path, allow_pickle=False)
+        handedness = None
+    landmarks = np.asarray(landmarks, dtype=np.float32)
+    if landmarks.ndim != 3 or landmarks.shape[1:] != (NUM_LANDMARKS, 3):
+        raise ValueError(f"{path}: expected a (T, {NUM_LANDMARKS}, 3) trace, got {landmarks.shape}")
+    return landmarks, handedness or [None] * len(landmarks)
+
+
+def synthetic_trace(frames: int, seed: int = 0) -> np.ndarray:
+    """A hand that drifts slowly with per-frame jitter."""
+    rng = np.random.default_rng(seed)
+    base = rng.random((NUM_LANDMARKS, 3), dtype=np.float32) * 0.3 + 0.35
+    drift = np.cumsum(rng.normal(0.0, 0.002, (frames, NUM_LANDMARKS, 3)), axis=0)
+    return (base + drift).astype(np.float32)
+
+
+def replay_video(path: str, hands, timer: StageTimer) -> tuple[np.ndarray, list]:
+    """Run a video through enhancement and MediaPipe; returns the hand frames as a trace."""
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        raise ValueError(f"Unable to open video {path}")
+    enhancer = LowLightEnhancer()
+    landmarks, handedness = [], []
+    try:
+        while True:
+            ok, frame = timer.time("video_decode", cap.read)
+            if not ok:
+                break
+            rgb = timer.time("enhance", enhancer.process, frame)
+            results = timer.time("mediapipe", hands.process, rgb)
+            if not results.multi_hand_landmarks:
+                enhancer.set_hand(None, frame.shape[1], frame.shape[0])
+                continue
+            matrix = np.array([(lm.x, lm.y, lm.z) for lm in results.multi_hand_landmarks[0].landmark], dtype=np.float32)
+            enhancer.set_hand(matrix, frame.shape[1], frame.shape[0])
+            landmarks.append(matrix)
+            label = results.multi_handedness[0].classification[0].label if results.multi_handedness else None
+            handedness.append(label)
+    finally:
+        cap.release()
+    trace = np.stack(landmarks) if landmarks else np.empty((0, NUM_LANDMARKS, 3), dtype=np.float32)
+    return trace, handedness
+
+
+def replay_trace(trace: np.ndarray, handedness: list, recognizer, timer: StageTimer, hands: int = 4) -> None:
+    engine = DecisionEngine(window=recognizer.SMOOTH_WINDOW)
+    clf = recognizer.get_classifier()
+    for t, (frame, hand) in enumerate(zip(trace, handedness)):
+        if hands > 1:
+            picks = np.arange(t, t + hands) % len(trace)
+            timer.time(f"fuse_{hands}_hands", recognizer.fuse_hands, trace[picks], [handedness[i] for i in picks])
+        normalized = timer.time("normalize", normalize_landmarks, frame, hand)
+        timer.time("classify", recognizer.classify_yes_no, frame, hand, normalized)
+        if clf is not None:
+            features = feature_vectors(normalized)
+            timer.time("knn", clf.predict_proba, features)
+        label, conf = timer.time("fuse", recognizer.fuse_hand, frame, hand)
+        timer.time("smooth", engine.update, label, conf, t * _FRAME_DT)
+
+
+def compare(result: dict, baseline: dict, tolerance: float) -> list[str]:
+    regressions = []
+    for stage, current in result["stages"].items():
+        previous = baseline.get("stages", {}).get(stage)
+        if not previous or not previous.get("p50_us"):
+            continue
+        ratio = current["p50_us"] / previous["p50_us"]
+        if ratio > 1.0 + tolerance:
+            regressions.append(f"{stage}: p50 {previous['p50_us']} -> {current['p50_us']} us ({ratio:.2f}x)")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Replay recorded inputs through the recognition pipeline.")
+    parser.add_argument("--video", action="append", default=[], help="Video file to run through MediaPipe.")
+    parser.add_argument("--trace", action="append", default=[], help="(T, 21, 3) landmark trace (.npy/.npz).")
+    parser.add_argument("--synthetic", type=int, default=3000, help="Synthetic trace length when no inputs are given.")
+    parser.add_argument("--hands", type=int, default=4, help="Hands per frame for the batched fuse stage.")
+    parser.add_argument("--repeat", type=int, default=1, help="Replay each trace this many times.")
+    parser.add_argument("--save-traces", help="Directory to write the traces extracted from --video inputs.")
+    parser.add_argument("--output", help="Write the JSON result here as well as to stdout.")
+    parser.add_argument("--baseline", help="Earlier JSON result to compare p50 latencies against.")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative p50 regression.")
+    args = parser.parse_args()
+
+    # Imported here so --help works without loading the recognizer.
+    import gesture_recognition as recognizer
+
+    timer = StageTimer()
+    traces: list[tuple[str, np.ndarray, list]] = []
+    if args.video:
+        with recognizer.create_hands() as hands:
+            for path in args.video:
+                trace, handedness = replay_video(path, hands, timer)
+                traces.append((path, trace, handedness))
+                if args.save_traces:
+                    os.makedirs(args.save_traces, exist_ok=True)
+                    name = os.path.splitext(os.path.basename(path))[0] + ".npz"
+                    np.savez(
+                        os.path.join(args.save_traces, name),
+                        landmarks=trace,
+                        handedness=np.array([h or "" for h in handedness], dtype=str),
+                    )
+    for path in args.trace:
+        traces.append((path, *load_trace(path)))
+    if not traces:
+        trace = synthetic_trace(args.synthetic)
+        traces.append((f"synthetic:{args.synthetic}", trace, [None] * len(trace)))
+
+    for _ in range(args.repeat):
+        for _, trace, handedness in traces:
+            replay_trace(trace, handedness, recognizer, timer, args.hands)
+
+    clf = recognizer.get_classifier()
+    result = {
+        "version": RESULT_VERSION,
+        "env": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "opencv": cv2.__version__,
+            "machine": platform.machine(),
+            "model_samples": len(clf) if hasattr(clf, "__len__") else None,
+        },
+        "startup_ms": recognizer.STARTUP.to_dict(),
+        "inputs": [{"source": source, "frames": len(trace)} for source, trace, _ in traces],
+        "stages": timer.report(),
+    }
+    text = json.dumps(result, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            regressions = compare(result, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"[WARN] Regression {line}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
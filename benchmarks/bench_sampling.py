@@ -0,0 +1,82 @@
+"""
+Benchmark the ``time`` sampling policy's seek threshold.
+
+For each sampling interval, the clip is sampled once per ``seek_frames``
+value: 1 seeks across every gap, a huge value never seeks. The table shows
+wall time and how many frames were grabbed (each one decoded), retrieved and
+sought past, so the point where seeking beats grabbing through a gap can be
+read off for a given codec.
+
+With no ``--video``, two 640x480 30 fps synthetic clips (mp4v and MJPEG) are
+written to a temporary directory first.
+
+Run from the repo root:
+    python benchmarks/bench_sampling.py
+    python benchmarks/bench_sampling.py --video clip.mp4 --intervals 0.1 0.5 2
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import cv2
+import numpy as np
+
+_REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(_REPO_ROOT, "WLASL", "wlasl_lite"))
+
+from video_sampling import SamplingPolicy, SamplingStats, iter_sampled_frames  # noqa: E402
+
+NEVER_SEEK = 10**9
+
+
+def _synthetic_clips(directory: str, frames: int = 600) -> list[str]:
+    base = np.random.default_rng(0).integers(0, 255, (480, 640, 3), dtype=np.uint8)
+    paths = []
+    for name, fourcc in (("synthetic_mp4v.mp4", "mp4v"), ("synthetic_mjpg.avi", "MJPG")):
+        path = os.path.join(directory, name)
+        writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*fourcc), 30, (640, 480))
+        for i in range(frames):
+            writer.write(np.roll(base, 3 * i, axis=1))
+        writer.release()
+        paths.append(path)
+    return paths
+
+
+def _run(path: str, policy: SamplingPolicy) -> tuple[float, SamplingStats]:
+    cap = cv2.VideoCapture(path)
+    stats = SamplingStats()
+    started = time.perf_counter()
+    for _ in iter_sampled_frames(cap, policy, stats):
+        pass
+    elapsed = time.perf_counter() - started
+    cap.release()
+    return elapsed, stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark seeking vs. grabbing in the time sampling policy.")
+    parser.add_argument("--video", action="append", default=[], help="Clip to sample (repeatable).")
+    parser.add_argument("--intervals", type=float, nargs="+", default=[0.2, 0.5, 1.0])
+    parser.add_argument("--seek-frames", type=int, nargs="+", default=[1, 6, 15, NEVER_SEEK])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        videos = args.video or _synthetic_clips(tmp)
+        print(f"{'video':<22} {'interval':>8} {'seek_frames':>11} {'ms':>8} {'grabbed':>8} {'retrieved':>9} {'seeks':>6}")
+        for path in videos:
+            for interval in args.intervals:
+                for seek_frames in args.seek_frames:
+                    policy = SamplingPolicy("time", interval_sec=interval, seek_frames=seek_frames)
+                    elapsed, stats = _run(path, policy)
+                    label = "never" if seek_frames == NEVER_SEEK else str(seek_frames)
+                    print(
+                        f"{os.path.basename(path):<22} {interval:>8.2f} {label:>11} {elapsed * 1e3:>8.0f} "
+                        f"{stats.frames_grabbed:>8} {stats.frames_retrieved:>9} {stats.seeks:>6}"
+                    )
+
+
+if __name__ == "__main__":
+    main()
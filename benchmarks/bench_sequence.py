@@ -0,0 +1,93 @@
+"""
+Benchmark sequence-mode matching as the number of DTW templates grows.
+
+Synthetic signs are smooth random trajectories. Each template and query is a
+randomly time-warped, noisy performance of one of them. For each template
+count the benchmark reports the per-match latency of brute-force banded DTW
+(every template, no pruning) and of ``SequenceTemplates.match`` (lower-bound
+cascade + early abandoning), the share of templates that still needed a DTW,
+and how often the two disagree on the nearest distance.
+
+Run from the repo root:
+    python benchmarks/bench_sequence.py
+    python benchmarks/bench_sequence.py --counts 100 400 --match-every 3
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+_REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if _REPO_ROOT not in sys.path:
+    sys.path.insert(0, _REPO_ROOT)
+
+from signdao.features import FEATURE_DIM  # noqa: E402
+from signdao.sequence import DEFAULT_RADIUS, SEQUENCE_LENGTH, SequenceTemplates, dtw_many, resample  # noqa: E402
+
+FRAME_BUDGET_MS = 1000.0 / 30
+
+
+def _signs(rng: np.random.Generator, count: int) -> np.ndarray:
+    """``count`` smooth (SEQUENCE_LENGTH, FEATURE_DIM) base trajectories."""
+    steps = rng.normal(0.0, 0.1, (count, SEQUENCE_LENGTH, FEATURE_DIM))
+    kernel = np.ones(5) / 5
+    smooth = np.apply_along_axis(lambda s: np.convolve(s, kernel, mode="same"), 1, steps)
+    return np.cumsum(smooth, axis=1).astype(np.float32)
+
+
+def _perform(rng: np.random.Generator, sign: np.ndarray, noise: float) -> np.ndarray:
+    """One performance: a random monotone time warp plus per-frame jitter."""
+    times = np.cumsum(rng.uniform(0.5, 1.5, SEQUENCE_LENGTH))
+    warped = resample(times, sign, SEQUENCE_LENGTH)
+    return (warped + rng.normal(0.0, noise, warped.shape)).astype(np.float32)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark DTW template matching.")
+    parser.add_argument("--counts", type=int, nargs="+", default=[50, 100, 200, 400, 800])
+    parser.add_argument("--labels", type=int, default=8, help="Distinct signs among the templates.")
+    parser.add_argument("--queries", type=int, default=30)
+    parser.add_argument("--noise", type=float, default=0.02)
+    parser.add_argument("--radius", type=int, default=DEFAULT_RADIUS)
+    parser.add_argument("--match-every", type=int, default=1, help="Frames per match, as --sequence-every.")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    signs = _signs(rng, args.labels)
+    names = np.array([f"SIGN{i}" for i in range(args.labels)])
+    print(f"T={SEQUENCE_LENGTH} D={FEATURE_DIM} radius={args.radius}; frame budget {FRAME_BUDGET_MS:.1f} ms")
+    print(
+        f"{'templates':>9} {'brute ms':>9} {'match ms':>9} {'p99 ms':>7} {'per-frame ms':>12} "
+        f"{'dtw share':>10} {'mismatch':>9}"
+    )
+    for count in args.counts:
+        which = np.arange(count) % args.labels
+        templates = SequenceTemplates(
+            np.stack([_perform(rng, signs[i], args.noise) for i in which]), names[which], args.radius
+        )
+        queries = [_perform(rng, signs[i], args.noise) for i in rng.integers(0, args.labels, args.queries)]
+
+        brute_s, match_s, shares, mismatches = [], [], [], 0
+        for query in queries:
+            started = time.perf_counter()
+            exact = float(dtw_many(query, templates.templates, args.radius).min())
+            brute_s.append(time.perf_counter() - started)
+            started = time.perf_counter()
+            match = templates.match(query)
+            match_s.append(time.perf_counter() - started)
+            shares.append(match.computed / count)
+            mismatches += not np.isclose(match.distance, exact, rtol=1e-6)
+
+        match_ms = np.array(match_s) * 1e3
+        print(
+            f"{count:>9} {np.median(brute_s) * 1e3:>9.2f} {np.mean(match_ms):>9.2f} "
+            f"{np.percentile(match_ms, 99):>7.2f} {np.mean(match_ms) / max(1, args.match_every):>12.2f} "
+            f"{np.mean(shares):>10.3f} {mismatches:>9}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,41 +1,62 @@
-import json
-import math
+from __future__ import annotations
+
+import argparse
 import os
+import threading
+import time
 from collections import deque
+from dataclasses import dataclass
 from datetime import datetime
+from typing import TYPE_CHECKING
 
-import cv2
-import mediapipe as mp
-import numpy as np
-from sklearn.neighbors import KNeighborsClassifier
+# Imported ahead of the heavy modules so STARTUP's "import" phase covers them.
+from signdao.startup import STARTUP, WarmUp
 
-# ---- Accessibility Voice Feedback (single source of truth) ----
-import time
-import threading
-import queue
-import pyttsx3
+import numpy as np
 
-# Threaded, non-blocking TTS
-_tts_engine = pyttsx3.init()  # Windows: SAPI5
-_tts_queue = queue.Queue()
+from signdao.events import FORMATS as EVENT_FORMATS, EventSink
+from signdao import metrics, speech
+from signdao.decision import Decision, DecisionEngine
+from signdao.features import (
+    FEATURE_DIM,
+    NUM_LANDMARKS,
+    UNKNOWN_FLOOR,
+    feature_vectors,
+    left_hand_mask,
+    normalize_landmarks,
+    normalize_landmarks_batch,
+    score_yes_no_batch,
+)
+from signdao.fingerprint import Fingerprint, FingerprintWindow, RecentFingerprints
+from signdao.fusion import ML_TAKEOVER, fuse_predictions, predict_labels
+from signdao.dataset import load_dataset
+from signdao.model import feature_spec_hash, load_model, model_from_dataset
+from signdao.pipeline import LatestSlot, RateMeter
+from signdao.sequence import SequenceRecognizer, SequenceTemplates
+from signdao.tracks import HandTracks, hand_centers
+
+if TYPE_CHECKING:
+    # OpenCV-backed; imported where they are used so importing this module stays light.
+    from signdao.enhance import LowLightEnhancer
+    from signdao.motion import MotionGate
+    from signdao.roi import HandROITracker
 
+# ---- Accessibility Voice Feedback (single source of truth) ----
+# Vote announcements are rendered once and replayed from signdao.speech's phrase
+# cache on a single TTS thread. The engine starts on first use (or during warm-up).
+_TTS_ENGINE = os.environ.get("SIGNDAO_TTS", "pyttsx3")
+_announcer = None
+_tts_lock = threading.Lock()
 
-def _tts_worker():
-    while True:
-        msg = _tts_queue.get()
-        if msg is None:
-            break
-        try:
-            _tts_engine.say(msg)
-            _tts_engine.runAndWait()
-        except Exception as e:
-            print(f"[TTS error] {e}")
-        finally:
-            _tts_queue.task_done()
 
+def start_tts(engine: str = _TTS_ENGINE, cache_dir: str = speech.DEFAULT_CACHE_DIR) -> speech.Announcer:
+    """Start the TTS thread if it is not running yet."""
+    global _announcer
+    with _tts_lock:
+        if _announcer is None:
+            _announcer = speech.Announcer(speech.create_engine(engine, cache_dir), cache_dir).start()
+    return _announcer
 
-_tts_thread = threading.Thread(target=_tts_worker, daemon=True)
-_tts_thread.start()
 
 # Global TTS cooldown to avoid spam of same message
 _last_spoken = None
@@ -49,313 +70,698 @@ def speak_once(message: str):
     now = time.time()
     if message != _last_spoken or (now - _last_spoken_at) > _COOLDOWN_SEC:
         try:
-            _tts_queue.put(message)
+            start_tts().announce(message)
             _last_spoken = message
             _last_spoken_at = now
         except Exception as e:
             print(f"[TTS queue error] {e}")
 
 
-# ---- Gesture label normalization + edge/cooldown tracking ----
-_prev_pred = "NONE"
-_last_yes_at = 0.0
-_last_no_at = 0.0
-_COOLDOWN_YES = 1.5
-_COOLDOWN_NO = 1.5
-
-
-def canonicalize_label(label) -> str:
-    """
-    Map model/heuristic labels to canonical 'YES'/'NO'/'NONE'.
-    Handles casing/whitespace and common synonyms like 'THUMB_UP', 'OPEN_HAND'.
-    """
-    if label is None:
-        return "NONE"
-    s = str(label).strip().upper()
-
-    # Common YES variants
-    YES_SET = {"YES", "THUMB_UP", "THUMBS_UP", "UP", "APPROVE", "LIKE"}
-    # Common NO variants
-    NO_SET = {"NO", "OPEN_HAND", "PALM", "STOP", "DISLIKE", "DOWN", "THUMB_DOWN", "THUMBS_DOWN"}
-
-    if s in YES_SET:
-        return "YES"
-    if s in NO_SET:
-        return "NO"
-
-    # If you have fused_label like "YES (0.91)" elsewhere, strip trailing confidence:
-    if "YES" in s:
-        return "YES"
-    if "NO" in s:
-        return "NO"
-
-    return "NONE"
-
-UNKNOWN_FLOOR = 0.55
-ML_TAKEOVER = 0.60
 SMOOTH_WINDOW = 9
+PIPELINE_STATS_SEC = 5.0
 
-
-def enhance_low_light(frame: np.ndarray) -> np.ndarray:
-    """Boost contrast in dim light using CLAHE on the luminance channel."""
-    lab_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2LAB)
-    l_channel, a_channel, b_channel = cv2.split(lab_frame)
-    clahe = cv2.createCLAHE(clipLimit=3.0, tileGridSize=(8, 8))
-    l_enhanced = clahe.apply(l_channel)
-    enhanced = cv2.merge((l_enhanced, a_channel, b_channel))
-    return cv2.cvtColor(enhanced, cv2.COLOR_LAB2BGR)
+_STAGE_READ = metrics.stage("capture_read")
+_STAGE_ENHANCE = metrics.stage("enhance")
+_STAGE_HANDS = metrics.stage("hands_process")
+_STAGE_RULE = metrics.stage("classify_rule")
+_STAGE_KNN = metrics.stage("knn_predict")
+_STAGE_SEQUENCE = metrics.stage("sequence_match")
+_STAGE_SMOOTH = metrics.stage("smoothing")
+_STAGE_OUTPUT = metrics.stage("output")
 
 
 def landmark_array(landmarks):
     return np.array([(lm.x, lm.y, lm.z) for lm in landmarks], dtype=np.float32)
 
 
-def normalize_landmarks(landmarks: np.ndarray, handedness: str | None = None) -> np.ndarray:
-    """Translate wrist to origin and scale by palm size for comparability."""
-    wrist = landmarks[0]
-    translated = landmarks - wrist
-    if handedness == "Left":
-        translated[:, 0] *= -1
-    middle_mcp = landmarks[9]
-    scale = np.linalg.norm(middle_mcp - wrist)
-    if scale < 1e-6:
-        scale = 1.0
-    return translated / scale
+def classify_yes_no(landmarks, handedness: str | None = None, normalized: np.ndarray | None = None) -> tuple[str, float]:
+    if normalized is None:
+        normalized = normalize_landmarks(landmarks, handedness)
+    scores = score_yes_no_batch(normalized[np.newaxis], UNKNOWN_FLOOR)
+    return str(scores.labels[0]), float(scores.confidence[0])
+
 
+MODEL_PATH = "./WLASL/wlasl_lite/sign_classifier_augmented.sdds"
+MODEL_ARTIFACT_PATH = "./WLASL/wlasl_lite/sign_classifier_model.sdds"
 
-def vector_angle(v1: np.ndarray, v2: np.ndarray) -> float:
-    denom = np.linalg.norm(v1) * np.linalg.norm(v2)
-    if denom < 1e-6:
-        return 0.0
-    cosine = np.clip(np.dot(v1, v2) / denom, -1.0, 1.0)
-    return math.acos(cosine)
+
+def load_augmented_model(path: str = MODEL_PATH, artifact_path: str = MODEL_ARTIFACT_PATH):
+    model = load_model(artifact_path)
+    if model is not None:
+        print(f"[INFO] Loaded ML model with {len(model)} samples")
+        return model
+
+    # Checkouts with only the merged dataset can index it directly.
+    if not os.path.exists(path):
+        print(f"[WARN] Model not found at {artifact_path}")
+        return None
+    dataset = load_dataset(path)
+    if len(dataset) == 0:
+        print(f"[WARN] Model dataset at {path} is empty")
+        return None
+    if dataset.spec_hash != feature_spec_hash():
+        print(f"[WARN] Model dataset at {path} was built for a different feature spec. Rerun train_yes_no.py")
+        return None
+    model = model_from_dataset(dataset)
+    print(f"[INFO] Indexed ML model with {len(model)} samples from {path}; rerun train_yes_no.py to prebuild it")
+    return model
 
 
-def finger_curl(landmarks: np.ndarray, indices) -> float:
-    mcp, pip, dip, tip = (landmarks[i] for i in indices)
-    angle1 = vector_angle(pip - mcp, dip - pip)
-    angle2 = vector_angle(dip - pip, tip - dip)
-    curl = (angle1 + angle2) / math.pi
-    return float(np.clip(curl, 0.0, 1.0))
+ml_clf = None
+_model_loaded = False
+_model_lock = threading.Lock()
 
 
-def thumb_curl(landmarks: np.ndarray) -> float:
-    mcp = landmarks[2]
-    ip = landmarks[3]
-    tip = landmarks[4]
-    wrist = landmarks[0]
-    angle1 = vector_angle(ip - mcp, tip - ip)
-    angle2 = vector_angle(mcp - wrist, tip - mcp)
-    curl = (angle1 + angle2) / math.pi
-    return float(np.clip(curl, 0.0, 1.0))
+def get_classifier():
+    """The KNN model, loaded on first use; None when no trained model is available."""
+    global ml_clf, _model_loaded
+    if not _model_loaded:
+        with _model_lock:
+            if not _model_loaded:
+                with STARTUP.phase("model_load"):
+                    ml_clf = load_augmented_model()
+                if ml_clf is None:
+                    print("[INFO] ML model not found. Using rule-based only. Run: python WLASL/wlasl_lite/train_yes_no.py")
+                _model_loaded = True
+    return ml_clf
 
 
-def classify_yes_no(landmarks, handedness: str | None = None, normalized: np.ndarray | None = None) -> tuple[str, float]:
-    if normalized is None:
-        normalized = normalize_landmarks(landmarks, handedness)
+def fuse_hands(landmarks: np.ndarray, handedness: list[str | None]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Rule-based + KNN labels for every hand in a frame, one batched call per stage.
 
-    curls = {
-        "thumb": thumb_curl(normalized),
-        "index": finger_curl(normalized, [5, 6, 7, 8]),
-        "middle": finger_curl(normalized, [9, 10, 11, 12]),
-        "ring": finger_curl(normalized, [13, 14, 15, 16]),
-        "pinky": finger_curl(normalized, [17, 18, 19, 20]),
-    }
-
-    palm_span = np.linalg.norm(normalized[5] - normalized[17])
-    palm_span = palm_span if palm_span > 1e-6 else 1.0
-
-    thumb_tip = normalized[4]
-    index_tip = normalized[8]
-    middle_tip = normalized[12]
-
-    index_thumb_dist = np.linalg.norm(thumb_tip - index_tip) / palm_span
-    middle_thumb_dist = np.linalg.norm(thumb_tip - middle_tip) / palm_span
-
-    yes_score = np.mean(
-        [
-            curls["index"],
-            curls["middle"],
-            curls["ring"],
-            curls["pinky"],
-        ]
+    Returns ``(features, labels, confidences)``; features are the (N, FEATURE_DIM)
+    KNN inputs, which sequence mode reuses.
+    """
+    started = time.perf_counter()
+    normalized = normalize_landmarks_batch(landmarks, left_hand_mask(handedness))
+    scores = score_yes_no_batch(normalized, UNKNOWN_FLOOR)
+    features = feature_vectors(normalized)
+    _STAGE_RULE.observe(time.perf_counter() - started)
+    clf = get_classifier()
+    if clf is None:
+        return features, scores.labels, scores.confidence
+    started = time.perf_counter()
+    ml_labels, ml_conf = predict_labels(clf, features)
+    _STAGE_KNN.observe(time.perf_counter() - started)
+    labels, conf = fuse_predictions(scores.labels, scores.confidence, ml_labels, ml_conf, ML_TAKEOVER)
+    return features, labels, conf
+
+
+def fuse_hand(landmark_matrix: np.ndarray, handedness: str | None) -> tuple[str, float]:
+    """Combine the rule-based and KNN predictions for one hand."""
+    _, labels, conf = fuse_hands(landmark_matrix[np.newaxis], [handedness])
+    return str(labels[0]), float(conf[0])
+
+
+def match_sequence(recognizer: SequenceRecognizer, feature: np.ndarray, now: float) -> tuple[str, float]:
+    """Add this frame to the rolling window and match it against the DTW templates."""
+    started = time.perf_counter()
+    match = recognizer.update(now, feature)
+    _STAGE_SEQUENCE.observe(time.perf_counter() - started)
+    if match is None:
+        return "UNKNOWN", 0.0
+    return match.label, match.confidence
+
+
+def load_sequence_templates(path: str) -> SequenceTemplates:
+    with STARTUP.phase("sequence_templates"):
+        templates = SequenceTemplates.load(path)
+    print(
+        f"[INFO] Sequence mode: {len(templates)} templates of {templates.length} steps "
+        f"(max distance {templates.max_distance:.2f})"
     )
+    return templates
 
-    no_components = [
-        1.0 - curls["index"],
-        1.0 - curls["middle"],
-        1.0 - curls["ring"],
-        1.0 - curls["pinky"],
-        np.clip(index_thumb_dist, 0.0, 1.0),
-        np.clip(middle_thumb_dist, 0.0, 1.0),
-    ]
-    no_score = np.mean(no_components)
 
-    scores = {"YES": float(np.clip(yes_score, 0.0, 1.0)), "NO": float(np.clip(no_score, 0.0, 1.0))}
-    gesture = max(scores, key=scores.get)
-    confidence = scores[gesture]
+@dataclass
+class HandResult:
+    track_id: int  # stable across frames while the same voter stays in view
+    landmarks: np.ndarray
+    label: str
+    confidence: float
+    display_text: str
+    decision: Decision | None = None
+    vote: int = 0  # this track's commit count; numbers ``decision`` when it is set
+    fingerprint: Fingerprint | None = None  # once per committed vote, possibly a few frames after it
 
-    if confidence < UNKNOWN_FLOOR:
-        return "UNKNOWN", confidence
-    return gesture, confidence
 
+@dataclass
+class FrameResult:
+    seq: int
+    captured_at: float  # time.perf_counter() right after the frame was read
+    frame: np.ndarray  # BGR preview frame, enhanced like the inference input; the render stage draws on it
+    hands: list[HandResult]
 
-MODEL_PATH = "./WLASL/wlasl_lite/sign_classifier_augmented.npz"
 
+@dataclass(frozen=True)
+class DetectedHands:
+    """One frame's MediaPipe hands and their per-frame labels, all as (N, ...) arrays."""
 
-def load_augmented_model(path: str = MODEL_PATH):
-    if not os.path.exists(path):
-        print(f"[WARN] Model not found at {path}")
-        return None
-    data = np.load(path, allow_pickle=True)
-    X, y = data["X"], data["y"]
-    if len(X) == 0:
-        print(f"[WARN] Model dataset at {path} is empty")
-        return None
-    k = min(5, max(1, len(X) // 2))
-    clf = KNeighborsClassifier(n_neighbors=k)
-    clf.fit(X, y)
-    print(f"[INFO] Loaded ML model with {len(y)} samples")
-    return clf
-
-
-ml_clf = load_augmented_model()
-if ml_clf is None:
-    print("[INFO] ML model not found. Using rule-based only. Run: python WLASL/wlasl_lite/train_yes_no.py")
-
-
-def main():
-    global _prev_pred, _last_yes_at, _last_no_at
-    mp_hands = mp.solutions.hands
-    history: deque[tuple[str, float]] = deque(maxlen=SMOOTH_WINDOW)
-    last_label_conf: tuple[str, float] | None = None
-
-    with mp_hands.Hands(
-        static_image_mode=False,
-        max_num_hands=1,
-        model_complexity=1,
-        min_detection_confidence=0.55,
-        min_tracking_confidence=0.6,
-    ) as hands:
-        cap = cv2.VideoCapture(0)
+    landmarks: np.ndarray  # (N, 21, 3) full-frame normalized
+    features: np.ndarray  # (N, FEATURE_DIM)
+    labels: np.ndarray
+    confidence: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.landmarks)
+
+
+NO_HANDS = DetectedHands(
+    np.empty((0, NUM_LANDMARKS, 3), dtype=np.float32),
+    np.empty((0, FEATURE_DIM), dtype=np.float32),
+    np.empty(0, dtype=object),
+    np.empty(0, dtype=np.float32),
+)
+
+
+class GestureTracker:
+    """Per-hand smoothing and YES/NO decisions, with spoken feedback on each vote.
+
+    With ``sequence_templates``, the per-frame label comes from matching the
+    last few seconds of this hand's motion against recorded sign
+    trajectories instead of from the frame's pose. ``fingerprints`` holds
+    the same frames as the smoothing window, for the vote's NFT fingerprint.
+    """
+
+    def __init__(self, sequence_templates: SequenceTemplates | None = None, sequence_every: int = 1) -> None:
+        self.engine = DecisionEngine(window=SMOOTH_WINDOW)
+        self.fingerprints = FingerprintWindow(SMOOTH_WINDOW)
+        self.sequence = (
+            SequenceRecognizer(sequence_templates, match_every=sequence_every) if sequence_templates is not None else None
+        )
+
+    def update(
+        self, fused_label: str, fused_conf: float, now: float | None = None
+    ) -> tuple[str, float, str, Decision | None]:
+        started = time.perf_counter()
+        update = self.engine.update(fused_label, fused_conf, now)
+        _STAGE_SMOOTH.observe(time.perf_counter() - started)
+        if update.decision is not None:
+            speak_once(f"Vote {update.decision.label} submitted")
+        if update.label != "NONE":
+            fused_label, fused_conf = update.label, update.confidence
+        return fused_label, fused_conf, f"{fused_label} ({fused_conf:.2f})", update.decision
+
+    def reset(self) -> None:
+        self.engine.reset()
+        self.fingerprints.reset()
+        if self.sequence is not None:
+            self.sequence.reset()
+
+
+def create_tracks(sequence_templates: SequenceTemplates | None = None, sequence_every: int = 1) -> HandTracks[GestureTracker]:
+    return HandTracks(lambda: GestureTracker(sequence_templates, sequence_every))
+
+
+def process_frame(
+    hands,
+    tracks: HandTracks[GestureTracker],
+    enhancer: LowLightEnhancer,
+    frame: np.ndarray,
+    seq: int,
+    captured_at: float,
+    roi: HandROITracker | None = None,
+    gate: MotionGate | None = None,
+    sequence_mode: bool = False,
+) -> FrameResult:
+    """Inference stage: enhance, run MediaPipe, classify and smooth one frame.
+
+    Every detected hand is classified in one batch, then matched to a stable
+    track whose ``GestureTracker`` smooths its labels and fires its votes, so
+    several voters can share one camera.
+    With ``roi``, MediaPipe sees a downsized crop around the previous frame's
+    hands instead of the full frame; landmarks are mapped back before use.
+    With ``gate``, a frame that barely differs from the last processed one
+    reuses its hands and fused labels. The smoothing windows and voice
+    feedback still advance every frame, so decisions fire at the same time.
+    ``sequence_mode`` skips the per-frame classifiers; the trackers label
+    hands from their motion instead (see ``GestureTracker``).
+    The returned frame shows the enhancer's output, so the operator sees what
+    MediaPipe saw; a gated frame reuses the last frame's enhancement.
+    A hand carries its vote's fingerprint on the first frame its window is stable enough for one.
+    """
+    if gate is not None and not gate.should_process(frame):
+        detected = gate.cached
+    else:
+        detected = _infer_hands(hands, enhancer, frame, roi, fuse=not sequence_mode)
+        if gate is not None:
+            gate.remember(detected)
+
+    assigned = tracks.assign(hand_centers(detected.landmarks))
+    results = []
+    for i, (track_id, tracker) in enumerate(assigned):
+        fused_label, fused_conf = str(detected.labels[i]), float(detected.confidence[i])
+        if tracker.sequence is not None:
+            fused_label, fused_conf = match_sequence(tracker.sequence, detected.features[i], captured_at)
+        tracker.fingerprints.push(fused_label, detected.features[i])
+        label, conf, display_text, decision = tracker.update(fused_label, fused_conf, captured_at)
+        if decision is not None:
+            tracker.fingerprints.commit(decision.label)
+        fingerprint = tracker.fingerprints.take()
+        results.append(
+            HandResult(
+                track_id,
+                detected.landmarks[i],
+                label,
+                conf,
+                display_text,
+                decision,
+                tracker.fingerprints.votes,
+                fingerprint,
+            )
+        )
+    return FrameResult(seq, captured_at, enhancer.display_frame(frame), results)
+
+
+def _infer_hands(
+    hands,
+    enhancer: LowLightEnhancer,
+    frame: np.ndarray,
+    roi: HandROITracker | None,
+    fuse: bool = True,
+) -> DetectedHands:
+    """Enhance, run MediaPipe and fuse every hand; ``NO_HANDS`` without one.
+
+    With ``fuse=False`` the per-frame classifiers are skipped and every label is UNKNOWN.
+    """
+    started = time.perf_counter()
+    frame_rgb = enhancer.process(frame)
+    _STAGE_ENHANCE.observe(time.perf_counter() - started)
+    started = time.perf_counter()
+    if roi is not None:
+        results, transform = roi.process(hands, frame_rgb)
+    else:
+        results, transform = hands.process(frame_rgb), None
+    _STAGE_HANDS.observe(time.perf_counter() - started)
+    height, width = frame.shape[:2]
+
+    if not results.multi_hand_landmarks:
+        enhancer.set_hand(None, width, height)
+        if roi is not None:
+            roi.update(None, width, height)
+        return NO_HANDS
+
+    metrics.HANDS_DETECTED.inc()
+    landmarks = np.stack([landmark_array(hand.landmark) for hand in results.multi_hand_landmarks])
+    if transform is not None:
+        landmarks = transform.to_frame(landmarks)
+        roi.update(landmarks.reshape(-1, 3), width, height)
+    enhancer.set_hand(landmarks.reshape(-1, 3), width, height)
+    handedness = [hand.classification[0].label for hand in results.multi_handedness or []]
+    handedness += [None] * (len(landmarks) - len(handedness))
+    if not fuse:
+        features = feature_vectors(normalize_landmarks_batch(landmarks, left_hand_mask(handedness)))
+        unknown = np.full(len(landmarks), "UNKNOWN", dtype=object)
+        return DetectedHands(landmarks, features, unknown, np.zeros(len(landmarks), dtype=np.float32))
+    features, labels, conf = fuse_hands(landmarks, handedness)
+    return DetectedHands(landmarks, features, labels, conf)
+
+
+class OutputStage:
+    """Render/output stage: per-hand label, vote and fingerprint events to the sink, overlay window.
+
+    Fingerprints go out once per committed vote, and not at all when the same
+    digest was emitted recently (``RecentFingerprints``).
+    """
+
+    def __init__(self, sink: EventSink) -> None:
+        self.sink = sink
+        self.fingerprints = RecentFingerprints()
+        # Last emitted (label, confidence) per track id; None stands for "no hands".
+        self.last_label_conf: dict[int | None, tuple[str, float]] = {}
+
+    def emit(self, result: FrameResult) -> None:
+        label_confs: dict[int | None, tuple[str, float]] = {}
+        for hand in result.hands:
+            label_confs[hand.track_id] = (hand.label, round(hand.confidence, 3))
+        if not label_confs:
+            label_confs[None] = ("NONE", 0.0)
+        else:
+            # A voter who left while others stay in view.
+            for track_id in self.last_label_conf.keys() - label_confs.keys() - {None}:
+                self.sink.emit("gesture", {"gesture": "NONE", "confidence": 0.0, "hand": track_id})
+
+        for track_id, label_conf in label_confs.items():
+            if label_conf == self.last_label_conf.get(track_id):
+                continue
+            payload = {
+                "gesture": label_conf[0],
+                "confidence": label_conf[1],
+                "ts": datetime.now().astimezone().isoformat(timespec="seconds"),
+            }
+            if track_id is not None:
+                payload["hand"] = track_id
+            self.sink.emit("gesture", payload)
+        self.last_label_conf = label_confs
+
+        for hand in result.hands:
+            if hand.decision is None:
+                continue
+            decision = {
+                "hand": hand.track_id,
+                "vote": hand.vote,
+                "label": hand.decision.label,
+                "confidence": round(hand.decision.confidence, 3),
+                "repeat": hand.decision.repeat,
+                "latency_ms": round(hand.decision.latency * 1000.0, 1),
+            }
+            self.sink.emit("decision", decision)
+
+        # A vote's fingerprint can arrive a few frames after its decision; "vote" pairs them.
+        for hand in result.hands:
+            if hand.fingerprint is None or not self.fingerprints.add(hand.fingerprint.digest):
+                continue
+            fingerprint = {
+                "hand": hand.track_id,
+                "vote": hand.fingerprint.vote,
+                "label": hand.fingerprint.label,
+                "fingerprint": hand.fingerprint.digest,
+                "frames": hand.fingerprint.frames,
+            }
+            self.sink.emit("fingerprint", fingerprint)
+
+    def render(self, result: FrameResult) -> None:
+        import cv2
+
+        for row, hand in enumerate(result.hands):
+            text = hand.display_text if len(result.hands) == 1 else f"#{hand.track_id} {hand.display_text}"
+            cv2.putText(
+                result.frame,
+                text,
+                (10, 30 + 35 * row),
+                cv2.FONT_HERSHEY_SIMPLEX,
+                1,
+                (0, 255, 0),
+                2,
+            )
+        cv2.imshow("SignDAO Gesture", result.frame)
+
+
+def read_frame(cap) -> tuple[bool, np.ndarray | None]:
+    started = time.perf_counter()
+    success, frame = cap.read()
+    _STAGE_READ.observe(time.perf_counter() - started)
+    if success:
+        metrics.FRAMES.inc()
+    else:
+        metrics.READ_FAILURES.inc()
+    return success, frame
+
+
+def run_sequential(
+    hands,
+    cap,
+    sink: EventSink,
+    use_roi: bool = False,
+    max_hands: int = 1,
+    use_gate: bool = False,
+    sequence_templates: SequenceTemplates | None = None,
+    sequence_every: int = 1,
+) -> None:
+    """Capture, inference and output back to back on the calling thread."""
+    import cv2
+
+    from signdao.enhance import LowLightEnhancer
+    from signdao.motion import MotionGate
+    from signdao.roi import HandROITracker
+
+    tracks = create_tracks(sequence_templates, sequence_every)
+    enhancer = LowLightEnhancer()
+    roi = HandROITracker(max_hands=max_hands) if use_roi else None
+    gate = MotionGate() if use_gate else None
+    sequence_mode = sequence_templates is not None
+    output = OutputStage(sink)
+    seq = 0
+    while True:
+        success, frame = read_frame(cap)
+        if not success:
+            break
+        result = process_frame(hands, tracks, enhancer, frame, seq, time.perf_counter(), roi, gate, sequence_mode)
+        seq += 1
+        started = time.perf_counter()
+        output.emit(result)
+        output.render(result)
+        _STAGE_OUTPUT.observe(time.perf_counter() - started)
+        if cv2.waitKey(1) & 0xFF == ord("q"):
+            break
+    if gate is not None:
+        sink.emit("motion_gate", gate.stats())
+    sink.emit("fingerprints", output.fingerprints.stats())
+
+
+def run_pipeline(
+    hands,
+    cap,
+    sink: EventSink,
+    stats_interval: float = PIPELINE_STATS_SEC,
+    use_roi: bool = False,
+    max_hands: int = 1,
+    use_gate: bool = False,
+    sequence_templates: SequenceTemplates | None = None,
+    sequence_every: int = 1,
+) -> None:
+    """Capture, inference and render on separate threads joined by latest-wins slots.
+
+    The capture thread reads at the camera's native rate; when inference falls
+    behind, older frames are replaced instead of queued. The calling thread
+    renders (OpenCV windows must stay on the main thread) and periodically
+    prints achieved rates and the capture-to-display frame age.
+    """
+    import cv2
+
+    from signdao.enhance import LowLightEnhancer
+    from signdao.motion import MotionGate
+    from signdao.roi import HandROITracker
+
+    frames: LatestSlot[tuple[int, float, np.ndarray]] = LatestSlot()
+    results: LatestSlot[FrameResult] = LatestSlot()
+    stop = threading.Event()
+    capture_rate, inference_rate, display_rate = RateMeter(), RateMeter(), RateMeter()
+    gate = MotionGate() if use_gate else None
+
+    def capture_loop() -> None:
+        seq = 0
+        while not stop.is_set():
+            success, frame = read_frame(cap)
+            if not success:
+                stop.set()
+                break
+            frames.put((seq, time.perf_counter(), frame))
+            capture_rate.tick()
+            seq += 1
+
+    def inference_loop() -> None:
+        tracks = create_tracks(sequence_templates, sequence_every)
+        enhancer = LowLightEnhancer()
+        roi = HandROITracker(max_hands=max_hands) if use_roi else None
+        sequence_mode = sequence_templates is not None
+        while not stop.is_set():
+            item = frames.get(timeout=0.1)
+            if item is None:
+                continue
+            seq, captured_at, frame = item
+            results.put(process_frame(hands, tracks, enhancer, frame, seq, captured_at, roi, gate, sequence_mode))
+            inference_rate.tick()
+
+    workers = [
+        threading.Thread(target=capture_loop, name="capture", daemon=True),
+        threading.Thread(target=inference_loop, name="inference", daemon=True),
+    ]
+    for worker in workers:
+        worker.start()
+
+    output = OutputStage(sink)
+    ages_ms: list[float] = []
+    next_report = time.perf_counter() + stats_interval
+    try:
+        while not stop.is_set():
+            result = results.get(timeout=0.01)
+            if result is not None:
+                started = time.perf_counter()
+                output.emit(result)
+                output.render(result)
+                _STAGE_OUTPUT.observe(time.perf_counter() - started)
+                ages_ms.append((time.perf_counter() - result.captured_at) * 1000.0)
+                display_rate.tick()
+            if cv2.waitKey(1) & 0xFF == ord("q"):
+                break
+            if time.perf_counter() >= next_report:
+                stats = {
+                    "capture_fps": round(capture_rate.snapshot(), 1),
+                    "inference_fps": round(inference_rate.snapshot(), 1),
+                    "display_fps": round(display_rate.snapshot(), 1),
+                    "frame_age_ms_p50": round(float(np.percentile(ages_ms, 50)), 1) if ages_ms else None,
+                    "frame_age_ms_max": round(max(ages_ms), 1) if ages_ms else None,
+                    "dropped_frames": frames.dropped,
+                    "dropped_results": results.dropped,
+                }
+                if gate is not None:
+                    stats["motion_gate"] = gate.stats()
+                stats["events"] = sink.stats()
+                sink.emit("pipeline_stats", stats)
+                ages_ms.clear()
+                next_report += stats_interval
+    finally:
+        stop.set()
+        for worker in workers:
+            worker.join(timeout=1.0)
+        sink.emit("fingerprints", output.fingerprints.stats())
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Live SignDAO YES/NO gesture recognizer.")
+    parser.add_argument(
+        "--pipeline",
+        action="store_true",
+        help="Run capture, inference and rendering on separate threads, dropping stale frames.",
+    )
+    parser.add_argument(
+        "--roi",
+        action="store_true",
+        help="Run MediaPipe on a downsized crop around the tracked hand instead of the full frame.",
+    )
+    parser.add_argument(
+        "--motion-gate",
+        action="store_true",
+        help="Reuse the last landmarks and decision while the scene is static.",
+    )
+    parser.add_argument(
+        "--max-hands",
+        type=int,
+        default=1,
+        help="Track up to this many hands (voters) per frame; each gets its own smoothing and votes.",
+    )
+    parser.add_argument(
+        "--sequence-templates",
+        metavar="PATH",
+        help="Recognize signs from motion: DTW-match the last seconds of hand features against "
+        "trajectories written by wlasl_lite_extract.py --sequence.",
+    )
+    parser.add_argument(
+        "--sequence-every",
+        type=int,
+        default=1,
+        help="In sequence mode, match every Nth hand frame and reuse the last match in between.",
+    )
+    parser.add_argument(
+        "--tts",
+        choices=speech.ENGINES,
+        default=_TTS_ENGINE,
+        help="Speech engine for vote announcements ('file' and 'none' work headless).",
+    )
+    parser.add_argument("--tts-cache", default=speech.DEFAULT_CACHE_DIR, help="Directory for pre-rendered announcements.")
+    parser.add_argument("--events", default="-", help="Event output path ('-' for stdout, ndjson only).")
+    parser.add_argument("--metrics-port", type=int, help="Serve Prometheus metrics on this port.")
+    parser.add_argument("--event-format", choices=EVENT_FORMATS, default="ndjson")
+    parser.add_argument(
+        "--event-rate",
+        action="append",
+        default=[],
+        metavar="TYPE=HZ",
+        help="Cap an event type at HZ events per second (repeatable).",
+    )
+    parser.add_argument(
+        "--event-every",
+        action="append",
+        default=[],
+        metavar="TYPE=N",
+        help="Keep only every Nth event of a type, e.g. gesture=5 (repeatable).",
+    )
+    args = parser.parse_args(argv)
+    if args.event_format == "binary" and args.events == "-":
+        # Diagnostics are printed to stdout and would corrupt the record stream.
+        parser.error("--event-format binary needs an --events file path, not stdout")
+    return args
+
+
+def parse_rate_limits(specs: list[str]) -> dict[str, float]:
+    limits = {}
+    for spec in specs:
+        name, sep, value = spec.partition("=")
+        if not sep:
+            raise SystemExit(f"--event-rate expects TYPE=HZ, got {spec!r}")
+        limits[name] = float(value)
+    return limits
+
+
+def parse_decimation(specs: list[str]) -> dict[str, int]:
+    every = {}
+    for spec in specs:
+        name, sep, value = spec.partition("=")
+        if not sep or not value.isdigit():
+            raise SystemExit(f"--event-every expects TYPE=N, got {spec!r}")
+        every[name] = int(value)
+    return every
+
+
+def create_hands(max_hands: int = 1):
+    """Build the MediaPipe Hands graph and push one blank frame through it."""
+    with STARTUP.phase("graph_init"):
+        import mediapipe as mp
+
+        hands = mp.solutions.hands.Hands(
+            static_image_mode=False,
+            max_num_hands=max_hands,
+            model_complexity=1,
+            min_detection_confidence=0.55,
+            min_tracking_confidence=0.6,
+        )
+    with STARTUP.phase("first_inference"):
+        hands.process(np.zeros((240, 320, 3), dtype=np.uint8))
+    return hands
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    # Model and TTS load in the background while the graph is built and the camera opens.
+    warm_up = WarmUp({"model_load": get_classifier, "tts": lambda: start_tts(args.tts, args.tts_cache)}).start()
+    sink = EventSink(
+        args.events,
+        args.event_format,
+        rate_limits=parse_rate_limits(args.event_rate),
+        decimate=parse_decimation(args.event_every),
+        bare_types=("gesture",),
+    )
+    if args.metrics_port:
+        metrics.serve(args.metrics_port)
+        print(f"[INFO] Serving metrics at http://localhost:{args.metrics_port}/metrics")
+
+    sequence_templates = load_sequence_templates(args.sequence_templates) if args.sequence_templates else None
+
+    max_hands = max(1, args.max_hands)
+    with create_hands(max_hands) as hands:
+        with STARTUP.phase("capture_open"):
+            import cv2
+
+            cap = cv2.VideoCapture(0)
         if not cap.isOpened():
             raise RuntimeError("Unable to access webcam. Check camera permissions or index.")
-
+        warm_up.wait()
+        print(f"[INFO] Startup: {STARTUP.summary()}")
+        sink.emit("startup", STARTUP.to_dict())
+
+        run_options = {
+            "use_roi": args.roi,
+            "max_hands": max_hands,
+            "use_gate": args.motion_gate,
+            "sequence_templates": sequence_templates,
+            "sequence_every": args.sequence_every,
+        }
         try:
-            while True:
-                success, frame = cap.read()
-                if not success:
-                    break
-
-                enhanced_frame = enhance_low_light(frame)
-                frame_rgb = cv2.cvtColor(enhanced_frame, cv2.COLOR_BGR2RGB)
-                results = hands.process(frame_rgb)
-
-                display_text = "..."
-                fused_label = "NONE"
-                fused_conf = 0.0
-
-                if results.multi_hand_landmarks:
-                    landmarks = results.multi_hand_landmarks[0].landmark
-                    # ---- NFT prototype metadata logging ----
-                    landmark_x_values = [float(lm.x) for lm in landmarks]
-                    nft_metadata = {"nft_metadata": {"landmarks": landmark_x_values}}
-                    print(json.dumps(nft_metadata), flush=True)
-                    landmark_matrix = landmark_array(landmarks)
-                    handedness = None
-                    if results.multi_handedness:
-                        handedness = results.multi_handedness[0].classification[0].label
-                    normalized_matrix = normalize_landmarks(landmark_matrix, handedness)
-                    rb_label, rb_conf = classify_yes_no(landmark_matrix, handedness, normalized_matrix)
-                    normalized_feat = normalized_matrix[:, :2].flatten().astype(np.float32)
-                    ml_label, ml_conf = None, 0.0
-                    if ml_clf is not None:
-                        proba = ml_clf.predict_proba([normalized_feat])[0]
-                        idx = int(np.argmax(proba))
-                        ml_label = ml_clf.classes_[idx]
-                        ml_conf = float(proba[idx])
-
-                    if ml_label and ml_conf >= ML_TAKEOVER:
-                        fused_label, fused_conf = ml_label, ml_conf
-                    elif rb_label != "UNKNOWN":
-                        fused_label, fused_conf = rb_label, rb_conf
-                    else:
-                        fused_label = ml_label or "UNKNOWN"
-                        fused_conf = ml_conf if ml_label else rb_conf
-
-                    if fused_label != "UNKNOWN":
-                        history.append((fused_label, fused_conf))
-                    else:
-                        history.clear()
-
-                    if history:
-                        gestures = [g for g, _ in history]
-                        dominant = max(set(gestures), key=gestures.count)
-                        dominant_conf = float(np.mean([c for g, c in history if g == dominant]))
-                        display_text = f"{dominant} ({dominant_conf:.2f})"
-                        fused_label, fused_conf = dominant, dominant_conf
-                    else:
-                        display_text = f"{fused_label} ({fused_conf:.2f})"
-
-                    prediction = fused_label
-                    pred_norm = canonicalize_label(prediction)
-                    now = time.time()
-
-                    # YES feedback: on edge into YES or after YES cooldown while holding
-                    if pred_norm == "YES" and (_prev_pred != "YES" or (now - _last_yes_at) > _COOLDOWN_YES):
-                        speak_once("Vote YES submitted")
-                        _last_yes_at = now
-
-                    # NO feedback: on edge into NO or after NO cooldown while holding
-                    elif pred_norm == "NO" and (_prev_pred != "NO" or (now - _last_no_at) > _COOLDOWN_NO):
-                        speak_once("Vote NO submitted")
-                        _last_no_at = now
-
-                    # Reset previous when no hand is detected so next entry fires
-                    elif pred_norm == "NONE":
-                        _prev_pred = "NONE"
-
-                    _prev_pred = pred_norm
-
-                    cv2.putText(
-                        enhanced_frame,
-                        display_text,
-                        (10, 30),
-                        cv2.FONT_HERSHEY_SIMPLEX,
-                        1,
-                        (0, 255, 0),
-                        2,
-                    )
-
-                    rounded_conf = round(fused_conf, 3)
-                    if (fused_label, rounded_conf) != last_label_conf:
-                        payload = {
-                            "gesture": fused_label,
-                            "confidence": rounded_conf,
-                            "ts": datetime.now().astimezone().isoformat(timespec="seconds"),
-                        }
-                        print(json.dumps(payload), flush=True)
-                        last_label_conf = (fused_label, rounded_conf)
-                else:
-                    history.clear()
-                    if last_label_conf != ("NONE", 0.0):
-                        payload = {
-                            "gesture": "NONE",
-                            "confidence": 0.0,
-                            "ts": datetime.now().astimezone().isoformat(timespec="seconds"),
-                        }
-                        print(json.dumps(payload), flush=True)
-                        last_label_conf = ("NONE", 0.0)
-                    prediction = "NONE"
-                    _prev_pred = "NONE"
-
-                cv2.imshow("SignDAO Gesture", enhanced_frame)
-                if cv2.waitKey(1) & 0xFF == ord("q"):
-                    break
+            if args.pipeline:
+                run_pipeline(hands, cap, sink, **run_options)
+            else:
+                run_sequential(hands, cap, sink, **run_options)
         finally:
             cap.release()
             cv2.destroyAllWindows()
+            if _announcer is not None:
+                sink.emit("tts", _announcer.stats())
+            sink.emit("event_sink", sink.stats())
+            sink.close()
+
 
+STARTUP.mark("import")
 
 if __name__ == "__main__":
     main()
@@ -26,6 +26,7 @@ const SEPOLIA_CHAIN_HEX = "0xaa36a7";
 const GESTURE_YES = "YES";
 const GESTURE_NO = "NO";
 const COOLDOWN_MS = 5000;
+const GESTURE_STREAM_URL = "http://localhost:5000/gesture/stream";
 
 type GesturePayload = {
   gesture: string;
@@ -165,40 +166,29 @@ export default function ProofsPage() {
   }, []);
 
   useEffect(() => {
-    let mounted = true;
-
-    const tick = () => {
-      fetch("http://localhost:5000/gesture")
-        .then((response) => {
-          if (!response.ok) {
-            throw new Error("Bad response");
-          }
-          return response.json();
-        })
-        .then((data: GesturePayload) => {
-          if (!mounted) {
-            return;
-          }
-          setGesture(data?.gesture ?? "");
-          setConfidence(typeof data?.confidence === "number" ? data.confidence : null);
-          setError("");
-        })
-        .catch(() => {
-          if (!mounted) {
-            return;
-          }
-          setGesture("");
-          setConfidence(null);
-          setError("Gesture API unreachable");
-        });
-    };
+    // The backend pushes an event only when the label or confidence changes;
+    // EventSource reconnects on its own and resumes via Last-Event-ID.
+    const source = new EventSource(GESTURE_STREAM_URL);
 
-    tick();
-    const id = setInterval(tick, 1500);
+    source.addEventListener("gesture", (event) => {
+      try {
+        const data = JSON.parse((event as MessageEvent<string>).data) as GesturePayload;
+        setGesture(data?.gesture ?? "");
+        setConfidence(typeof data?.confidence === "number" ? data.confidence : null);
+        setError("");
+      } catch {
+        // Ignore malformed events; the next change will overwrite state.
+      }
+    });
+
+    source.onerror = () => {
+      setGesture("");
+      setConfidence(null);
+      setError("Gesture API unreachable");
+    };
 
     return () => {
-      mounted = false;
-      clearInterval(id);
+      source.close();
     };
   }, []);
 
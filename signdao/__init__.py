@@ -0,0 +1 @@
+"""Shared landmark processing used by the live recognizer, backend and WLASL tools."""
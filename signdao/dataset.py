@@ -0,0 +1,233 @@
+"""
+Versioned, pickle-free binary format for landmark datasets and models.
+
+Layout (little-endian)::
+
+    b"SDDS"            magic
+    uint32             header length H
+    H bytes            UTF-8 JSON header
+    zero padding       up to the next 64-byte boundary (start of data)
+    features           (count, dim) array of ``dtype``: float32, float16 or int8
+    codes              (count,) uint8/uint16 indexes into the label vocabulary
+    scale              (dim,) float32 per-feature scale, int8 files only
+
+The header records the format version, the kind ("dataset" or "model"), the
+count, dim and dtypes, the label vocabulary, the feature spec and its hash,
+each section's offset from the start of the data, and a free-form ``extra``
+dict (e.g. ``n_neighbors``, ``video_ids``). Every section starts on a 64-byte
+boundary, so ``load_dataset`` maps the file once and returns zero-copy views.
+Nothing is unpickled, and loading costs a header parse plus one ``mmap``.
+
+float16 halves the feature bytes, with rounding error far below landmark
+jitter. int8 (symmetric, per-feature scale) quarters them, with error about
+the size of that jitter, which suits archived datasets better than models.
+The KNN index needs float32, so ``float_features`` converts those on load.
+
+``python -m signdao.dataset convert old.npz new.sdds --dtype float16``
+migrates files written by older ``np.savez``-based scripts, and
+``python -m signdao.dataset info file.sdds`` prints a header.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import struct
+from dataclasses import dataclass, field
+from typing import Final, Optional, Sequence
+
+import numpy as np
+
+from signdao.features import FEATURE_DIM
+
+MAGIC: Final[bytes] = b"SDDS"
+FORMAT_VERSION: Final[int] = 1
+DTYPES: Final[tuple[str, ...]] = ("float32", "float16", "int8")
+_ALIGN: Final[int] = 64
+_PREFIX = struct.Struct("<4sI")
+
+
+class DatasetFormatError(ValueError):
+    """The file is not a readable dataset of this format version."""
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // _ALIGN) * _ALIGN
+
+
+def quantize_int8(X: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Symmetric per-feature int8 quantization; returns ``(codes, scale)`` with ``X ~= codes * scale``."""
+    scale = (np.abs(X).max(axis=0) / 127.0).astype(np.float32) if len(X) else np.ones(X.shape[1], np.float32)
+    scale[scale == 0] = 1.0
+    return np.clip(np.rint(X / scale), -127, 127).astype(np.int8), scale
+
+
+@dataclass(frozen=True)
+class LandmarkDataset:
+    features: np.ndarray  # (count, dim) in the stored dtype; a view into the file when memory-mapped
+    codes: np.ndarray  # (count,) label codes
+    labels: tuple[str, ...]
+    kind: str = "dataset"
+    spec_hash: str = ""
+    scale: Optional[np.ndarray] = None
+    extra: dict = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    @property
+    def y(self) -> np.ndarray:
+        """Labels as a string array."""
+        return np.asarray(self.labels, dtype=str)[self.codes]
+
+    def float_features(self) -> np.ndarray:
+        """float32 features; zero-copy for float32 files."""
+        if self.scale is not None:
+            return self.features.astype(np.float32) * self.scale
+        return self.features if self.features.dtype == np.float32 else self.features.astype(np.float32)
+
+
+def save_dataset(
+    path: str,
+    X: np.ndarray,
+    y: Sequence[str],
+    dtype: str = "float32",
+    kind: str = "dataset",
+    labels: Optional[Sequence[str]] = None,
+    extra: Optional[dict] = None,
+) -> LandmarkDataset:
+    """Encode labels, optionally quantize, and atomically write ``path``."""
+    from signdao.model import FEATURE_SPEC, feature_spec_hash  # signdao.model imports this module
+
+    if dtype not in DTYPES:
+        raise ValueError(f"Unsupported feature dtype {dtype!r}; expected one of {DTYPES}")
+    X = np.asarray(X, dtype=np.float32)
+    if X.size == 0:
+        X = X.reshape(0, FEATURE_DIM)
+    if X.ndim != 2:
+        raise ValueError(f"Expected an (N, D) feature matrix, got {X.shape}")
+    y = np.asarray(y).astype(str)
+    if len(y) != len(X):
+        raise ValueError(f"{len(X)} feature rows but {len(y)} labels")
+    vocabulary = list(labels) if labels is not None else [str(v) for v in np.unique(y)]
+    index = {label: code for code, label in enumerate(vocabulary)}
+    missing = sorted(set(y) - set(index))
+    if missing:
+        raise ValueError(f"Labels {missing} are not in the vocabulary {vocabulary}")
+    code_dtype = np.uint8 if len(vocabulary) <= 255 else np.uint16
+    codes = np.fromiter((index[label] for label in y), dtype=code_dtype, count=len(y))
+
+    scale = None
+    if dtype == "int8":
+        features, scale = quantize_int8(X)
+    else:
+        features = np.ascontiguousarray(X, dtype=dtype)
+
+    sections = {"features": [0, features.nbytes]}
+    sections["codes"] = [_aligned(features.nbytes), codes.nbytes]
+    if scale is not None:
+        sections["scale"] = [_aligned(sum(sections["codes"])), scale.nbytes]
+    header = {
+        "version": FORMAT_VERSION,
+        "kind": kind,
+        "count": int(len(X)),
+        "dim": int(X.shape[1]),
+        "dtype": dtype,
+        "code_dtype": np.dtype(code_dtype).name,
+        "labels": vocabulary,
+        "feature_spec": FEATURE_SPEC,
+        "spec_hash": feature_spec_hash(),
+        "sections": sections,
+        "extra": extra or {},
+    }
+    header_bytes = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    data_start = _aligned(_PREFIX.size + len(header_bytes))
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_PREFIX.pack(MAGIC, len(header_bytes)))
+        f.write(header_bytes)
+        for name, array in (("features", features), ("codes", codes), ("scale", scale)):
+            if array is None:
+                continue
+            f.write(b"\0" * (data_start + sections[name][0] - f.tell()))
+            f.write(array.tobytes())
+    os.replace(tmp_path, path)
+    return LandmarkDataset(features, codes, tuple(vocabulary), kind, header["spec_hash"], scale, header["extra"])
+
+
+def read_header(path: str) -> tuple[dict, int]:
+    """Return ``(header, data_start)`` without touching the data."""
+    with open(path, "rb") as f:
+        prefix = f.read(_PREFIX.size)
+        if len(prefix) != _PREFIX.size or prefix[:4] != MAGIC:
+            raise DatasetFormatError(f"{path} is not a SignDAO landmark file")
+        _, header_len = _PREFIX.unpack(prefix)
+        header = json.loads(f.read(header_len).decode("utf-8"))
+    if header.get("version") != FORMAT_VERSION:
+        raise DatasetFormatError(f"{path} has format version {header.get('version')}, expected {FORMAT_VERSION}")
+    return header, _aligned(_PREFIX.size + header_len)
+
+
+def load_dataset(path: str, mmap: bool = True) -> LandmarkDataset:
+    """Open a file written by ``save_dataset``; arrays are read-only views into it."""
+    header, data_start = read_header(path)
+    count, dim = int(header["count"]), int(header["dim"])
+    sections = header["sections"]
+    if mmap and count:
+        buffer = np.memmap(path, dtype=np.uint8, mode="r")
+    else:
+        with open(path, "rb") as f:
+            buffer = np.frombuffer(f.read(), dtype=np.uint8)
+
+    def section(name: str, dtype: str, shape: tuple[int, ...]) -> np.ndarray:
+        offset, nbytes = sections[name]
+        expected = int(np.prod(shape)) * np.dtype(dtype).itemsize
+        if nbytes != expected or data_start + offset + nbytes > len(buffer):
+            raise DatasetFormatError(f"{path}: {name} section is truncated or inconsistent")
+        return np.ndarray(shape, dtype=np.dtype(dtype).newbyteorder("<"), buffer=buffer, offset=data_start + offset)
+
+    features = section("features", header["dtype"], (count, dim))
+    codes = section("codes", header["code_dtype"], (count,))
+    scale = section("scale", "float32", (dim,)) if "scale" in sections else None
+    return LandmarkDataset(
+        features, codes, tuple(header["labels"]), header["kind"], header["spec_hash"], scale, header.get("extra", {})
+    )
+
+
+def load_legacy_npz(path: str) -> tuple[np.ndarray, np.ndarray]:
+    """``(X, y)`` from an old ``np.savez`` file. These used object label arrays, so this unpickles; migration only."""
+    with np.load(path, allow_pickle=True) as data:
+        return np.asarray(data["X"], dtype=np.float32), np.asarray(data["y"]).astype(str)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Inspect or convert SignDAO landmark files.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    info = commands.add_parser("info", help="Print a file's header.")
+    info.add_argument("path")
+    convert = commands.add_parser("convert", help="Convert an old np.savez file (or another .sdds file).")
+    convert.add_argument("source")
+    convert.add_argument("destination")
+    convert.add_argument("--dtype", choices=DTYPES, default="float16")
+    args = parser.parse_args(argv)
+
+    if args.command == "info":
+        header, _ = read_header(args.path)
+        print(json.dumps({key: value for key, value in header.items() if key != "extra"}, indent=2))
+        return
+    try:
+        source = load_dataset(args.source)
+        X, y, extra = source.float_features(), source.y, source.extra
+    except DatasetFormatError:
+        X, y = load_legacy_npz(args.source)
+        extra = {}
+    save_dataset(args.destination, X, y, dtype=args.dtype, extra=extra)
+    before, after = os.path.getsize(args.source), os.path.getsize(args.destination)
+    print(f"[INFO] Wrote {len(y)} samples to {args.destination} ({before} -> {after} bytes)")
+
+
+if __name__ == "__main__":
+    main()
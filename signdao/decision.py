@@ -0,0 +1,189 @@
+"""
+Streaming YES/NO decision engine shared by the live CLI and the backend.
+
+Per-frame labels go into a fixed-size window. The window keeps running
+per-label counts and confidence sums, so finding the dominant label and its
+mean confidence is O(1) per update, whatever the window size.
+
+A vote is committed when the dominant label reaches ``enter_share`` of the
+window and has at least ``min_votes`` frames in it; the share alone is
+computed over the frames seen so far, so without the floor one frame in an
+empty window would commit. The engine then holds that label until its share
+drops below ``exit_share``, so a single stray frame cannot cause a
+NO -> YES -> NO flap. An ``UNKNOWN`` frame or a lost hand clears the window
+and releases the held vote. Every commit of a label, new or repeated, waits
+out that label's ``cooldown`` since its last commit, so releasing and
+re-entering a vote cannot fire faster than a held one repeats.
+
+The engine has no side effects. Callers act on ``DecisionUpdate.decision``,
+and ``replay`` runs the engine headless over a recorded ``(t, label,
+confidence)`` stream.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Final, Iterable, Mapping, Optional
+
+VOTE_LABELS: Final[tuple[str, ...]] = ("YES", "NO")
+DEFAULT_WINDOW: Final[int] = 9
+DEFAULT_ENTER_SHARE: Final[float] = 0.6
+DEFAULT_EXIT_SHARE: Final[float] = 0.4
+DEFAULT_MIN_VOTES: Final[int] = 3
+DEFAULT_COOLDOWNS: Final[Mapping[str, float]] = {"YES": 1.5, "NO": 1.5}
+
+_YES_SET: Final[frozenset[str]] = frozenset({"YES", "THUMB_UP", "THUMBS_UP", "UP", "APPROVE", "LIKE"})
+_NO_SET: Final[frozenset[str]] = frozenset(
+    {"NO", "OPEN_HAND", "PALM", "STOP", "DISLIKE", "DOWN", "THUMB_DOWN", "THUMBS_DOWN"}
+)
+_CLEAR_SET: Final[frozenset[str]] = frozenset({"", "NONE", "UNKNOWN", "N/A"})
+
+
+def canonicalize_label(label) -> str:
+    """
+    Map model/heuristic labels to canonical 'YES'/'NO'/'NONE'.
+    Handles casing/whitespace and common synonyms like 'THUMB_UP', 'OPEN_HAND'.
+    """
+    if label is None:
+        return "NONE"
+    s = str(label).strip().upper()
+    if s in _CLEAR_SET:
+        return "NONE"
+    if s in _YES_SET:
+        return "YES"
+    if s in _NO_SET:
+        return "NO"
+
+    # Labels like "YES (0.91)" carry a trailing confidence.
+    if "YES" in s:
+        return "YES"
+    if "NO" in s:
+        return "NO"
+    return "NONE"
+
+
+@dataclass(frozen=True)
+class Decision:
+    label: str
+    confidence: float
+    at: float
+    latency: float  # seconds from the first frame of this label's run to the commit; 0 for repeats
+    repeat: bool
+
+
+@dataclass(frozen=True)
+class DecisionUpdate:
+    label: str  # dominant canonical label in the window, "NONE" when empty
+    confidence: float  # mean confidence of that label in the window
+    held: str  # currently committed vote, "NONE" if none
+    decision: Optional[Decision]  # set on the update that commits a vote
+
+
+class DecisionEngine:
+    def __init__(
+        self,
+        window: int = DEFAULT_WINDOW,
+        enter_share: float = DEFAULT_ENTER_SHARE,
+        exit_share: float = DEFAULT_EXIT_SHARE,
+        cooldowns: Mapping[str, float] = DEFAULT_COOLDOWNS,
+        clock: Callable[[], float] = time.monotonic,
+        min_votes: int = DEFAULT_MIN_VOTES,
+    ) -> None:
+        if not 0.0 <= exit_share <= enter_share <= 1.0:
+            raise ValueError("Expected 0 <= exit_share <= enter_share <= 1")
+        self.window = window
+        self.min_votes = max(1, min(min_votes, window))
+        self.enter_share = enter_share
+        self.exit_share = exit_share
+        self.cooldowns = dict(cooldowns)
+        self._clock = clock
+        self._samples: deque[tuple[str, float]] = deque()
+        self._counts = {label: 0 for label in VOTE_LABELS}
+        self._conf_sums = {label: 0.0 for label in VOTE_LABELS}
+        self._onset: dict[str, float] = {}
+        self._last_at = {label: float("-inf") for label in VOTE_LABELS}
+        self._latest = "NONE"
+        self.held = "NONE"
+        self.decisions = 0
+
+    def _clear(self) -> None:
+        self._samples.clear()
+        for label in VOTE_LABELS:
+            self._counts[label] = 0
+            self._conf_sums[label] = 0.0
+        self._onset.clear()
+        self._latest = "NONE"
+        self.held = "NONE"
+
+    def reset(self) -> DecisionUpdate:
+        """The hand was lost: drop the window and release any held vote."""
+        self._clear()
+        return DecisionUpdate("NONE", 0.0, "NONE", None)
+
+    def _push(self, label: str, confidence: float, now: float) -> None:
+        if len(self._samples) >= self.window:
+            old_label, old_conf = self._samples.popleft()
+            self._counts[old_label] -= 1
+            self._conf_sums[old_label] -= old_conf
+            if self._counts[old_label] == 0:
+                self._conf_sums[old_label] = 0.0
+                self._onset.pop(old_label, None)
+        self._samples.append((label, confidence))
+        self._counts[label] += 1
+        self._conf_sums[label] += confidence
+        self._onset.setdefault(label, now)
+        self._latest = label
+
+    def _dominant(self) -> str:
+        best = max(self._counts.values())
+        tied = [label for label in VOTE_LABELS if self._counts[label] == best]
+        if len(tied) == 1:
+            return tied[0]
+        return self.held if self.held in tied else self._latest
+
+    def update(self, label, confidence: float, now: Optional[float] = None) -> DecisionUpdate:
+        """Add one frame's label; returns the smoothed label and any committed vote."""
+        now = self._clock() if now is None else now
+        canonical = canonicalize_label(label)
+        if canonical == "NONE":
+            return self.reset()
+        self._push(canonical, float(confidence), now)
+
+        dominant = self._dominant()
+        count = self._counts[dominant]
+        mean_conf = self._conf_sums[dominant] / count
+        total = len(self._samples)
+
+        if self.held != "NONE" and self.held != dominant and self._counts[self.held] / total < self.exit_share:
+            self.held = "NONE"
+
+        decision = None
+        cooled = now - self._last_at[dominant] > self.cooldowns.get(dominant, 0.0)
+        if (
+            self.held == "NONE"
+            and count >= self.min_votes
+            and count / total >= self.enter_share
+            and cooled
+        ):
+            decision = Decision(dominant, mean_conf, now, now - self._onset.get(dominant, now), False)
+            self.held = dominant
+        elif dominant == self.held and cooled:
+            decision = Decision(dominant, mean_conf, now, 0.0, True)
+
+        if decision is not None:
+            self._last_at[decision.label] = now
+            self.decisions += 1
+        return DecisionUpdate(dominant, mean_conf, self.held, decision)
+
+
+def replay(samples: Iterable[tuple[float, object, float]], engine: Optional[DecisionEngine] = None) -> list[Decision]:
+    """Run ``(t, label, confidence)`` samples through an engine; a None label means no hand."""
+    engine = engine or DecisionEngine()
+    decisions = []
+    for t, label, confidence in samples:
+        update = engine.reset() if label is None else engine.update(label, confidence, now=t)
+        if update.decision is not None:
+            decisions.append(update.decision)
+    return decisions
@@ -0,0 +1,119 @@
+"""
+Adaptive low-light enhancement that produces the RGB inference frame directly.
+
+The old path converted BGR -> LAB -> BGR -> RGB on every frame and built a new
+CLAHE object each time. ``LowLightEnhancer`` keeps one CLAHE object and
+reuses its output buffers. It estimates scene luminance from a sparse pixel
+grid and only runs CLAHE when the scene is dim. When a hand was seen on the
+previous frame, CLAHE is limited to a padded box around it. In a bright scene
+the whole stage is a single BGR -> RGB conversion into a reused buffer.
+
+The returned RGB array is overwritten by the next ``process`` call, so callers
+must finish with it (e.g. ``hands.process``) before processing another frame.
+``display_frame`` pastes the enhanced region back into a BGR copy of the
+camera frame for the preview window; bright frames are shown as captured.
+"""
+
+from __future__ import annotations
+
+from typing import Final, Optional
+
+import cv2
+import numpy as np
+
+# Rec. 601 luma weights in BGR order.
+_LUMA_BGR: Final[np.ndarray] = np.array([0.114, 0.587, 0.299], dtype=np.float32)
+_LUMA_SAMPLE_STEP: Final[int] = 16
+DIM_ENTER_LUMA: Final[float] = 70.0
+DIM_EXIT_LUMA: Final[float] = 90.0
+ROI_PADDING: Final[float] = 0.35
+_MIN_ROI_PX: Final[int] = 32
+
+
+def scene_luminance(frame: np.ndarray, step: int = _LUMA_SAMPLE_STEP) -> float:
+    """Mean luma (0-255) of a sparse ``step`` x ``step`` pixel grid."""
+    grid = frame[::step, ::step].reshape(-1, 3)
+    return float(grid.mean(axis=0, dtype=np.float32) @ _LUMA_BGR)
+
+
+def hand_box(landmarks: np.ndarray, width: int, height: int, padding: float = ROI_PADDING) -> Optional[tuple[int, int, int, int]]:
+    """Padded pixel box ``(x0, y0, x1, y1)`` around normalized landmarks, or None if degenerate."""
+    xs = landmarks[:, 0] * width
+    ys = landmarks[:, 1] * height
+    x0, x1 = float(xs.min()), float(xs.max())
+    y0, y1 = float(ys.min()), float(ys.max())
+    pad = padding * max(x1 - x0, y1 - y0)
+    box = (
+        max(0, int(x0 - pad)),
+        max(0, int(y0 - pad)),
+        min(width, int(x1 + pad) + 1),
+        min(height, int(y1 + pad) + 1),
+    )
+    if box[2] - box[0] < _MIN_ROI_PX or box[3] - box[1] < _MIN_ROI_PX:
+        return None
+    return box
+
+
+class LowLightEnhancer:
+    def __init__(self, clip_limit: float = 3.0, tile_grid: tuple[int, int] = (8, 8)) -> None:
+        self._clahe = cv2.createCLAHE(clipLimit=clip_limit, tileGridSize=tile_grid)
+        self._rgb: Optional[np.ndarray] = None
+        self._lab: Optional[np.ndarray] = None
+        self._l_channel: Optional[np.ndarray] = None
+        self._roi: Optional[tuple[int, int, int, int]] = None
+        self._enhanced_box: Optional[tuple[int, int, int, int]] = None
+        self.dim = False
+        self.last_luma = 0.0
+        self.frames = 0
+        self.enhanced_frames = 0
+
+    def set_hand(self, landmarks: Optional[np.ndarray], width: int, height: int) -> None:
+        """Limit the next frame's CLAHE to the area around ``landmarks`` (None = full frame)."""
+        self._roi = None if landmarks is None else hand_box(landmarks, width, height)
+
+    def _buffers(self, shape: tuple[int, ...]) -> None:
+        if self._rgb is None or self._rgb.shape != shape:
+            self._rgb = np.empty(shape, dtype=np.uint8)
+
+    def _region_buffers(self, height: int, width: int) -> tuple[np.ndarray, np.ndarray]:
+        if self._lab is None or self._lab.shape[0] < height or self._lab.shape[1] < width:
+            self._lab = np.empty((height, width, 3), dtype=np.uint8)
+            self._l_channel = np.empty((height, width), dtype=np.uint8)
+        return self._lab[:height, :width], self._l_channel[:height, :width]
+
+    def _apply_clahe(self, frame: np.ndarray, box: tuple[int, int, int, int]) -> None:
+        x0, y0, x1, y1 = box
+        lab, l_channel = self._region_buffers(y1 - y0, x1 - x0)
+        cv2.cvtColor(frame[y0:y1, x0:x1], cv2.COLOR_BGR2LAB, dst=lab)
+        cv2.extractChannel(lab, 0, dst=l_channel)
+        self._clahe.apply(l_channel, dst=l_channel)
+        cv2.insertChannel(l_channel, lab, 0)
+        cv2.cvtColor(lab, cv2.COLOR_LAB2RGB, dst=self._rgb[y0:y1, x0:x1])
+
+    def process(self, frame: np.ndarray) -> np.ndarray:
+        """Return the RGB frame for inference, enhanced if the scene is dim."""
+        self.frames += 1
+        self._buffers(frame.shape)
+        self.last_luma = scene_luminance(frame)
+        threshold = DIM_EXIT_LUMA if self.dim else DIM_ENTER_LUMA
+        self.dim = self.last_luma < threshold
+
+        height, width = frame.shape[:2]
+        box = self._roi if self.dim else None
+        if not self.dim or box is not None:
+            cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=self._rgb)
+        self._enhanced_box = None
+        if self.dim:
+            self._enhanced_box = box or (0, 0, width, height)
+            self._apply_clahe(frame, self._enhanced_box)
+            self.enhanced_frames += 1
+        return self._rgb
+
+    def display_frame(self, frame: np.ndarray) -> np.ndarray:
+        """BGR ``frame`` with the last ``process`` call's enhanced region pasted in; ``frame`` itself if none."""
+        if self._enhanced_box is None or self._rgb is None or self._rgb.shape != frame.shape:
+            return frame
+        x0, y0, x1, y1 = self._enhanced_box
+        display = frame.copy()
+        cv2.cvtColor(self._rgb[y0:y1, x0:x1], cv2.COLOR_RGB2BGR, dst=display[y0:y1, x0:x1])
+        return display
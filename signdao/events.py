@@ -0,0 +1,209 @@
+"""
+Buffered, rate-limited structured event output for the live loop.
+
+``EventSink.emit`` only does the rate limiting and decimation checks and
+appends to a bounded ring buffer. JSON encoding, writes and flushes all
+happen on a background writer thread, one flush per batch. If the writer
+falls behind, the oldest buffered events are overwritten and counted in
+``dropped``, so logging can never block a frame.
+
+Two output formats:
+
+``ndjson``
+    One ``{"<type>": payload}`` object per line. Types listed in
+    ``bare_types`` are written as the bare payload. NumPy arrays become lists.
+
+``binary``
+    ``MAGIC`` followed by records, each with the header ``<HBdI``: type id,
+    kind, unix time, payload bytes. A kind-0 record declares a type name the
+    first time the type is used. Kind 1 carries compact JSON and kind 2 a
+    raw little-endian float32 array. ``read_events`` decodes a file. Binary
+    output needs a file path: stdout also carries the recognizer's
+    diagnostics, which would corrupt the records.
+"""
+
+from __future__ import annotations
+
+import json
+import struct
+import sys
+import threading
+import time
+from collections import deque
+from typing import IO, Any, Final, Iterator, Mapping, Optional
+
+import numpy as np
+
+FORMATS: Final[tuple[str, ...]] = ("ndjson", "binary")
+MAGIC: Final[bytes] = b"SDEV\x01"
+DEFAULT_CAPACITY: Final[int] = 4096
+
+_RECORD: Final[struct.Struct] = struct.Struct("<HBdI")
+_KIND_DECLARE: Final[int] = 0
+_KIND_JSON: Final[int] = 1
+_KIND_F32: Final[int] = 2
+
+
+def _to_json(value: Any) -> Any:
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+class EventSink:
+    def __init__(
+        self,
+        path: str = "-",
+        fmt: str = "ndjson",
+        capacity: int = DEFAULT_CAPACITY,
+        rate_limits: Optional[Mapping[str, float]] = None,
+        decimate: Optional[Mapping[str, int]] = None,
+        bare_types: tuple[str, ...] = (),
+    ) -> None:
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown event format {fmt!r}; expected one of {FORMATS}")
+        if fmt == "binary" and path == "-":
+            raise ValueError("Binary events need a file path; stdout is shared with log output")
+        self.fmt = fmt
+        self.bare_types = frozenset(bare_types)
+        self._min_interval = {name: 1.0 / hz for name, hz in (rate_limits or {}).items() if hz > 0}
+        self._every = {name: n for name, n in (decimate or {}).items() if n > 1}
+        self._last_at: dict[str, float] = {}
+        self._seen: dict[str, int] = {}
+        self._type_ids: dict[str, int] = {}
+
+        self._owns_stream = path != "-"
+        if fmt == "binary":
+            self._stream: IO = open(path, "ab")
+            if self._stream.tell() == 0:
+                self._stream.write(MAGIC)
+        else:
+            self._stream = open(path, "a", encoding="utf-8") if self._owns_stream else sys.stdout
+
+        self._buffer: deque[tuple[str, float, Any]] = deque(maxlen=capacity)
+        self._cond = threading.Condition()
+        self._closed = False
+        self.emitted = 0
+        self.written = 0
+        self.dropped = 0
+        self.rate_limited = 0
+        self.decimated = 0
+        self._thread = threading.Thread(target=self._run, name="event-writer", daemon=True)
+        self._thread.start()
+
+    def emit(self, event_type: str, payload: Any) -> bool:
+        """Queue one event; returns False if it was decimated, rate limited or the sink is closed."""
+        every = self._every.get(event_type)
+        if every is not None:
+            seen = self._seen.get(event_type, 0)
+            self._seen[event_type] = seen + 1
+            if seen % every:
+                self.decimated += 1
+                return False
+
+        now = time.time()
+        interval = self._min_interval.get(event_type)
+        if interval is not None:
+            if now - self._last_at.get(event_type, float("-inf")) < interval:
+                self.rate_limited += 1
+                return False
+            self._last_at[event_type] = now
+
+        with self._cond:
+            if self._closed:
+                return False
+            if len(self._buffer) == self._buffer.maxlen:
+                self.dropped += 1
+            self._buffer.append((event_type, now, payload))
+            self.emitted += 1
+            self._cond.notify()
+        return True
+
+    def stats(self) -> dict:
+        return {
+            "emitted": self.emitted,
+            "written": self.written,
+            "dropped": self.dropped,
+            "rate_limited": self.rate_limited,
+            "decimated": self.decimated,
+        }
+
+    def close(self, timeout: float = 2.0) -> None:
+        """Write out everything still buffered and stop the writer."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join(timeout)
+        if self._owns_stream:
+            self._stream.close()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._buffer or self._closed)
+                batch = list(self._buffer)
+                self._buffer.clear()
+                done = self._closed
+            if batch:
+                try:
+                    self._write(batch)
+                except Exception as exc:
+                    print(f"[WARN] Event sink write failed: {exc}", file=sys.stderr)
+            if done:
+                return
+
+    def _write(self, batch: list[tuple[str, float, Any]]) -> None:
+        if self.fmt == "binary":
+            chunks = []
+            for event_type, at, payload in batch:
+                chunks.extend(self._encode_binary(event_type, at, payload))
+            self._stream.write(b"".join(chunks))
+        else:
+            lines = []
+            for event_type, _, payload in batch:
+                record = payload if event_type in self.bare_types else {event_type: payload}
+                lines.append(json.dumps(record, default=_to_json))
+            self._stream.write("\n".join(lines) + "\n")
+        self._stream.flush()
+        self.written += len(batch)
+
+    def _encode_binary(self, event_type: str, at: float, payload: Any) -> list[bytes]:
+        chunks = []
+        type_id = self._type_ids.get(event_type)
+        if type_id is None:
+            type_id = self._type_ids[event_type] = len(self._type_ids) + 1
+            name = event_type.encode("utf-8")
+            chunks += [_RECORD.pack(type_id, _KIND_DECLARE, at, len(name)), name]
+        if isinstance(payload, np.ndarray):
+            body = np.ascontiguousarray(payload, dtype="<f4").tobytes()
+            kind = _KIND_F32
+        else:
+            body = json.dumps(payload, separators=(",", ":"), default=_to_json).encode("utf-8")
+            kind = _KIND_JSON
+        chunks += [_RECORD.pack(type_id, kind, at, len(body)), body]
+        return chunks
+
+
+def read_events(path: str) -> Iterator[tuple[str, float, Any]]:
+    """Decode a binary event file into ``(type, unix_time, payload)`` tuples."""
+    with open(path, "rb") as f:
+        data = f.read()
+    if not data.startswith(MAGIC):
+        raise ValueError(f"{path} is not a binary event file")
+    names: dict[int, str] = {}
+    offset = len(MAGIC)
+    while offset + _RECORD.size <= len(data):
+        type_id, kind, at, size = _RECORD.unpack_from(data, offset)
+        offset += _RECORD.size
+        body = data[offset : offset + size]
+        offset += size
+        if len(body) < size:
+            break  # torn trailing record
+        if kind == _KIND_DECLARE:
+            names[type_id] = body.decode("utf-8")
+        elif kind == _KIND_F32:
+            yield names[type_id], at, np.frombuffer(body, dtype="<f4")
+        else:
+            yield names[type_id], at, json.loads(body)
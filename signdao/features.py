@@ -0,0 +1,156 @@
+"""
+Vectorized landmark normalization and YES/NO rule scoring.
+
+Every function takes a batch of hands shaped (N, 21, 3) and does its work in a
+fixed number of array operations, so scoring one hand or ten thousand costs
+the same number of NumPy calls.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Final, Optional, Sequence
+
+import numpy as np
+
+NUM_LANDMARKS: Final[int] = 21
+FEATURE_DIM: Final[int] = NUM_LANDMARKS * 2
+UNKNOWN_FLOOR: Final[float] = 0.55
+LABELS: Final[tuple[str, str]] = ("YES", "NO")
+
+_WRIST = 0
+_MIDDLE_MCP = 9
+_THUMB_TIP = 4
+_INDEX_TIP = 8
+_MIDDLE_TIP = 12
+_INDEX_MCP = 5
+_PINKY_MCP = 17
+
+# Each curl is the sum of two joint angles. Row k describes angle k as the
+# angle between (v1_end - v1_start) and (v2_end - v2_start). Rows 2d and 2d+1
+# belong to digit d in the order thumb, index, middle, ring, pinky.
+_ANGLE_PAIRS: Final[np.ndarray] = np.array(
+    [
+        # thumb: (ip - mcp, tip - ip), (mcp - wrist, tip - mcp)
+        (2, 3, 3, 4),
+        (0, 2, 2, 4),
+        # fingers: (pip - mcp, dip - pip), (dip - pip, tip - dip)
+        (5, 6, 6, 7),
+        (6, 7, 7, 8),
+        (9, 10, 10, 11),
+        (10, 11, 11, 12),
+        (13, 14, 14, 15),
+        (14, 15, 15, 16),
+        (17, 18, 18, 19),
+        (18, 19, 19, 20),
+    ],
+    dtype=np.intp,
+)
+CURL_NAMES: Final[tuple[str, ...]] = ("thumb", "index", "middle", "ring", "pinky")
+
+
+def _as_batch(landmarks: np.ndarray) -> np.ndarray:
+    batch = np.asarray(landmarks, dtype=np.float32)
+    if batch.ndim == 2:
+        batch = batch[np.newaxis]
+    if batch.ndim != 3 or batch.shape[1:] != (NUM_LANDMARKS, 3):
+        raise ValueError(f"Expected landmarks shaped (N, 21, 3), got {batch.shape}")
+    return batch
+
+
+def left_hand_mask(handedness: Sequence[Optional[str]]) -> np.ndarray:
+    """Map MediaPipe handedness labels to the boolean mask used for mirroring."""
+    return np.fromiter((h == "Left" for h in handedness), dtype=bool, count=len(handedness))
+
+
+def normalize_landmarks_batch(landmarks: np.ndarray, left_mask: Optional[np.ndarray] = None) -> np.ndarray:
+    """Translate each wrist to the origin, mirror left hands and scale by palm size.
+
+    ``landmarks`` is (N, 21, 3); ``left_mask`` is an optional (N,) boolean array.
+    Returns a new float32 array of the same shape.
+    """
+    batch = _as_batch(landmarks)
+    wrist = batch[:, _WRIST : _WRIST + 1, :]
+    translated = batch - wrist
+    scale = np.linalg.norm(batch[:, _MIDDLE_MCP, :] - batch[:, _WRIST, :], axis=1)
+    scale[scale < 1e-6] = 1.0
+    if left_mask is not None:
+        translated[np.asarray(left_mask, dtype=bool), :, 0] *= -1
+    translated /= scale[:, np.newaxis, np.newaxis]
+    return translated
+
+
+def normalize_landmarks(landmarks: np.ndarray, handedness: str | None = None) -> np.ndarray:
+    """Single-hand convenience wrapper returning a (21, 3) array."""
+    return normalize_landmarks_batch(landmarks, np.array([handedness == "Left"]))[0]
+
+
+def feature_vectors(normalized: np.ndarray) -> np.ndarray:
+    """Flatten normalized (N, 21, 3) hands into contiguous (N, 42) float32 x/y features."""
+    batch = _as_batch(normalized)
+    return np.ascontiguousarray(batch[:, :, :2].reshape(len(batch), FEATURE_DIM), dtype=np.float32)
+
+
+def landmark_feature(coords: np.ndarray, handedness: str | None = None) -> np.ndarray:
+    """Normalize one raw hand and return its 42-dim classifier feature."""
+    return feature_vectors(normalize_landmarks(coords, handedness)[np.newaxis])[0]
+
+
+@dataclass(frozen=True)
+class YesNoScores:
+    """Per-hand outputs of ``score_yes_no_batch``; every field has leading dim N."""
+
+    curls: np.ndarray  # (N, 5) in CURL_NAMES order
+    index_thumb_dist: np.ndarray  # (N,)
+    middle_thumb_dist: np.ndarray  # (N,)
+    yes_score: np.ndarray  # (N,)
+    no_score: np.ndarray  # (N,)
+    labels: np.ndarray  # (N,) of "YES" / "NO" / "UNKNOWN"
+    confidence: np.ndarray  # (N,)
+
+
+def curls_batch(normalized: np.ndarray) -> np.ndarray:
+    """Return (N, 5) curl values in [0, 1] for thumb, index, middle, ring, pinky."""
+    batch = np.asarray(normalized, dtype=np.float64)
+    v1 = batch[:, _ANGLE_PAIRS[:, 1]] - batch[:, _ANGLE_PAIRS[:, 0]]
+    v2 = batch[:, _ANGLE_PAIRS[:, 3]] - batch[:, _ANGLE_PAIRS[:, 2]]
+    denom = np.linalg.norm(v1, axis=2) * np.linalg.norm(v2, axis=2)
+    dots = np.einsum("nkc,nkc->nk", v1, v2)
+    degenerate = denom < 1e-6
+    cosine = np.clip(dots / np.where(degenerate, 1.0, denom), -1.0, 1.0)
+    angles = np.where(degenerate, 0.0, np.arccos(cosine))
+    curls = angles.reshape(len(batch), len(CURL_NAMES), 2).sum(axis=2) / np.pi
+    return np.clip(curls, 0.0, 1.0)
+
+
+def score_yes_no_batch(normalized: np.ndarray, unknown_floor: float = UNKNOWN_FLOOR) -> YesNoScores:
+    """Rule-based YES (thumbs up) / NO (open palm) scoring for a batch of normalized hands."""
+    batch = _as_batch(normalized).astype(np.float64)
+    curls = curls_batch(batch)
+    finger_curls = curls[:, 1:]
+
+    palm_span = np.linalg.norm(batch[:, _INDEX_MCP] - batch[:, _PINKY_MCP], axis=1)
+    palm_span[palm_span <= 1e-6] = 1.0
+    thumb_tip = batch[:, _THUMB_TIP]
+    index_thumb_dist = np.linalg.norm(thumb_tip - batch[:, _INDEX_TIP], axis=1) / palm_span
+    middle_thumb_dist = np.linalg.norm(thumb_tip - batch[:, _MIDDLE_TIP], axis=1) / palm_span
+
+    yes_score = np.clip(finger_curls.mean(axis=1), 0.0, 1.0)
+    no_sum = (1.0 - finger_curls).sum(axis=1) + np.clip(index_thumb_dist, 0.0, 1.0) + np.clip(middle_thumb_dist, 0.0, 1.0)
+    no_score = np.clip(no_sum / 6.0, 0.0, 1.0)
+
+    # Ties go to YES, matching max() over an insertion-ordered dict.
+    is_yes = yes_score >= no_score
+    confidence = np.where(is_yes, yes_score, no_score)
+    labels = np.where(is_yes, "YES", "NO").astype("<U7")
+    labels[confidence < unknown_floor] = "UNKNOWN"
+
+    return YesNoScores(
+        curls=curls,
+        index_thumb_dist=index_thumb_dist,
+        middle_thumb_dist=middle_thumb_dist,
+        yes_score=yes_score,
+        no_score=no_score,
+        labels=labels,
+        confidence=confidence,
+    )
@@ -0,0 +1,164 @@
+"""
+Compact, deterministic gesture fingerprints for ``GestureNFT.mintNFT``.
+
+Raw per-frame landmarks are large and jitter from frame to frame, so the
+same vote never produces the same bytes twice. Instead, each hand keeps a
+short ``FingerprintWindow`` of its normalized (wrist-centred, palm-scaled,
+left hands mirrored) x/y features. When a vote is committed, the frames in
+the window that carried the voted label are reduced to their per-feature
+median, quantized to a ``QUANT_STEP`` grid and hashed together with the
+label::
+
+    fingerprint = blake2b(version | label | int8 grid codes, 16 bytes).hex()
+
+The median ignores a stray frame or two, and the grid absorbs the jitter
+that is left, so holding the same pose yields the same 32-character digest.
+A value sitting near a grid boundary could still flip between two codes, so
+each window keeps the codes of its last fingerprint and only moves a code
+once the value is more than ``HYSTERESIS`` steps away from it.
+
+The decision engine can commit a vote before the window has ``MIN_FRAMES``
+frames of its label. Such a vote stays pending and is fingerprinted on the
+first frame that has enough, or from the frames it has if the window is
+reset first, so every committed vote gets exactly one fingerprint. Commits
+are numbered per window (``Fingerprint.vote``), which ties a late
+fingerprint to the decision it belongs to. ``RecentFingerprints`` is a
+bounded LRU of recently emitted digests: a vote that is re-committed while
+the pose is held, or a second voter holding an identical pose, is not
+emitted again.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Final, Optional
+
+import numpy as np
+
+from signdao.decision import canonicalize_label
+from signdao.features import FEATURE_DIM
+
+FINGERPRINT_VERSION: Final[int] = 1
+DEFAULT_WINDOW: Final[int] = 9
+DEFAULT_CACHE_SIZE: Final[int] = 256
+QUANT_STEP: Final[float] = 0.1  # normalized palm lengths
+HYSTERESIS: Final[float] = 0.75  # grid steps; above 0.5 so a code only moves on real motion
+MIN_FRAMES: Final[int] = 3
+DIGEST_BYTES: Final[int] = 16
+
+
+@dataclass(frozen=True)
+class Fingerprint:
+    label: str
+    digest: str  # hex, the string passed to mintNFT
+    frames: int  # window frames that went into the median
+    vote: int  # number of the commit this fingerprints, counted per window from 1
+
+
+def quantize(features: np.ndarray, step: float = QUANT_STEP, previous: Optional[np.ndarray] = None) -> np.ndarray:
+    """Round normalized features to int8 multiples of ``step``, keeping ``previous`` codes within ``HYSTERESIS``."""
+    scaled = np.asarray(features, dtype=np.float32) / step
+    codes = np.rint(scaled)
+    if previous is not None:
+        codes = np.where(np.abs(scaled - previous) <= HYSTERESIS, previous, codes)
+    return np.clip(codes, -127, 127).astype(np.int8)
+
+
+def fingerprint_digest(label: str, codes: np.ndarray) -> str:
+    """Hex digest of a label and its (FEATURE_DIM,) int8 grid codes."""
+    h = hashlib.blake2b(digest_size=DIGEST_BYTES)
+    h.update(bytes([FINGERPRINT_VERSION]))
+    h.update(label.encode("utf-8") + b"\0")
+    h.update(np.ascontiguousarray(codes, dtype=np.int8).tobytes())
+    return h.hexdigest()
+
+
+class FingerprintWindow:
+    """The last ``window`` frames of one hand, fingerprinted when its vote commits.
+
+    Call ``push`` every frame, ``commit`` with each decision and ``take`` after
+    both; ``take`` returns each committed vote's fingerprint exactly once.
+    """
+
+    def __init__(self, window: int = DEFAULT_WINDOW, step: float = QUANT_STEP, min_frames: int = MIN_FRAMES) -> None:
+        self.step = step
+        self.min_frames = min_frames
+        self._labels: deque[str] = deque(maxlen=window)
+        self._features: deque[np.ndarray] = deque(maxlen=window)
+        self._pending: Optional[str] = None
+        self._ready: Optional[Fingerprint] = None  # finished by ``reset`` before ``take`` saw it
+        self._last_codes: Optional[np.ndarray] = None
+        self.votes = 0
+
+    def __len__(self) -> int:
+        return len(self._labels)
+
+    def push(self, label: str, features: np.ndarray) -> None:
+        self._labels.append(canonicalize_label(label))
+        self._features.append(np.asarray(features, dtype=np.float32).reshape(FEATURE_DIM))
+
+    def commit(self, label: str) -> int:
+        """Mark a vote for ``label`` and return its number; a newer vote replaces one still pending."""
+        self._pending = canonicalize_label(label)
+        self.votes += 1
+        return self.votes
+
+    def take(self) -> Optional[Fingerprint]:
+        """The pending vote's fingerprint once ``min_frames`` window frames carry its label, else None."""
+        if self._ready is not None:
+            ready, self._ready = self._ready, None
+            return ready
+        return self._finish(self.min_frames)
+
+    def _finish(self, min_frames: int) -> Optional[Fingerprint]:
+        if self._pending is None:
+            return None
+        label = self._pending
+        stable = [features for frame_label, features in zip(self._labels, self._features) if frame_label == label]
+        if len(stable) < max(1, min_frames):
+            return None
+        self._pending = None
+        median = np.median(np.stack(stable), axis=0)
+        codes = quantize(median, self.step, self._last_codes)
+        self._last_codes = codes.astype(np.float32)
+        return Fingerprint(label, fingerprint_digest(label, codes), len(stable), self.votes)
+
+    def reset(self) -> None:
+        """Drop the frames, finishing a pending vote from whatever frames it has.
+
+        The hysteresis codes stay, as the voter may come back.
+        """
+        self._ready = self._ready or self._finish(1)
+        self._pending = None
+        self._labels.clear()
+        self._features.clear()
+
+
+class RecentFingerprints:
+    """Bounded LRU of emitted digests."""
+
+    def __init__(self, capacity: int = DEFAULT_CACHE_SIZE) -> None:
+        self.capacity = capacity
+        self._seen: OrderedDict[str, None] = OrderedDict()
+        self.emitted = 0
+        self.duplicates = 0
+
+    def __len__(self) -> int:
+        return len(self._seen)
+
+    def add(self, digest: str) -> bool:
+        """Remember ``digest``; False if it was already among the recent ones."""
+        if digest in self._seen:
+            self._seen.move_to_end(digest)
+            self.duplicates += 1
+            return False
+        self._seen[digest] = None
+        if len(self._seen) > self.capacity:
+            self._seen.popitem(last=False)
+        self.emitted += 1
+        return True
+
+    def stats(self) -> dict:
+        return {"emitted": self.emitted, "duplicates": self.duplicates, "cached": len(self._seen)}
@@ -0,0 +1,62 @@
+"""
+Rule-based + KNN fusion, shared by the live CLI and the backend's landmark
+ingest endpoint.
+
+The KNN prediction wins when its confidence reaches ``ML_TAKEOVER``.
+Otherwise a confident rule-based label is kept. If the rules also say
+UNKNOWN, the KNN label is used even when its confidence is low. Everything
+here works on (N, ...) arrays, so the backend classifies a whole micro-batch
+of remote hands with one normalize, one score and one predict_proba call.
+"""
+
+from __future__ import annotations
+
+from typing import Final, Optional
+
+import numpy as np
+
+from signdao.features import UNKNOWN_FLOOR, feature_vectors, normalize_landmarks_batch, score_yes_no_batch
+
+ML_TAKEOVER: Final[float] = 0.60
+
+
+def fuse_predictions(
+    rule_labels: np.ndarray,
+    rule_conf: np.ndarray,
+    ml_labels: Optional[np.ndarray] = None,
+    ml_conf: Optional[np.ndarray] = None,
+    ml_takeover: float = ML_TAKEOVER,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Pick the rule-based or KNN label per hand; returns ``(labels, confidences)``."""
+    rule_labels = np.asarray(rule_labels, dtype=object)
+    rule_conf = np.asarray(rule_conf, dtype=np.float32)
+    if ml_labels is None:
+        return rule_labels, rule_conf
+
+    ml_labels = np.asarray(ml_labels, dtype=object)
+    ml_conf = np.asarray(ml_conf, dtype=np.float32)
+    use_ml = (ml_conf >= ml_takeover) | (rule_labels == "UNKNOWN")
+    return np.where(use_ml, ml_labels, rule_labels), np.where(use_ml, ml_conf, rule_conf)
+
+
+def predict_labels(model, features: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Top KNN label and its probability for each (N, FEATURE_DIM) feature row."""
+    proba = np.asarray(model.predict_proba(features))
+    best = np.argmax(proba, axis=1)
+    return np.asarray(model.classes_, dtype=object)[best], proba[np.arange(len(best)), best].astype(np.float32)
+
+
+def classify_batch(
+    landmarks: np.ndarray,
+    left_mask: Optional[np.ndarray] = None,
+    model=None,
+    ml_takeover: float = ML_TAKEOVER,
+    unknown_floor: float = UNKNOWN_FLOOR,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Fused YES/NO/UNKNOWN labels and confidences for (N, 21, 3) raw landmarks."""
+    normalized = normalize_landmarks_batch(landmarks, left_mask)
+    scores = score_yes_no_batch(normalized, unknown_floor)
+    if model is None or len(normalized) == 0:
+        return fuse_predictions(scores.labels, scores.confidence)
+    ml_labels, ml_conf = predict_labels(model, feature_vectors(normalized))
+    return fuse_predictions(scores.labels, scores.confidence, ml_labels, ml_conf, ml_takeover)
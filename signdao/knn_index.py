@@ -0,0 +1,102 @@
+"""
+Brute-force k-nearest-neighbor index for the 42-dim landmark features.
+
+Squared distances are expanded as ``|x|^2 - 2 x.q + |q|^2``. Halving that and
+dropping the query-only ``|q|^2`` term leaves the ranking key
+``|x|^2 / 2 - x.q``. The stored half norms are computed once, and a batch of
+queries becomes one matrix product against the feature-major (D, N) matrix,
+one in-place subtraction and a partial sort.
+
+For large indexes the partial sort is pruned. Samples are split into
+``_PRUNE_BLOCK`` strided groups (sample ``i`` belongs to group ``i % groups``),
+and the k groups with the smallest minimum key are guaranteed to contain the k
+nearest samples. An element-wise ``min`` across rows plus a partial sort over
+``k * _PRUNE_BLOCK`` candidates is far cheaper than partially sorting every key.
+"""
+
+from __future__ import annotations
+
+from typing import Final
+
+import numpy as np
+
+# Upper bound on the (queries x samples) key block held in memory at once.
+_MAX_BLOCK_ELEMENTS: Final[int] = 1 << 24
+_PRUNE_BLOCK: Final[int] = 64
+_PRUNE_MIN_SAMPLES: Final[int] = 8192
+
+
+class LandmarkKNNIndex:
+    """Uniform-weight KNN over a contiguous float32 feature matrix.
+
+    ``codes`` are integer class indices in ``[0, num_classes)``.
+    ``predict_proba`` returns the same per-class vote fractions as
+    scikit-learn's ``KNeighborsClassifier`` with uniform weights.
+    """
+
+    def __init__(self, X: np.ndarray, codes: np.ndarray, num_classes: int, n_neighbors: int) -> None:
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim != 2 or len(X) == 0:
+            raise ValueError(f"Expected a non-empty (N, D) feature matrix, got {X.shape}")
+        self._size, self._dim = X.shape
+        self._num_classes = int(num_classes)
+        self.n_neighbors = int(max(1, min(n_neighbors, self._size)))
+
+        half_sq_norms = 0.5 * np.einsum("ij,ij->i", X, X)
+        codes = np.asarray(codes, dtype=np.intp)
+        self._pruned = self._size >= _PRUNE_MIN_SAMPLES
+        if self._pruned:
+            # Pad to whole groups with rows whose key is +inf so they never win.
+            pad = -self._size % _PRUNE_BLOCK
+            X = np.concatenate([X, np.zeros((pad, self._dim), dtype=np.float32)])
+            half_sq_norms = np.concatenate([half_sq_norms, np.full(pad, np.inf, dtype=np.float32)])
+            codes = np.concatenate([codes, np.zeros(pad, dtype=np.intp)])
+
+        # Feature-major layout makes (M, D) @ (D, N) a streaming BLAS product.
+        self._XT = np.ascontiguousarray(X.T)
+        self._half_sq_norms = half_sq_norms.astype(np.float32)
+        self._codes = codes
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def dim(self) -> int:
+        return self._dim
+
+    def _top_k(self, keys: np.ndarray) -> np.ndarray:
+        """Row-wise indices of the k smallest keys in an (M, N) array (unordered)."""
+        k = self.n_neighbors
+        if k >= keys.shape[1]:
+            return np.broadcast_to(np.arange(keys.shape[1]), (len(keys), k))
+        if not self._pruned:
+            return np.argpartition(keys, k - 1, axis=1)[:, :k]
+
+        rows = np.arange(len(keys))[:, np.newaxis]
+        groups = keys.shape[1] // _PRUNE_BLOCK
+        strided = keys.reshape(len(keys), _PRUNE_BLOCK, groups)
+        best_groups = np.argpartition(strided.min(axis=1), k - 1, axis=1)[:, :k]
+        candidates = strided[rows, :, best_groups].reshape(len(keys), k * _PRUNE_BLOCK)
+        local = np.argpartition(candidates, k - 1, axis=1)[:, :k]
+        return best_groups[rows, local // _PRUNE_BLOCK] + (local % _PRUNE_BLOCK) * groups
+
+    def _votes(self, neighbors: np.ndarray) -> np.ndarray:
+        labels = self._codes[neighbors]
+        votes = (labels[:, :, np.newaxis] == np.arange(self._num_classes)).sum(axis=1)
+        return votes / self.n_neighbors
+
+    def kneighbors(self, queries: np.ndarray) -> np.ndarray:
+        """Return (M, k) indices of the nearest stored samples for each query."""
+        Q = np.ascontiguousarray(queries, dtype=np.float32).reshape(-1, self._dim)
+        chunk = max(1, _MAX_BLOCK_ELEMENTS // self._XT.shape[1])
+        out = np.empty((len(Q), self.n_neighbors), dtype=np.intp)
+        for start in range(0, len(Q), chunk):
+            block = Q[start : start + chunk]
+            keys = block @ self._XT
+            np.subtract(self._half_sq_norms, keys, out=keys)
+            out[start : start + len(block)] = self._top_k(keys)
+        return out
+
+    def predict_proba(self, queries: np.ndarray) -> np.ndarray:
+        """Return (M, num_classes) neighbor vote fractions."""
+        return self._votes(self.kneighbors(queries))
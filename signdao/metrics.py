@@ -0,0 +1,236 @@
+"""
+Low-overhead counters and latency histograms with Prometheus text output.
+
+Each stage costs a ``time.perf_counter`` pair, a bisect into a fixed bucket
+list and an uncontended lock, under 2 us in total. Eight stages come to about
+0.05% of a ~25 ms frame. Rendering the text exposition only happens when
+``/metrics`` is scraped.
+
+Both the CLI and the backend record into the process-wide ``REGISTRY``
+through the shared metrics defined at the bottom of this module, so the two
+expose the same metric names. A worker process ships ``REGISTRY.state()`` to
+its parent, and the parent passes those states to ``render`` to expose them
+under a ``source`` label. The backend parent imports the capture code too,
+so it holds capture stages and counters that only its workers ever record;
+it renders with ``local_idle=False`` to leave out those unlabelled zeros
+and keep just what it records itself, such as the ingest API.
+"""
+
+from __future__ import annotations
+
+import bisect
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Final, Optional, Sequence
+
+CONTENT_TYPE: Final[str] = "text/plain; version=0.0.4; charset=utf-8"
+LATENCY_BUCKETS: Final[tuple[float, ...]] = (
+    0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0,
+)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(str(value))}"' for key, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _render_counter(name: str, help_text: str, samples: list[tuple[dict, int]]) -> list[str]:
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+    lines.extend(f"{name}{_format_labels(labels)} {value}" for labels, value in samples)
+    return lines
+
+
+def _render_histogram(name: str, help_text: str, bounds: Sequence[float], series: list[tuple[dict, dict]]) -> list[str]:
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+    for labels, state in series:
+        cumulative = 0
+        for bound, bucket_count in zip(bounds, state["counts"]):
+            cumulative += bucket_count
+            lines.append(f"{name}_bucket{_format_labels({**labels, 'le': _format_value(bound)})} {cumulative}")
+        lines.append(f"{name}_bucket{_format_labels({**labels, 'le': '+Inf'})} {state['count']}")
+        lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(state['total'])}")
+        lines.append(f"{name}_count{_format_labels(labels)} {state['count']}")
+    return lines
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str) -> None:
+        self.name = name
+        self.help = help_text
+        self._lock = threading.Lock()
+        self.value = 0
+
+    def inc(self, amount: int = 1) -> None:
+        with self._lock:
+            self.value += amount
+
+    def state(self) -> dict:
+        return {"type": "counter", "help": self.help, "value": self.value}
+
+
+class _HistogramSeries:
+    __slots__ = ("_bounds", "_lock", "counts", "total", "count")
+
+    def __init__(self, bounds: tuple[float, ...]) -> None:
+        self._bounds = bounds
+        self._lock = threading.Lock()
+        self.counts = [0] * (len(bounds) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self._bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.total += value
+            self.count += 1
+
+    def state(self) -> dict:
+        with self._lock:
+            return {"counts": list(self.counts), "total": self.total, "count": self.count}
+
+
+class Histogram:
+    """A histogram family; ``labels(...)`` returns the series for one label value."""
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+        label_name: Optional[str] = None,
+    ) -> None:
+        self.name = name
+        self.help = help_text
+        self.bounds = tuple(sorted(buckets))
+        self.label_name = label_name
+        self._series: dict[str, _HistogramSeries] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, value: str = "") -> _HistogramSeries:
+        series = self._series.get(value)
+        if series is None:
+            with self._lock:
+                series = self._series.setdefault(value, _HistogramSeries(self.bounds))
+        return series
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def state(self) -> dict:
+        with self._lock:
+            series = dict(self._series)
+        return {
+            "type": "histogram",
+            "help": self.help,
+            "bounds": list(self.bounds),
+            "label_name": self.label_name,
+            "series": {value: s.state() for value, s in sorted(series.items())},
+        }
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: dict[str, Counter | Histogram] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, help_text: str) -> Counter:
+        with self._lock:
+            return self._metrics.setdefault(name, Counter(name, help_text))
+
+    def histogram(self, name: str, help_text: str, label_name: Optional[str] = None) -> Histogram:
+        with self._lock:
+            return self._metrics.setdefault(name, Histogram(name, help_text, label_name=label_name))
+
+    def state(self, idle: bool = True) -> dict:
+        """Plain-data copy of every metric, e.g. to send from a worker process.
+
+        With ``idle=False``, counters at zero and histogram series without
+        observations are left out.
+        """
+        with self._lock:
+            metrics = dict(self._metrics)
+        states = {name: metric.state() for name, metric in metrics.items()}
+        if idle:
+            return states
+        for state in states.values():
+            if state["type"] == "histogram":
+                state["series"] = {value: s for value, s in state["series"].items() if s["count"]}
+        return {
+            name: state
+            for name, state in states.items()
+            if (state["value"] if state["type"] == "counter" else state["series"])
+        }
+
+    def render(
+        self, remote: Optional[dict[str, dict]] = None, remote_label: str = "source", local_idle: bool = True
+    ) -> str:
+        """Prometheus text for this registry plus ``remote`` states keyed by a ``remote_label`` value."""
+        states = [({}, self.state(idle=local_idle))]
+        states += [({remote_label: key}, state) for key, state in sorted((remote or {}).items())]
+        families: dict[str, dict] = {}
+        for extra, state in states:
+            for name, metric in state.items():
+                family = families.setdefault(name, {**metric, "samples": []})
+                if metric["type"] == "counter":
+                    family["samples"].append((extra, metric["value"]))
+                    continue
+                for value, series in metric["series"].items():
+                    labels = {**extra, metric["label_name"]: value} if metric["label_name"] else dict(extra)
+                    family["samples"].append((labels, series))
+
+        lines: list[str] = []
+        for name, family in families.items():
+            if family["type"] == "counter":
+                lines.extend(_render_counter(name, family["help"], family["samples"]))
+            else:
+                lines.extend(_render_histogram(name, family["help"], family["bounds"], family["samples"]))
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY: Final[Registry] = Registry()
+
+STAGE_SECONDS: Final[Histogram] = REGISTRY.histogram(
+    "signdao_stage_seconds", "Time spent in each recognition stage per frame.", label_name="stage"
+)
+FRAMES: Final[Counter] = REGISTRY.counter("signdao_frames_total", "Frames read from the camera.")
+HANDS_DETECTED: Final[Counter] = REGISTRY.counter("signdao_hands_detected_total", "Frames with at least one hand.")
+READ_FAILURES: Final[Counter] = REGISTRY.counter("signdao_camera_read_failures_total", "Failed camera reads.")
+CAPTURE_REOPENS: Final[Counter] = REGISTRY.counter("signdao_capture_reopens_total", "Times the camera was reopened after the first open.")
+
+
+def stage(name: str) -> _HistogramSeries:
+    """The latency series for one pipeline stage; call ``observe(seconds)`` on it."""
+    return STAGE_SECONDS.labels(name)
+
+
+def serve(port: int, host: str = "0.0.0.0", registry: Registry = REGISTRY) -> ThreadingHTTPServer:
+    """Serve ``registry`` at ``http://host:port/metrics`` from a daemon thread."""
+
+    class _Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = registry.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args) -> None:  # noqa: A002 - scrapes are not worth a log line
+            pass
+
+    server = ThreadingHTTPServer((host, port), _Handler)
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
@@ -0,0 +1,105 @@
+"""
+Prebuilt nearest-neighbor model artifact for the YES/NO classifier.
+
+``train_yes_no.py`` writes the artifact once; the live recognizer loads it
+without refitting anything. The artifact is a ``signdao.dataset`` file of
+kind "model" with ``n_neighbors`` and ``model_version`` in its header, so it
+memory-maps without unpickling anything.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from typing import Final, Optional
+
+import numpy as np
+
+from signdao.dataset import DatasetFormatError, LandmarkDataset, load_dataset, save_dataset
+from signdao.features import FEATURE_DIM, NUM_LANDMARKS
+from signdao.knn_index import LandmarkKNNIndex
+
+MODEL_VERSION: Final[int] = 2
+MAX_NEIGHBORS: Final[int] = 5
+
+# Everything that changes the meaning of a feature vector belongs here; a model
+# trained under a different spec is rejected at load time.
+FEATURE_SPEC: Final[dict] = {
+    "landmarks": NUM_LANDMARKS,
+    "coords": "xy",
+    "dim": FEATURE_DIM,
+    "origin": "wrist",
+    "scale": "wrist-middle_mcp",
+    "mirror": "Left",
+}
+
+
+def feature_spec_hash(spec: dict = FEATURE_SPEC) -> str:
+    """Stable short hash of the feature specification."""
+    encoded = json.dumps(spec, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+
+def default_neighbors(num_samples: int) -> int:
+    return min(MAX_NEIGHBORS, max(1, num_samples // 2))
+
+
+class PrebuiltKNN:
+    """Uniform-weight k-nearest-neighbor classifier over stored feature vectors.
+
+    Exposes the ``classes_`` / ``predict_proba`` subset of the scikit-learn API
+    that the recognizer uses, backed by ``LandmarkKNNIndex``.
+    """
+
+    def __init__(self, X: np.ndarray, codes: np.ndarray, classes: np.ndarray, n_neighbors: int) -> None:
+        self.classes_ = np.asarray(classes)
+        self.index = LandmarkKNNIndex(X, codes, len(self.classes_), n_neighbors)
+        self.n_neighbors = self.index.n_neighbors
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def predict_proba(self, queries) -> np.ndarray:
+        return self.index.predict_proba(queries)
+
+
+def model_from_dataset(dataset: LandmarkDataset, n_neighbors: Optional[int] = None) -> PrebuiltKNN:
+    k = default_neighbors(len(dataset)) if n_neighbors is None else n_neighbors
+    return PrebuiltKNN(dataset.float_features(), dataset.codes, np.asarray(dataset.labels), k)
+
+
+def save_model(
+    path: str, X: np.ndarray, y: np.ndarray, n_neighbors: Optional[int] = None, dtype: str = "float32"
+) -> PrebuiltKNN:
+    """Encode labels, validate shapes and write a ready-to-query model artifact."""
+    X = np.ascontiguousarray(X, dtype=np.float32)
+    if X.ndim != 2 or X.shape[1] != FEATURE_DIM:
+        raise ValueError(f"Expected features shaped (N, {FEATURE_DIM}), got {X.shape}")
+    k = default_neighbors(len(X)) if n_neighbors is None else n_neighbors
+    dataset = save_dataset(
+        path, X, y, dtype=dtype, kind="model", extra={"model_version": MODEL_VERSION, "n_neighbors": int(k)}
+    )
+    return model_from_dataset(dataset, k)
+
+
+def load_model(path: str) -> Optional[PrebuiltKNN]:
+    """Load an artifact written by ``save_model``; returns None if it is missing or stale."""
+    if not os.path.exists(path):
+        return None
+    try:
+        dataset = load_dataset(path)
+    except DatasetFormatError as exc:
+        print(f"[WARN] {exc}. Retrain it.")
+        return None
+    version = dataset.extra.get("model_version")
+    if dataset.kind != "model" or version != MODEL_VERSION:
+        print(f"[WARN] Model at {path} has version {version}, expected {MODEL_VERSION}. Retrain it.")
+        return None
+    if dataset.spec_hash != feature_spec_hash():
+        print(f"[WARN] Model at {path} was built for a different feature spec. Retrain it.")
+        return None
+    if len(dataset) == 0:
+        print(f"[WARN] Model at {path} is empty")
+        return None
+    return model_from_dataset(dataset, int(dataset.extra["n_neighbors"]))
@@ -0,0 +1,68 @@
+"""
+Building blocks for the threaded capture -> inference -> render pipeline.
+
+Stages hand work to each other through ``LatestSlot``, a single-item queue
+where a new item replaces an unconsumed one. A slow consumer therefore always
+sees the freshest frame instead of working through a backlog, and the producer
+never blocks.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Generic, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class LatestSlot(Generic[T]):
+    """Bounded (size 1) latest-wins hand-off between two threads."""
+
+    def __init__(self) -> None:
+        self._cond = threading.Condition()
+        self._item: Optional[T] = None
+        self._has_item = False
+        self.put_count = 0
+        self.dropped = 0
+
+    def put(self, item: T) -> None:
+        with self._cond:
+            if self._has_item:
+                self.dropped += 1
+            self._item = item
+            self._has_item = True
+            self.put_count += 1
+            self._cond.notify()
+
+    def get(self, timeout: Optional[float] = None) -> Optional[T]:
+        """Take the current item, waiting up to ``timeout`` seconds; None on timeout."""
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._has_item, timeout=timeout):
+                return None
+            item = self._item
+            self._item = None
+            self._has_item = False
+            return item
+
+
+class RateMeter:
+    """Counts events and reports the rate since the last ``snapshot``."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._count = 0
+        self._since = time.perf_counter()
+
+    def tick(self, n: int = 1) -> None:
+        with self._lock:
+            self._count += n
+
+    def snapshot(self) -> float:
+        with self._lock:
+            now = time.perf_counter()
+            elapsed = now - self._since
+            rate = self._count / elapsed if elapsed > 0 else 0.0
+            self._count = 0
+            self._since = now
+            return rate
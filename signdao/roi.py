@@ -0,0 +1,150 @@
+"""
+Hand region-of-interest tracking for MediaPipe input.
+
+On a 1080p frame, most of ``Hands.process`` time goes to preparing the full
+image and running palm detection on it. While a hand is tracked,
+``HandROITracker`` crops a padded square around the previous frame's
+landmarks and downsizes it to at most ``roi_side`` pixels. Landmarks
+detected in the crop are mapped back to full-frame normalized coordinates,
+so downstream code sees no difference. If the crop finds no hand, the same
+frame is rescanned full-frame (downscaled to ``scan_side`` pixels on its
+longest edge), so losing the track costs one extra call rather than a frame.
+
+The crop covers the hands already tracked, so a new hand elsewhere in the
+frame would go unseen while any track lives. With fewer than ``max_hands``
+hands tracked, every ``rescan_every``-th frame is therefore a full-frame
+scan, so a second voter is picked up within that many frames. With
+``max_hands=1`` the crop is never interrupted.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Final, Optional
+
+import cv2
+import numpy as np
+
+from signdao.features import NUM_LANDMARKS
+
+DEFAULT_ROI_SIDE: Final[int] = 256
+DEFAULT_SCAN_SIDE: Final[int] = 640
+DEFAULT_PADDING: Final[float] = 0.6
+DEFAULT_RESCAN_EVERY: Final[int] = 10
+
+
+@dataclass(frozen=True)
+class CropTransform:
+    """Where the MediaPipe input came from, in full-frame pixels."""
+
+    x0: int
+    y0: int
+    width: int
+    height: int
+    frame_width: int
+    frame_height: int
+
+    @property
+    def is_full_frame(self) -> bool:
+        return self.x0 == 0 and self.y0 == 0 and self.width == self.frame_width and self.height == self.frame_height
+
+    def to_frame(self, landmarks: np.ndarray) -> np.ndarray:
+        """Map (..., 21, 3) crop-normalized landmarks to full-frame normalized coordinates."""
+        if self.is_full_frame:
+            return landmarks
+        mapped = np.array(landmarks, dtype=np.float32, copy=True)
+        mapped[..., 0] = (mapped[..., 0] * self.width + self.x0) / self.frame_width
+        mapped[..., 1] = (mapped[..., 1] * self.height + self.y0) / self.frame_height
+        # MediaPipe z uses roughly the same scale as x.
+        mapped[..., 2] *= self.width / self.frame_width
+        return mapped
+
+
+def _fit(image: np.ndarray, max_side: int) -> np.ndarray:
+    height, width = image.shape[:2]
+    longest = max(height, width)
+    if longest <= max_side:
+        return np.ascontiguousarray(image)
+    scale = max_side / longest
+    size = (max(1, round(width * scale)), max(1, round(height * scale)))
+    return cv2.resize(image, size, interpolation=cv2.INTER_AREA)
+
+
+class HandROITracker:
+    def __init__(
+        self,
+        roi_side: int = DEFAULT_ROI_SIDE,
+        scan_side: int = DEFAULT_SCAN_SIDE,
+        padding: float = DEFAULT_PADDING,
+        max_hands: int = 1,
+        rescan_every: int = DEFAULT_RESCAN_EVERY,
+    ) -> None:
+        self.roi_side = roi_side
+        self.scan_side = scan_side
+        self.padding = padding
+        self.max_hands = max_hands
+        self.rescan_every = rescan_every
+        self._box: Optional[tuple[int, int, int, int]] = None
+        self._tracked_hands = 0
+        self._since_scan = 0
+        self.roi_frames = 0
+        self.full_scans = 0
+
+    @property
+    def tracking(self) -> bool:
+        return self._box is not None
+
+    def prepare(self, rgb_frame: np.ndarray) -> tuple[np.ndarray, CropTransform]:
+        """Return the (cropped, downsized) image to feed MediaPipe and its transform."""
+        frame_height, frame_width = rgb_frame.shape[:2]
+        self._since_scan += 1
+        looking = self._tracked_hands < self.max_hands and self._since_scan >= self.rescan_every
+        if self._box is None or looking:
+            self._since_scan = 0
+            self.full_scans += 1
+            transform = CropTransform(0, 0, frame_width, frame_height, frame_width, frame_height)
+            return _fit(rgb_frame, self.scan_side), transform
+
+        self.roi_frames += 1
+        x0, y0, x1, y1 = self._box
+        transform = CropTransform(x0, y0, x1 - x0, y1 - y0, frame_width, frame_height)
+        return _fit(rgb_frame[y0:y1, x0:x1], self.roi_side), transform
+
+    def process(self, hands, rgb_frame: np.ndarray):
+        """Run ``hands.process`` on the tracked ROI, rescanning the full frame on a miss.
+
+        Returns ``(results, transform)``; map landmarks with ``transform.to_frame``
+        and report them back through ``update``.
+        """
+        image, transform = self.prepare(rgb_frame)
+        results = hands.process(image)
+        if not results.multi_hand_landmarks and not transform.is_full_frame:
+            self._box = None
+            image, transform = self.prepare(rgb_frame)
+            results = hands.process(image)
+        return results, transform
+
+    def update(self, landmarks: Optional[np.ndarray], frame_width: int, frame_height: int) -> None:
+        """Track full-frame normalized ``landmarks``, (21 * hands, 3); None means every hand was lost."""
+        if landmarks is None:
+            self._box = None
+            self._tracked_hands = 0
+            return
+        self._tracked_hands = len(landmarks) // NUM_LANDMARKS
+        xs = landmarks[:, 0] * frame_width
+        ys = landmarks[:, 1] * frame_height
+        cx, cy = float(xs.mean()), float(ys.mean())
+        side = max(float(xs.max() - xs.min()), float(ys.max() - ys.min())) * (1.0 + 2.0 * self.padding)
+        half = max(side, 32.0) / 2.0
+        box = (
+            max(0, int(cx - half)),
+            max(0, int(cy - half)),
+            min(frame_width, int(cx + half) + 1),
+            min(frame_height, int(cy + half) + 1),
+        )
+        # A hand leaving the frame leaves a sliver; rescan instead of tracking it.
+        self._box = box if box[2] - box[0] >= 16 and box[3] - box[1] >= 16 else None
+
+    def reset(self) -> None:
+        self._box = None
+        self._tracked_hands = 0
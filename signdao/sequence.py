@@ -0,0 +1,325 @@
+"""
+Sequence mode: match a rolling window of hand features against recorded
+sign trajectories with dynamic time warping (DTW).
+
+A trajectory is a (T, FEATURE_DIM) array of per-frame features, resampled
+to ``SEQUENCE_LENGTH`` evenly spaced time steps. The extractor stores one per
+clip, and the live recognizer builds one from the last ``window_sec`` seconds.
+DTW is restricted to a Sakoe-Chiba band of ``radius`` steps, and its cell cost
+is the squared Euclidean distance between two frames.
+
+Most templates never reach a full DTW. ``SequenceTemplates.nearest`` finds
+the exact nearest template through a cascade:
+
+1. LB_Kim: the first and last cells lie on every warping path. One
+   vectorized pass over all templates gives each a bound, and templates are
+   visited in order of it, ``LB_CHUNK`` at a time. Once a chunk's smallest
+   bound reaches the best distance found so far, the search stops.
+2. LB_Keogh: squared distance from the query to each template's band
+   envelope (precomputed once), vectorized over the chunk. Only templates
+   whose bound is below the best distance go on.
+3. DTW with early abandoning, vectorized over the chunk's survivors
+   (``dtw_many``): a template is dropped as soon as every cell of a DP row
+   reaches the best distance.
+
+With hundreds of templates only a handful reach step 3; see
+``benchmarks/bench_sequence.py``.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Final, Optional, Sequence
+
+import numpy as np
+
+from signdao.dataset import load_dataset, save_dataset
+
+SEQUENCE_LENGTH: Final[int] = 32
+DEFAULT_RADIUS: Final[int] = 4
+DEFAULT_WINDOW_SEC: Final[float] = 2.0
+MIN_FRAMES: Final[int] = 8
+# Templates whose LB_Keogh is computed in one vectorized pass.
+LB_CHUNK: Final[int] = 32
+# Templates given a full DTW, before any pruning, to set the first bound.
+SEED_COUNT: Final[int] = 4
+# Matches farther than this many typical template spreads are UNKNOWN.
+DEFAULT_MAX_SCALE: Final[float] = 3.0
+
+
+def resample(times: np.ndarray, features: np.ndarray, length: int = SEQUENCE_LENGTH) -> np.ndarray:
+    """Linearly interpolate (n, D) features taken at ``times`` onto ``length`` evenly spaced steps."""
+    times = np.asarray(times, dtype=np.float64)
+    features = np.asarray(features, dtype=np.float32)
+    if len(features) == 1 or times[-1] <= times[0]:
+        return np.repeat(features[-1:], length, axis=0)
+    steps = np.linspace(times[0], times[-1], length)
+    left = np.clip(np.searchsorted(times, steps, side="right") - 1, 0, len(times) - 2)
+    span = times[left + 1] - times[left]
+    weight = np.divide(steps - times[left], span, out=np.zeros_like(span), where=span > 0)
+    weight = weight.astype(np.float32)[:, np.newaxis]
+    return features[left] * (1.0 - weight) + features[left + 1] * weight
+
+
+def envelope(series: np.ndarray, radius: int) -> tuple[np.ndarray, np.ndarray]:
+    """Running max/min over +-``radius`` steps along axis -2 of (..., T, D) series."""
+    upper = series.copy()
+    lower = series.copy()
+    for shift in range(1, radius + 1):
+        np.maximum(upper[..., shift:, :], series[..., :-shift, :], out=upper[..., shift:, :])
+        np.maximum(upper[..., :-shift, :], series[..., shift:, :], out=upper[..., :-shift, :])
+        np.minimum(lower[..., shift:, :], series[..., :-shift, :], out=lower[..., shift:, :])
+        np.minimum(lower[..., :-shift, :], series[..., shift:, :], out=lower[..., :-shift, :])
+    return upper, lower
+
+
+def lb_kim(query: np.ndarray, templates: np.ndarray) -> np.ndarray:
+    """Cost of the first and last cells, for each of (K, T, D) templates."""
+    first = np.square(templates[:, 0] - query[0]).sum(axis=1)
+    last = np.square(templates[:, -1] - query[-1]).sum(axis=1)
+    return first + last
+
+
+def lb_keogh(query: np.ndarray, upper: np.ndarray, lower: np.ndarray) -> np.ndarray:
+    """Squared distance from ``query`` to each of (K, T, D) template envelopes."""
+    above = np.maximum(query - upper, 0.0)
+    below = np.maximum(lower - query, 0.0)
+    return np.einsum("kij,kij->k", above, above) + np.einsum("kij,kij->k", below, below)
+
+
+@lru_cache(maxsize=8)
+def _band(length: int, radius: int) -> tuple[np.ndarray, np.ndarray, list[Optional[np.ndarray]]]:
+    """Column of each band cell (clipped), which cells fall outside the matrix, and those per row."""
+    columns = np.arange(length)[:, np.newaxis] - radius + np.arange(2 * radius + 1)
+    outside = (columns < 0) | (columns >= length)
+    edges = [np.flatnonzero(mask) if mask.any() else None for mask in outside]
+    return np.clip(columns, 0, length - 1), outside, edges
+
+
+def dtw_many(
+    query: np.ndarray, templates: np.ndarray, radius: int = DEFAULT_RADIUS, abandon_at: float = np.inf
+) -> np.ndarray:
+    """Banded DTW from ``query`` (T, D) to each of (K, T, D) templates.
+
+    Rows of the DP are vectorized over templates. Within a row, cell ``w`` of
+    the band is ``c[w] + min(up[w], cell[w - 1])``, which unrolls to the scan
+    ``S[w] + min(up[k] - S[k - 1] for k <= w)`` over the prefix sums ``S`` of
+    the row's costs. Templates whose whole row reaches ``abandon_at`` are
+    dropped early and come back as inf.
+    """
+    count, length = len(templates), len(query)
+    width = 2 * radius + 1
+    query = query.astype(np.float64)
+    templates = templates.astype(np.float64)
+    # (K, T, T) squared distances, then the band: column j = i - radius + w.
+    cost = (
+        np.einsum("ij,ij->i", query, query)[np.newaxis, :, np.newaxis]
+        + np.einsum("kij,kij->ki", templates, templates)[:, np.newaxis, :]
+        - 2.0 * np.matmul(query, templates.transpose(0, 2, 1))
+    )
+    columns, outside, edges = _band(length, radius)
+    band = np.take_along_axis(cost, np.broadcast_to(columns, (count, length, width)), axis=2)
+    band = np.maximum(band, 0.0)
+    band[:, outside] = 0.0  # keeps the prefix sums finite; masked below
+    band = band.transpose(1, 0, 2).copy()  # (T, K, width): one row of every template at a time
+
+    result = np.full(count, np.inf)
+    alive = np.arange(count)
+    up = np.full((count, width), np.inf)
+    up[:, radius] = 0.0  # the path starts at (0, 0)
+    for i in range(length):
+        cells = band[i] if len(alive) == count else band[i, alive]
+        if i:
+            up = np.empty_like(row)
+            np.minimum(row[:, :-1], row[:, 1:], out=up[:, :-1])
+            up[:, -1] = row[:, -1]
+        prefix = np.cumsum(cells, axis=1)
+        row = prefix + np.minimum.accumulate(up + cells - prefix, axis=1)
+        if edges[i] is not None:
+            row[:, edges[i]] = np.inf
+        if abandon_at < np.inf:
+            keep = row.min(axis=1) < abandon_at
+            if not keep.all():
+                alive, row = alive[keep], row[keep]
+                if not len(alive):
+                    return result
+    result[alive] = row[:, radius]
+    return result
+
+
+def dtw(a: np.ndarray, b: np.ndarray, radius: int = DEFAULT_RADIUS, abandon_at: float = np.inf) -> float:
+    """Banded DTW distance between two (T, D) series; inf once it is certain to reach ``abandon_at``."""
+    return float(dtw_many(a, b[np.newaxis], radius, abandon_at)[0])
+
+
+@dataclass(frozen=True)
+class SequenceMatch:
+    label: str
+    distance: float
+    confidence: float
+    index: int  # template index, -1 when nothing matched
+    computed: int  # full (possibly abandoned) DTW evaluations
+    pruned: int  # templates rejected by a lower bound
+
+
+class SequenceTemplates:
+    """Labelled (K, T, D) trajectories with precomputed LB_Keogh envelopes.
+
+    ``scale`` is the median DTW distance from a template to its nearest
+    same-label neighbour, i.e. how far apart two performances of one sign
+    typically are. A match's confidence falls linearly from 1 at distance 0
+    to 0 at ``max_distance``, which defaults to ``DEFAULT_MAX_SCALE * scale``.
+    Matches beyond it are UNKNOWN.
+    """
+
+    def __init__(
+        self,
+        templates: np.ndarray,
+        labels: Sequence[str],
+        radius: int = DEFAULT_RADIUS,
+        max_distance: Optional[float] = None,
+    ) -> None:
+        self.templates = np.ascontiguousarray(templates, dtype=np.float32)
+        if self.templates.ndim != 3 or len(self.templates) == 0:
+            raise ValueError(f"Expected non-empty (K, T, D) templates, got {self.templates.shape}")
+        self.labels = np.asarray(labels).astype(str)
+        self.radius = radius
+        self.upper, self.lower = envelope(self.templates, radius)
+        self.scale = self._typical_spread()
+        self.max_distance = DEFAULT_MAX_SCALE * self.scale if max_distance is None else max_distance
+
+    def __len__(self) -> int:
+        return len(self.templates)
+
+    @property
+    def length(self) -> int:
+        return self.templates.shape[1]
+
+    @classmethod
+    def load(cls, path: str, radius: int = DEFAULT_RADIUS, max_distance: Optional[float] = None) -> "SequenceTemplates":
+        dataset = load_dataset(path)
+        length = int(dataset.extra["sequence_length"])
+        templates = dataset.float_features().reshape(len(dataset), length, -1)
+        return cls(templates, dataset.y, radius, max_distance)
+
+    def save(self, path: str, dtype: str = "float16") -> None:
+        save_trajectories(path, self.templates, self.labels, dtype)
+
+    def _typical_spread(self, samples: int = 32) -> float:
+        picks = np.linspace(0, len(self.templates) - 1, min(samples, len(self.templates))).astype(int)
+        distances = []
+        for k in picks:
+            same = np.flatnonzero((self.labels == self.labels[k]) & (np.arange(len(self.templates)) != k))
+            if len(same):
+                distances.append(self.nearest(self.templates[k], same)[1])
+        spread = float(np.median(distances)) if distances else 0.0
+        return spread if spread > 0 else 1.0
+
+    def nearest(self, query: np.ndarray, candidates: Optional[np.ndarray] = None) -> tuple[int, float, int, int]:
+        """Exact banded-DTW nearest neighbour: ``(index, distance, computed, pruned)``."""
+        candidates = np.arange(len(self.templates)) if candidates is None else candidates
+        kim = lb_kim(query, self.templates[candidates])
+        order = candidates[np.argsort(kim, kind="stable")]
+        kim = np.sort(kim, kind="stable")
+        best, best_index = np.inf, -1
+        computed = 0
+        for start in range(0, len(order), LB_CHUNK):
+            if kim[start] >= best:
+                break
+            chunk = order[start : start + LB_CHUNK]
+            keogh = lb_keogh(query, self.upper[chunk], self.lower[chunk])
+            ranked = np.argsort(keogh, kind="stable")
+            if best == np.inf:
+                # Seed the bound with the few most promising templates.
+                seeds, ranked = chunk[ranked[:SEED_COUNT]], ranked[SEED_COUNT:]
+                distances = dtw_many(query, self.templates[seeds], self.radius)
+                computed += len(seeds)
+                position = int(np.argmin(distances))
+                best, best_index = float(distances[position]), int(seeds[position])
+            survivors = chunk[ranked[keogh[ranked] < best]]
+            if len(survivors):
+                distances = dtw_many(query, self.templates[survivors], self.radius, best)
+                computed += len(survivors)
+                position = int(np.argmin(distances))
+                if distances[position] < best:
+                    best, best_index = float(distances[position]), int(survivors[position])
+        return best_index, best, computed, len(order) - computed
+
+    def match(self, query: np.ndarray) -> SequenceMatch:
+        index, distance, computed, pruned = self.nearest(np.asarray(query, dtype=np.float32))
+        if distance > self.max_distance:
+            return SequenceMatch("UNKNOWN", distance, 0.0, -1, computed, pruned)
+        confidence = 1.0 - distance / self.max_distance if self.max_distance > 0 else 1.0
+        return SequenceMatch(str(self.labels[index]), distance, confidence, index, computed, pruned)
+
+
+def save_trajectories(path: str, trajectories: np.ndarray, labels: Sequence[str], dtype: str = "float16", extra=None) -> None:
+    """Store (N, T, D) trajectories as a ``signdao.dataset`` file of flattened rows."""
+    trajectories = np.asarray(trajectories, dtype=np.float32)
+    count, length = trajectories.shape[:2]
+    save_dataset(
+        path,
+        trajectories.reshape(count, -1),
+        labels,
+        dtype=dtype,
+        extra={**(extra or {}), "sequence_length": int(length)},
+    )
+
+
+class SequenceWindow:
+    """The last ``window_sec`` seconds of per-frame features."""
+
+    def __init__(self, window_sec: float = DEFAULT_WINDOW_SEC, min_frames: int = MIN_FRAMES) -> None:
+        self.window_sec = window_sec
+        self.min_frames = min_frames
+        self._times: deque[float] = deque()
+        self._features: deque[np.ndarray] = deque()
+
+    def __len__(self) -> int:
+        return len(self._times)
+
+    def push(self, t: float, feature: np.ndarray) -> None:
+        self._times.append(t)
+        self._features.append(feature)
+        while self._times and t - self._times[0] > self.window_sec:
+            self._times.popleft()
+            self._features.popleft()
+
+    def reset(self) -> None:
+        self._times.clear()
+        self._features.clear()
+
+    def trajectory(self, length: int = SEQUENCE_LENGTH) -> Optional[np.ndarray]:
+        """The window resampled to ``length`` steps; None until it holds ``min_frames`` frames."""
+        if len(self._times) < self.min_frames:
+            return None
+        return resample(np.fromiter(self._times, dtype=np.float64), np.stack(self._features), length)
+
+
+class SequenceRecognizer:
+    """Rolling window + template matching, every ``match_every`` frames."""
+
+    def __init__(self, templates: SequenceTemplates, window_sec: float = DEFAULT_WINDOW_SEC, match_every: int = 1) -> None:
+        self.templates = templates
+        self.window = SequenceWindow(window_sec)
+        self.match_every = max(1, match_every)
+        self.last: Optional[SequenceMatch] = None
+        self._frames = 0
+
+    def update(self, t: float, feature: np.ndarray) -> Optional[SequenceMatch]:
+        """Add a frame; returns the latest match, or None while the window is too short."""
+        self.window.push(t, feature)
+        self._frames += 1
+        if self.last is None or self._frames % self.match_every == 0:
+            query = self.window.trajectory(self.templates.length)
+            if query is None:
+                return None
+            self.last = self.templates.match(query)
+        return self.last
+
+    def reset(self) -> None:
+        self.window.reset()
+        self.last = None
+        self._frames = 0
@@ -0,0 +1,295 @@
+"""
+Spoken vote announcements from a pre-rendered phrase cache.
+
+The recognizer only ever says a few fixed phrases ("Vote YES submitted",
+"Vote NO submitted"). Synthesizing them with ``say()`` + ``runAndWait()`` on
+every vote costs hundreds of milliseconds before any sound comes out, and it
+ties up the speech thread. ``PhraseCache`` renders each known phrase to an
+audio file once per engine and voice, keeps the files on disk across runs,
+and later announcements just play the file. Any other text is spoken live.
+
+``Announcer`` runs the engine on one thread fed through a ``LatestSlot``. A
+new message replaces one that has not started playing yet, and a message
+older than ``max_age_sec`` when its turn comes is dropped. The delay is
+therefore at most one clip plus the age limit, and a burst of votes cannot
+build up a queue of stale announcements.
+
+Engines are pluggable. ``pyttsx3`` is the real voice. ``file`` writes text
+"clips" and logs each playback, and ``none`` only records what it was asked
+to say; both run on headless machines and in tests.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from typing import Final, Optional, Protocol, Sequence
+
+from signdao.pipeline import LatestSlot
+
+ENGINES: Final[tuple[str, ...]] = ("pyttsx3", "file", "none")
+VOTE_PHRASES: Final[tuple[str, ...]] = ("Vote YES submitted", "Vote NO submitted")
+DEFAULT_CACHE_DIR: Final[str] = os.path.join(os.path.expanduser("~"), ".cache", "signdao", "tts")
+DEFAULT_MAX_AGE_SEC: Final[float] = 2.0
+
+
+class SpeechEngine(Protocol):
+    def cache_key(self) -> str:
+        """Identifies the voice; clips rendered under another key are not reused."""
+        ...
+
+    def render(self, text: str, path: str) -> bool:
+        """Write ``text`` as audio to ``path``; False if this engine cannot render."""
+        ...
+
+    def play(self, path: str) -> bool:
+        """Play a rendered clip; False if it could not be played."""
+        ...
+
+    def say(self, text: str) -> None:
+        """Speak ``text`` live, without the cache."""
+        ...
+
+
+class NullEngine:
+    """Speaks nothing; remembers every message for inspection."""
+
+    def __init__(self) -> None:
+        self.spoken: list[str] = []
+
+    def cache_key(self) -> str:
+        return "none"
+
+    def render(self, text: str, path: str) -> bool:
+        return False
+
+    def play(self, path: str) -> bool:
+        return False
+
+    def say(self, text: str) -> None:
+        self.spoken.append(text)
+
+
+class FileEngine:
+    """Headless stand-in: clips are text files and each playback appends to ``announcements.log``."""
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        self.played: list[str] = []
+        os.makedirs(directory, exist_ok=True)
+        self._log_path = os.path.join(directory, "announcements.log")
+
+    def cache_key(self) -> str:
+        return "file"
+
+    def render(self, text: str, path: str) -> bool:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        return True
+
+    def play(self, path: str) -> bool:
+        with open(path, "r", encoding="utf-8") as f:
+            self._log(f.read())
+        self.played.append(path)
+        return True
+
+    def say(self, text: str) -> None:
+        self._log(text)
+
+    def _log(self, text: str) -> None:
+        with open(self._log_path, "a", encoding="utf-8") as f:
+            f.write(f"{time.time():.3f}\t{text}\n")
+
+
+def _audio_player() -> Optional[list[str]]:
+    for command in (["afplay"], ["aplay", "-q"], ["paplay"]):
+        if shutil.which(command[0]):
+            return command
+    return None
+
+
+class Pyttsx3Engine:
+    """pyttsx3 voice. The driver is created on first use, on the thread that uses it."""
+
+    def __init__(self) -> None:
+        self._engine = None
+        self._player = None if sys.platform == "win32" else _audio_player()
+
+    def _driver(self):
+        if self._engine is None:
+            import pyttsx3
+
+            self._engine = pyttsx3.init()  # Windows: SAPI5
+        return self._engine
+
+    def cache_key(self) -> str:
+        engine = self._driver()
+        return f"pyttsx3-{engine.getProperty('voice')}-{engine.getProperty('rate')}"
+
+    def render(self, text: str, path: str) -> bool:
+        engine = self._driver()
+        engine.save_to_file(text, path)
+        engine.runAndWait()
+        return os.path.exists(path) and os.path.getsize(path) > 0
+
+    def play(self, path: str) -> bool:
+        if sys.platform == "win32":
+            import winsound
+
+            winsound.PlaySound(path, winsound.SND_FILENAME)
+            return True
+        if self._player is None:
+            return False
+        return subprocess.run([*self._player, path], check=False).returncode == 0
+
+    def say(self, text: str) -> None:
+        engine = self._driver()
+        engine.say(text)
+        engine.runAndWait()
+
+
+def create_engine(kind: str, directory: str = DEFAULT_CACHE_DIR) -> SpeechEngine:
+    if kind == "pyttsx3":
+        return Pyttsx3Engine()
+    if kind == "file":
+        return FileEngine(directory)
+    if kind == "none":
+        return NullEngine()
+    raise ValueError(f"Unknown speech engine {kind!r}; expected one of {ENGINES}")
+
+
+class PhraseCache:
+    """Rendered clips for a fixed set of phrases, stored in ``directory``."""
+
+    def __init__(
+        self, engine: SpeechEngine, directory: str = DEFAULT_CACHE_DIR, phrases: Sequence[str] = VOTE_PHRASES
+    ) -> None:
+        self.engine = engine
+        self.directory = directory
+        self.phrases = frozenset(phrases)
+        self.hits = 0
+        self.renders = 0
+        self._clips: dict[str, Optional[str]] = {}
+        self._key: Optional[str] = None
+
+    def _path(self, text: str) -> str:
+        if self._key is None:
+            self._key = self.engine.cache_key()
+        digest = hashlib.sha1(f"{self._key}\0{text}".encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.directory, f"{digest}.wav")
+
+    def clip(self, text: str) -> Optional[str]:
+        """Path of the clip for ``text``, rendering it the first time; None if it must be spoken live."""
+        if text not in self.phrases:
+            return None
+        if text in self._clips:
+            path = self._clips[text]
+            self.hits += path is not None
+            return path
+        path = self._path(text)
+        if not os.path.exists(path):
+            os.makedirs(self.directory, exist_ok=True)
+            partial = f"{path[:-len('.wav')]}.{os.getpid()}.tmp.wav"
+            if self.engine.render(text, partial):
+                os.replace(partial, path)
+                self.renders += 1
+            else:
+                path = None
+                if os.path.exists(partial):
+                    os.remove(partial)
+        self._clips[text] = path
+        return path
+
+    def prepare(self) -> None:
+        """Render (or find on disk) every known phrase."""
+        for text in sorted(self.phrases):
+            self.clip(text)
+
+
+class Announcer:
+    """Single speech thread with latest-wins coalescing and a staleness limit."""
+
+    def __init__(
+        self,
+        engine: SpeechEngine,
+        cache_dir: str = DEFAULT_CACHE_DIR,
+        phrases: Sequence[str] = VOTE_PHRASES,
+        max_age_sec: float = DEFAULT_MAX_AGE_SEC,
+    ) -> None:
+        self.engine = engine
+        self.cache = PhraseCache(engine, cache_dir, phrases)
+        self.max_age_sec = max_age_sec
+        self.spoken = 0
+        self.stale = 0
+        self._announced = 0
+        self._slot: LatestSlot[Optional[tuple[int, str, float]]] = LatestSlot()
+        self._thread: Optional[threading.Thread] = None
+        self._closing = False
+        self._lock = threading.Lock()
+        self._idle = threading.Event()
+        self._idle.set()
+
+    def start(self) -> "Announcer":
+        with self._lock:
+            if self._thread is None and not self._closing:
+                self._thread = threading.Thread(target=self._run, name="tts", daemon=True)
+                self._thread.start()
+        return self
+
+    def announce(self, text: str) -> None:
+        """Queue ``text``, replacing any announcement that has not started yet."""
+        with self._lock:
+            self._announced += 1
+            self._idle.clear()
+            self._slot.put((self._announced, text, time.monotonic()))
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """Wait until everything announced so far has been played or dropped."""
+        return self._idle.wait(timeout)
+
+    def _run(self) -> None:
+        try:
+            self.cache.prepare()
+        except Exception as e:
+            print(f"[TTS error] {e}")
+        while not self._closing:
+            item = self._slot.get()
+            if item is None:
+                continue
+            number, text, queued_at = item
+            if time.monotonic() - queued_at > self.max_age_sec:
+                self.stale += 1
+            else:
+                try:
+                    clip = self.cache.clip(text)
+                    if clip is None or not self.engine.play(clip):
+                        self.engine.say(text)
+                    self.spoken += 1
+                except Exception as e:
+                    print(f"[TTS error] {e}")
+            with self._lock:
+                if number == self._announced:
+                    self._idle.set()
+
+    def stats(self) -> dict:
+        return {
+            "announced": self._announced,
+            "spoken": self.spoken,
+            "coalesced": self._slot.dropped,
+            "stale": self.stale,
+            "cache_hits": self.cache.hits,
+            "cache_renders": self.cache.renders,
+        }
+
+    def close(self, timeout: float = 2.0) -> None:
+        with self._lock:
+            self._closing = True
+            thread = self._thread
+        self._slot.put(None)  # wake the thread
+        if thread is not None:
+            thread.join(timeout)
@@ -0,0 +1,94 @@
+"""
+Startup timing and background warm-up.
+
+Importing the recognizer should stay cheap. The TTS engine, the KNN model
+and the MediaPipe graph are all created on first use, or ahead of time by
+``warm_up``, so CLI tools and restarts do not pay for resources they never
+touch. ``STARTUP`` records how long each phase took: ``import``,
+``model_load``, ``graph_init`` and ``first_inference``. The CLI prints and
+emits that report, and the backend returns it from its readiness probe.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Final, Iterator, Optional
+
+PHASES: Final[tuple[str, ...]] = ("import", "model_load", "graph_init", "first_inference")
+
+
+class StartupReport:
+    """Durations of named startup phases, in seconds, in the order they finished."""
+
+    def __init__(self) -> None:
+        self.created_at = time.perf_counter()
+        self.phases: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def record(self, phase: str, seconds: float) -> None:
+        with self._lock:
+            self.phases.setdefault(phase, seconds)
+
+    def mark(self, phase: str) -> None:
+        """Record ``phase`` as the time since this report was created."""
+        self.record(phase, time.perf_counter() - self.created_at)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    def to_dict(self) -> dict[str, float]:
+        with self._lock:
+            return {phase: round(seconds * 1000.0, 1) for phase, seconds in self.phases.items()}
+
+    def summary(self) -> str:
+        return ", ".join(f"{phase} {ms:.0f} ms" for phase, ms in self.to_dict().items()) or "nothing recorded"
+
+
+# Created when ``signdao.startup`` is first imported, so import it before the heavy modules.
+STARTUP: Final[StartupReport] = StartupReport()
+
+
+class WarmUp:
+    """Runs warm-up steps on a daemon thread and tracks readiness.
+
+    ``failed`` holds the steps that raised; they are retried lazily on first
+    real use, so a failed warm-up only costs the latency it was meant to hide.
+    """
+
+    def __init__(self, steps: dict[str, Callable[[], object]], name: str = "warm-up") -> None:
+        self.steps = steps
+        self.done: list[str] = []
+        self.failed: dict[str, str] = {}
+        self._finished = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._name = name
+
+    @property
+    def ready(self) -> bool:
+        return self._finished.is_set()
+
+    def start(self) -> "WarmUp":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name=self._name, daemon=True)
+            self._thread.start()
+        return self
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._finished.wait(timeout)
+
+    def _run(self) -> None:
+        for name, step in self.steps.items():
+            try:
+                step()
+                self.done.append(name)
+            except Exception as exc:  # warm-up is best effort
+                self.failed[name] = str(exc)
+                print(f"[WARN] Warm-up step {name!r} failed: {exc}")
+        self._finished.set()
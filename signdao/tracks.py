@@ -0,0 +1,108 @@
+"""
+Stable ids for the hands in a shared camera frame.
+
+MediaPipe returns a frame's hands in no particular order, so "hand 0" can be
+a different voter from one frame to the next. ``HandTracks`` matches each
+hand to the track whose last centre is nearest, greedily from the closest
+pair, as long as it moved less than ``max_distance`` (normalized frame
+units). Hands left over start new tracks with fresh ids.
+
+Every track owns one state object built by ``factory`` (smoothing window,
+cooldowns, ...). A track that goes unseen has its state ``reset()`` at once,
+exactly like a lost hand in single-hand mode, but keeps its id and state
+for ``max_missing`` frames, so a voter who briefly drops out of detection
+comes back with the same id and cooldowns.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable, Final, Generic, Protocol, TypeVar
+
+import numpy as np
+
+DEFAULT_MAX_DISTANCE: Final[float] = 0.2
+DEFAULT_MAX_MISSING: Final[int] = 15
+
+
+class TrackState(Protocol):
+    def reset(self) -> object:
+        ...
+
+
+S = TypeVar("S", bound=TrackState)
+
+
+@dataclass
+class _Track(Generic[S]):
+    center: np.ndarray
+    state: S
+    missing: int = 0
+
+
+def hand_centers(landmarks: np.ndarray) -> np.ndarray:
+    """(N, 2) mean x, y of (N, 21, 3) normalized landmarks."""
+    return np.asarray(landmarks, dtype=np.float32)[..., :2].mean(axis=-2).reshape(-1, 2)
+
+
+class HandTracks(Generic[S]):
+    def __init__(
+        self,
+        factory: Callable[[], S],
+        max_distance: float = DEFAULT_MAX_DISTANCE,
+        max_missing: int = DEFAULT_MAX_MISSING,
+    ) -> None:
+        self.factory = factory
+        self.max_distance = max_distance
+        self.max_missing = max_missing
+        self._tracks: dict[int, _Track[S]] = {}
+        self._next_id = 1
+
+    def __len__(self) -> int:
+        return len(self._tracks)
+
+    def assign(self, centers: np.ndarray) -> list[tuple[int, S]]:
+        """``(track_id, state)`` for each of the frame's (N, 2) hand centres, in input order."""
+        centers = np.asarray(centers, dtype=np.float32).reshape(-1, 2)
+        ids = list(self._tracks)
+        matched: dict[int, int] = {}  # hand index -> track id
+        if ids and len(centers):
+            previous = np.stack([self._tracks[track_id].center for track_id in ids])
+            distances = np.linalg.norm(centers[:, np.newaxis] - previous[np.newaxis], axis=2)
+            taken: set[int] = set()
+            for flat in np.argsort(distances, axis=None, kind="stable"):
+                hand, column = divmod(int(flat), len(ids))
+                if distances[hand, column] > self.max_distance:
+                    break
+                if hand in matched or column in taken:
+                    continue
+                matched[hand] = ids[column]
+                taken.add(column)
+
+        seen = set(matched.values())
+        for track_id in ids:
+            if track_id in seen:
+                continue
+            track = self._tracks[track_id]
+            if track.missing == 0:
+                track.state.reset()
+            track.missing += 1
+            if track.missing > self.max_missing:
+                del self._tracks[track_id]
+
+        assigned = []
+        for hand, center in enumerate(centers):
+            track_id = matched.get(hand)
+            if track_id is None:
+                track_id = self._next_id
+                self._next_id += 1
+                self._tracks[track_id] = _Track(center, self.factory())
+            track = self._tracks[track_id]
+            track.center, track.missing = center, 0
+            assigned.append((track_id, track.state))
+        return assigned
+
+    def clear(self) -> None:
+        for track in self._tracks.values():
+            track.state.reset()
+        self._tracks.clear()